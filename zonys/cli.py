@@ -1,4 +1,7 @@
+import datetime
+import json
 import pathlib
+import subprocess
 import sys
 import typing
 
@@ -6,15 +9,23 @@ import click
 import mergedeep
 import rich
 import rich.console
+import rich.live
 import rich.table
 import ruamel
 import ruamel.yaml
 
 import zonys
 import zonys.core
+import zonys.core.codec
+import zonys.core.configuration
 import zonys.core.namespace
+import zonys.core.profile
+import zonys.core.snapshot
+import zonys.core.status
+import zonys.core.volume
 import zonys.core.zfs
 import zonys.core.zfs.file_system
+import zonys.core.zone
 import zonys.util
 
 _pass_namespace = click.make_pass_decorator(zonys.core.namespace.Handle)
@@ -92,6 +103,191 @@ def _service_status(namespace):
     namespace.service.status()
 
 
+@main.group(
+    name="namespace",
+)
+def _namespace():
+    pass
+
+
+@_namespace.command(
+    name="snapshot",
+    help="Snapshot all zones of the namespace atomically.",
+)
+@click.argument(
+    "name",
+)
+@_pass_namespace
+def _namespace_snapshot(
+    namespace: "zonys.core.namespace.Handle",
+    name: str,
+):
+    namespace.snapshots.create(name)
+
+
+@_namespace.command(
+    name="snapshots",
+    help="List the namespace snapshots.",
+)
+@_pass_namespace
+def _namespace_snapshots(
+    namespace: "zonys.core.namespace.Handle",
+):
+    table = rich.table.Table()
+
+    table.add_column("Name")
+    table.add_column("Zones")
+
+    for snapshot in namespace.snapshots:
+        table.add_row(
+            snapshot.name,
+            ", ".join(
+                map(
+                    lambda x: x[1]["name"] or x[0],
+                    snapshot.manifest.items(),
+                )
+            ),
+        )
+
+    rich.console.Console().print(table)
+
+
+@_namespace.command(
+    name="send",
+    help="Send a replication stream of a namespace snapshot.",
+)
+@click.option(
+    "-d",
+    "--destination",
+    "destination",
+)
+@click.argument(
+    "name",
+)
+@_pass_namespace
+def _namespace_send(
+    namespace: "zonys.core.namespace.Handle",
+    name: str,
+    destination: typing.Optional[str],
+):
+    target = None
+
+    if destination is None:
+        target = sys.stdout.fileno()
+    else:
+        target = destination
+
+    namespace.snapshots[name].send(target)
+
+
+_SIZE_SUFFIXES = {
+    "K": 1 << 10,
+    "M": 1 << 20,
+    "G": 1 << 30,
+}
+
+
+def _size(
+    _ctx: click.Context,
+    _parameter: click.Parameter,
+    value: typing.Optional[str],
+) -> typing.Optional[int]:
+    if value is None:
+        return None
+
+    factor = _SIZE_SUFFIXES.get(value[-1:].upper(), None)
+    number = value if factor is None else value[:-1]
+
+    try:
+        return int(number) * (factor or 1)
+    except ValueError as error:
+        raise click.BadParameter("{} is not a size".format(value)) from error
+
+
+@_namespace.command(
+    name="replicate",
+    help="Replicate all zones incrementally to another namespace.",
+)
+@click.option(
+    "--to",
+    "to",
+    required=True,
+    help="Dataset of a local namespace or a command running z3s on the target, "
+    "for example 'ssh standby z3s -n zroot/zonys'.",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    "jobs",
+    type=click.IntRange(min=1),
+    default=4,
+    show_default=True,
+    help="Number of concurrent streams.",
+)
+@click.option(
+    "--limit",
+    "limit",
+    callback=_size,
+    help="Bandwidth limit in bytes per second, K, M and G suffixes are allowed.",
+)
+@_pass_namespace
+def _namespace_replicate(
+    namespace: "zonys.core.namespace.Handle",
+    to: str,
+    jobs: int,
+    limit: typing.Optional[int],
+):
+    table = rich.table.Table()
+
+    table.add_column("Dataset")
+    table.add_column("Snapshot")
+    table.add_column("Mode")
+    table.add_column("From")
+
+    for transfer in namespace.replication_manager.replicate(to, jobs, limit):
+        table.add_row(
+            transfer.relative or "zone",
+            transfer.snapshot,
+            transfer.mode,
+            transfer.fromname or "",
+        )
+
+    rich.console.Console().print(table)
+
+
+@_namespace.command(
+    name="replicated",
+    hidden=True,
+)
+@_pass_namespace
+def _namespace_replicated(
+    namespace: "zonys.core.namespace.Handle",
+):
+    print(json.dumps(namespace.replication_manager.snapshots()))
+
+
+@_namespace.command(
+    name="receive",
+    hidden=True,
+)
+@click.argument(
+    "relative",
+)
+@click.option(
+    "--full",
+    "full",
+    is_flag=True,
+    help="Discard the snapshots of an existing dataset before receiving.",
+)
+@_pass_namespace
+def _namespace_receive(
+    namespace: "zonys.core.namespace.Handle",
+    relative: str,
+    full: bool,
+):
+    namespace.replication_manager.receive(relative, sys.stdin.fileno(), full)
+
+
 @main.group(
     name="zone",
 )
@@ -99,44 +295,81 @@ def _zone():
     pass
 
 
+def _columns(
+    _ctx: click.Context,
+    _parameter: click.Parameter,
+    value: str,
+) -> typing.List[str]:
+    columns = list(filter(lambda x: len(x) > 0, value.split(",")))
+
+    for column in columns:
+        if column not in zonys.core.status.COLUMNS:
+            raise click.BadParameter(
+                "{} is not one of {}".format(
+                    column,
+                    ", ".join(zonys.core.status.COLUMNS),
+                )
+            )
+
+    return columns
+
+
 @_zone.command(
     name="status",
     help="Show the zone status.",
 )
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["table", "json"]),
+    default="table",
+    show_default=True,
+    help="Output a table or one JSON object per line.",
+)
+@click.option(
+    "--columns",
+    "columns",
+    default=",".join(zonys.core.status.COLUMNS),
+    show_default=True,
+    callback=_columns,
+    help="Comma separated list of columns.",
+)
 @_pass_namespace
 def _zone_status(
     namespace: "zonys.core.namespace.Handle",
+    output_format: str,
+    columns: typing.List[str],
 ):
+    rows = zonys.core.status.rows(namespace, columns)
+
+    if output_format == "json":
+        for row in rows:
+            sys.stdout.write(json.dumps(row))
+            sys.stdout.write("\n")
+            sys.stdout.flush()
+
+        return
+
     table = rich.table.Table()
 
-    table.add_column("UUID")
-    table.add_column("Name")
-    table.add_column("Base")
-    table.add_column("Snapshots")
-    table.add_column("Status")
-
-    for zone in namespace.zone_manager.zones:
-        status = "Down"
-        if zone.is_running():
-            status = "Up"
-
-        base = zone.base
-        base_output = ""
-        if base is not None:
-            base_output = "{}@{}".format(
-                base.zone_handle.identifier,
-                base.name,
-            )
+    for column in columns:
+        table.add_column(zonys.core.status.TITLES[column])
 
-        table.add_row(
-            str(zone.uuid),
-            zone.name,
-            base_output,
-            ", ".join(map(lambda x: x.name, zone.snapshots)),
-            status,
-        )
+    def output(row, column):
+        value = row[column]
 
-    rich.console.Console().print(table)
+        if value is None:
+            return ""
+
+        if column == "snapshots":
+            return ", ".join(value)
+
+        return str(value)
+
+    with rich.live.Live(table, auto_refresh=False) as live:
+        for row in rows:
+            table.add_row(*map(lambda x: output(row, x), columns))
+            live.refresh()
 
 
 def _zone_handle_configuration(
@@ -206,8 +439,15 @@ def _zone_run(
     arguments: typing.Tuple[typing.Any],
 ):
     configuration = _zone_handle_configuration(arguments)
+    template = configuration.get("template", None)
+
     print(namespace.zone_manager.zones.run(**configuration).identifier)
 
+    if template is not None:
+        _template_fill_background(namespace, template)
+
+    _trash_reap_pending(namespace)
+
 
 @_zone.command(
     name="recreate",
@@ -234,6 +474,33 @@ def _zone_recreate(
     namespace.zone_manager.zones.recreate(identifier, **configuration)
 
 
+@_zone.command(
+    name="reset",
+    help="Roll a zone back to a snapshot.",
+)
+@click.argument(
+    "identifier",
+)
+@click.argument(
+    "snapshot",
+    default="initial",
+)
+@click.option(
+    "--force",
+    "force",
+    is_flag=True,
+    help="Destroy snapshots taken after the target snapshot.",
+)
+@_pass_namespace
+def _zone_reset(
+    namespace: "zonys.core.namespace.Handle",
+    identifier: str,
+    snapshot: str,
+    force: bool,
+):
+    namespace.zone_manager.zones.reset(identifier, snapshot, force)
+
+
 @_zone.command(
     name="deploy",
     help="Create and start a new zone.",
@@ -268,6 +535,7 @@ def _zone_undeploy(
     identifier: str,
 ):
     namespace.zone_manager.zones.match(identifier)[0].undeploy()
+    _trash_reap_pending(namespace)
 
 
 @_zone.command(
@@ -297,6 +565,7 @@ def _zone_redeploy(
         .redeploy(**configuration)
         .identifier
     )
+    _trash_reap_pending(namespace)
 
 
 @_zone.command(
@@ -312,6 +581,7 @@ def _zone_destroy(
     identifier: str,
 ):
     namespace.zone_manager.zones.match(identifier)[0].destroy()
+    _trash_reap_pending(namespace)
 
 
 @_zone.command(
@@ -342,6 +612,7 @@ def _zone_stop(
     identifier: str,
 ):
     namespace.zone_manager.zones.match(identifier)[0].stop()
+    _trash_reap_pending(namespace)
 
 
 @_zone.command(
@@ -387,6 +658,7 @@ def _zone_down(
     identifier: str,
 ):
     namespace.zone_manager.zones.match(identifier)[0].down()
+    _trash_reap_pending(namespace)
 
 
 @_zone.command(
@@ -491,5 +763,780 @@ def _zone_console(
     )
 
 
+def _template_fill_background(
+    namespace: "zonys.core.namespace.Handle",
+    template: str,
+):
+    # pylint: disable=consider-using-with
+    subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "zonys",
+            "--namespace",
+            namespace.identifier,
+            "template",
+            "fill",
+            template,
+        ],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+@main.group(
+    name="template",
+)
+def _template():
+    pass
+
+
+@_template.command(
+    name="status",
+    help="Show the template status.",
+)
+@_pass_namespace
+def _template_status(
+    namespace: "zonys.core.namespace.Handle",
+):
+    table = rich.table.Table()
+
+    table.add_column("Name")
+    table.add_column("Size")
+    table.add_column("Available")
+
+    for template in namespace.template_manager.templates:
+        table.add_row(
+            template.name,
+            str(template.size),
+            str(len(template.spares)),
+        )
+
+    rich.console.Console().print(table)
+
+
+@_template.command(
+    name="create",
+    help="Create a template and keep prepared zones of it.",
+    context_settings=dict(
+        ignore_unknown_options=True,
+    ),
+)
+@click.option(
+    "--size",
+    "size",
+    type=int,
+    default=1,
+    show_default=True,
+    help="Number of prepared zones.",
+)
+@click.argument(
+    "name",
+)
+@click.argument(
+    "arguments",
+    nargs=-1,
+    type=click.UNPROCESSED,
+)
+@_pass_namespace
+def _template_create(
+    namespace: "zonys.core.namespace.Handle",
+    size: int,
+    name: str,
+    arguments: typing.Tuple[typing.Any],
+):
+    configuration = _zone_handle_configuration(arguments)
+    namespace.template_manager.templates.create(name, size, configuration).fill()
+
+
+@_template.command(
+    name="resize",
+    help="Change the number of prepared zones of a template.",
+)
+@click.argument(
+    "name",
+)
+@click.argument(
+    "size",
+    type=int,
+)
+@_pass_namespace
+def _template_resize(
+    namespace: "zonys.core.namespace.Handle",
+    name: str,
+    size: int,
+):
+    namespace.template_manager.templates.update(name, size)
+
+
+@_template.command(
+    name="fill",
+    help="Prepare zones until the template size is reached.",
+)
+@click.argument(
+    "name",
+    required=False,
+)
+@_pass_namespace
+def _template_fill(
+    namespace: "zonys.core.namespace.Handle",
+    name: typing.Optional[str],
+):
+    if name is None:
+        namespace.template_manager.fill()
+    else:
+        namespace.template_manager.templates[name].fill()
+
+
+@_template.command(
+    name="drain",
+    help="Destroy all prepared zones of a template.",
+)
+@click.argument(
+    "name",
+)
+@_pass_namespace
+def _template_drain(
+    namespace: "zonys.core.namespace.Handle",
+    name: str,
+):
+    namespace.template_manager.templates[name].drain()
+
+
+@_template.command(
+    name="destroy",
+    help="Destroy a template and its prepared zones.",
+)
+@click.argument(
+    "name",
+)
+@_pass_namespace
+def _template_destroy(
+    namespace: "zonys.core.namespace.Handle",
+    name: str,
+):
+    namespace.template_manager.templates.destroy(name)
+
+
+@main.group(
+    name="snapshot",
+)
+def _snapshot():
+    pass
+
+
+@_snapshot.command(
+    name="policy",
+    help="Show or change the automatic snapshot policy of zones.",
+)
+@click.option(
+    "--hourly",
+    "hourly",
+    type=click.IntRange(min=0),
+    help="Number of hourly snapshots to keep.",
+)
+@click.option(
+    "--daily",
+    "daily",
+    type=click.IntRange(min=0),
+    help="Number of daily snapshots to keep.",
+)
+@click.option(
+    "--weekly",
+    "weekly",
+    type=click.IntRange(min=0),
+    help="Number of weekly snapshots to keep.",
+)
+@click.option(
+    "--clear",
+    "clear",
+    is_flag=True,
+    help="Remove the policy, automatic snapshots are pruned on the next tick.",
+)
+@click.argument(
+    "identifier",
+    required=False,
+)
+@_pass_namespace
+def _snapshot_policy(
+    namespace: "zonys.core.namespace.Handle",
+    hourly: typing.Optional[int],
+    daily: typing.Optional[int],
+    weekly: typing.Optional[int],
+    clear: bool,
+    identifier: typing.Optional[str],
+):
+    policies = namespace.snapshot_manager.policies
+
+    if identifier is not None:
+        zone = str(namespace.zone_manager.zones.match_one(identifier).uuid)
+        retentions = {
+            key: value
+            for (key, value) in dict(
+                hourly=hourly,
+                daily=daily,
+                weekly=weekly,
+            ).items()
+            if value is not None
+        }
+
+        if clear:
+            policies.unset(zone)
+        elif len(retentions) > 0:
+            policies.set(zone, **retentions)
+
+    table = rich.table.Table()
+
+    table.add_column("Zone")
+
+    for label in zonys.core.snapshot.LABELS:
+        table.add_column(label.capitalize())
+
+    table.add_column("Snapshots")
+
+    for policy in policies:
+        table.add_row(
+            policy.zone,
+            *map(
+                lambda x: str(policy.retention(x)),
+                zonys.core.snapshot.LABELS,
+            ),
+            str(len(policy.snapshots)),
+        )
+
+    rich.console.Console().print(table)
+
+
+@_snapshot.command(
+    name="tick",
+    help="Take due automatic snapshots and prune expired ones.",
+)
+@_pass_namespace
+def _snapshot_tick(
+    namespace: "zonys.core.namespace.Handle",
+):
+    result = namespace.snapshot_manager.tick()
+
+    if result.name is not None:
+        rich.console.Console().print(
+            "Created {} for {} zone(s)".format(result.name, len(result.zones))
+        )
+
+    rich.console.Console().print("Pruned {} snapshot(s)".format(result.pruned))
+
+
+@_snapshot.command(
+    name="prune",
+    help="Prune expired automatic snapshots.",
+)
+@_pass_namespace
+def _snapshot_prune(
+    namespace: "zonys.core.namespace.Handle",
+):
+    rich.console.Console().print(
+        "Pruned {} snapshot(s)".format(namespace.snapshot_manager.prune())
+    )
+
+
+@main.group(
+    name="configuration",
+)
+def _configuration():
+    pass
+
+
+@_configuration.command(
+    name="resolve",
+    help="Resolve the includes of a zone configuration.",
+)
+@click.argument(
+    "path",
+    type=click.Path(exists=True, dir_okay=False, path_type=pathlib.Path),
+)
+@_pass_namespace
+def _configuration_resolve(
+    namespace: "zonys.core.namespace.Handle",
+    path: pathlib.Path,
+):
+    manager = zonys.core.configuration.Manager(namespace=namespace)
+    manager.read(
+        zonys.core.zone.SCHEMAS,
+        zonys.core.codec.load_configuration(path),
+        path.parent,
+    )
+
+    table = rich.table.Table()
+
+    table.add_column("Include")
+    table.add_column("Digest")
+    table.add_column("Seconds")
+    table.add_column("Cached")
+
+    for include in manager.includes.values():
+        table.add_row(
+            str(include.path),
+            include.digest[:12],
+            "{:.6f}".format(include.seconds),
+            "yes" if include.cached else "no",
+        )
+
+    rich.console.Console().print(table)
+
+
+@main.group(
+    name="cache",
+)
+def _cache():
+    pass
+
+
+@_cache.command(
+    name="status",
+    help="Show the provision build cache.",
+)
+@_pass_namespace
+def _cache_status(
+    namespace: "zonys.core.namespace.Handle",
+):
+    manager = namespace.cache_manager
+    table = rich.table.Table()
+
+    table.add_column("Layer")
+    table.add_column("Parent")
+    table.add_column("Hits")
+    table.add_column("Created")
+    table.add_column("Used")
+
+    for layer in manager.layers:
+        table.add_row(
+            layer.key[:12],
+            layer.parent[:12] if layer.parent is not None else "",
+            str(layer.hits),
+            str(layer.created),
+            str(layer.used),
+        )
+
+    rich.console.Console().print(table)
+    rich.console.Console().print(
+        "{} hit(s), {} miss(es)".format(manager.hits, manager.misses)
+    )
+
+
+@_cache.command(
+    name="prune",
+    help="Destroy cache layers no zone is cloned from.",
+)
+@click.option(
+    "--days",
+    "days",
+    type=int,
+    default=None,
+    help="Keep layers used within the given number of days.",
+)
+@_pass_namespace
+def _cache_prune(
+    namespace: "zonys.core.namespace.Handle",
+    days: typing.Optional[int],
+):
+    result = namespace.cache_manager.prune(
+        datetime.timedelta(days=days) if days is not None else None
+    )
+
+    rich.console.Console().print("Pruned {} layer(s)".format(result))
+
+
+@main.group(
+    name="thin",
+)
+def _thin():
+    pass
+
+
+@_thin.command(
+    name="status",
+    help="Show the shared read-only bases of thin zones.",
+)
+@_pass_namespace
+def _thin_status(
+    namespace: "zonys.core.namespace.Handle",
+):
+    table = rich.table.Table()
+
+    table.add_column("Name")
+    table.add_column("Zones")
+    table.add_column("Updates")
+
+    for base in namespace.thin_manager.bases:
+        table.add_row(
+            base.name,
+            str(len(base.zones)),
+            str(len(base.updates)),
+        )
+
+    rich.console.Console().print(table)
+
+
+@_thin.command(
+    name="create",
+    help="Create a shared base from a directory.",
+)
+@click.argument(
+    "name",
+)
+@click.argument(
+    "source",
+    type=click.Path(exists=True, file_okay=False, path_type=pathlib.Path),
+)
+@_pass_namespace
+def _thin_create(
+    namespace: "zonys.core.namespace.Handle",
+    name: str,
+    source: pathlib.Path,
+):
+    namespace.thin_manager.create(name, source)
+
+
+@_thin.command(
+    name="update",
+    help="Update a shared base for all of its zones at once.",
+)
+@click.argument(
+    "name",
+)
+@click.argument(
+    "source",
+    type=click.Path(exists=True, file_okay=False, path_type=pathlib.Path),
+)
+@_pass_namespace
+def _thin_update(
+    namespace: "zonys.core.namespace.Handle",
+    name: str,
+    source: pathlib.Path,
+):
+    result = namespace.thin_manager[name].update(source)
+
+    rich.console.Console().print(
+        "Copied {} file(s), skipped {}".format(result.copied, result.skipped)
+    )
+
+
+@_thin.command(
+    name="rollback",
+    help="Revert the last update of a shared base.",
+)
+@click.argument(
+    "name",
+)
+@_pass_namespace
+def _thin_rollback(
+    namespace: "zonys.core.namespace.Handle",
+    name: str,
+):
+    namespace.thin_manager[name].rollback()
+
+
+@_thin.command(
+    name="destroy",
+    help="Destroy a shared base no zone uses.",
+)
+@click.argument(
+    "name",
+)
+@_pass_namespace
+def _thin_destroy(
+    namespace: "zonys.core.namespace.Handle",
+    name: str,
+):
+    namespace.thin_manager[name].destroy()
+
+
+@main.group(
+    name="volume",
+)
+def _volume():
+    pass
+
+
+def _parse_properties(
+    values: typing.Tuple[str, ...],
+) -> typing.Dict[str, str]:
+    result = {}
+
+    for value in values:
+        if "=" not in value:
+            raise click.BadParameter("{} is not of the form KEY=VALUE".format(value))
+
+        key, value = value.split("=", 1)
+        result[key] = value
+
+    return result
+
+
+@_volume.command(
+    name="status",
+    help="Show persistent volumes and their properties.",
+)
+@_pass_namespace
+def _volume_status(
+    namespace: "zonys.core.namespace.Handle",
+):
+    table = rich.table.Table()
+
+    table.add_column("Name")
+
+    for name in zonys.core.volume.PROPERTIES:
+        table.add_column(name.capitalize())
+
+    table.add_column("Zones")
+
+    for volume in namespace.volume_manager.volumes:
+        properties = volume.properties
+
+        table.add_row(
+            volume.name,
+            *[properties.get(x, "") for x in zonys.core.volume.PROPERTIES],
+            str(len(volume.zones)),
+        )
+
+    rich.console.Console().print(table)
+
+
+@_volume.command(
+    name="create",
+    help="Create a persistent volume.",
+)
+@click.argument(
+    "name",
+)
+@click.argument(
+    "properties",
+    nargs=-1,
+)
+@_pass_namespace
+def _volume_create(
+    namespace: "zonys.core.namespace.Handle",
+    name: str,
+    properties: typing.Tuple[str, ...],
+):
+    namespace.volume_manager.volumes.create(name, **_parse_properties(properties))
+
+
+@_volume.command(
+    name="set",
+    help="Change properties of a persistent volume.",
+)
+@click.argument(
+    "name",
+)
+@click.argument(
+    "properties",
+    nargs=-1,
+)
+@_pass_namespace
+def _volume_set(
+    namespace: "zonys.core.namespace.Handle",
+    name: str,
+    properties: typing.Tuple[str, ...],
+):
+    namespace.volume_manager.volumes[name].configure(**_parse_properties(properties))
+
+
+@_volume.command(
+    name="snapshot",
+    help="Snapshot a persistent volume.",
+)
+@click.argument(
+    "name",
+)
+@click.argument(
+    "snapshot",
+)
+@_pass_namespace
+def _volume_snapshot(
+    namespace: "zonys.core.namespace.Handle",
+    name: str,
+    snapshot: str,
+):
+    namespace.volume_manager.volumes[name].snapshot(snapshot)
+
+
+@_volume.command(
+    name="destroy",
+    help="Destroy a persistent volume no zone mounts.",
+)
+@click.argument(
+    "name",
+)
+@_pass_namespace
+def _volume_destroy(
+    namespace: "zonys.core.namespace.Handle",
+    name: str,
+):
+    namespace.volume_manager.volumes[name].destroy()
+
+
+@main.group(
+    name="profile",
+)
+def _profile():
+    pass
+
+
+@_profile.command(
+    name="status",
+    help="Show the dataset property profiles of the namespace.",
+)
+@_pass_namespace
+def _profile_status(
+    namespace: "zonys.core.namespace.Handle",
+):
+    table = rich.table.Table()
+
+    table.add_column("Name")
+    table.add_column("Properties")
+    table.add_column("Default")
+
+    for profile in namespace.profile_manager.profiles:
+        table.add_row(
+            profile.name,
+            " ".join(
+                "{}={}".format(key, value)
+                for (key, value) in sorted(profile.properties.items())
+            ),
+            "yes" if profile.is_default() else "no",
+        )
+
+    rich.console.Console().print(table)
+
+
+@_profile.command(
+    name="create",
+    help="Define a dataset property profile.",
+)
+@click.argument(
+    "name",
+)
+@click.argument(
+    "properties",
+    nargs=-1,
+)
+@_pass_namespace
+def _profile_create(
+    namespace: "zonys.core.namespace.Handle",
+    name: str,
+    properties: typing.Tuple[str, ...],
+):
+    namespace.profile_manager.profiles.create(name, _parse_properties(properties))
+
+
+@_profile.command(
+    name="update",
+    help="Replace the properties of a dataset property profile.",
+)
+@click.argument(
+    "name",
+)
+@click.argument(
+    "properties",
+    nargs=-1,
+)
+@_pass_namespace
+def _profile_update(
+    namespace: "zonys.core.namespace.Handle",
+    name: str,
+    properties: typing.Tuple[str, ...],
+):
+    namespace.profile_manager.profiles.update(name, _parse_properties(properties))
+
+
+@_profile.command(
+    name="destroy",
+    help="Remove a dataset property profile defined in the namespace.",
+)
+@click.argument(
+    "name",
+)
+@_pass_namespace
+def _profile_destroy(
+    namespace: "zonys.core.namespace.Handle",
+    name: str,
+):
+    namespace.profile_manager.profiles.destroy(name)
+
+
+def _trash_reap_background(
+    namespace: "zonys.core.namespace.Handle",
+):
+    # pylint: disable=consider-using-with
+    subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "zonys",
+            "--namespace",
+            namespace.identifier,
+            "trash",
+            "reap",
+        ],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+def _trash_reap_pending(
+    namespace: "zonys.core.namespace.Handle",
+):
+    if len(namespace.reaper_manager) > 0:
+        _trash_reap_background(namespace)
+
+
+@main.group(
+    name="trash",
+)
+def _trash():
+    pass
+
+
+@_trash.command(
+    name="status",
+    help="Show destroyed zones waiting to be reaped.",
+)
+@_pass_namespace
+def _trash_status(
+    namespace: "zonys.core.namespace.Handle",
+):
+    table = rich.table.Table()
+
+    table.add_column("Name")
+    table.add_column("Used")
+
+    for file_system in namespace.reaper_manager.pending:
+        table.add_row(
+            file_system.identifier.last,
+            str(file_system.properties["used"].value),
+        )
+
+    rich.console.Console().print(table)
+
+
+@_trash.command(
+    name="reap",
+    help="Destroy the datasets of destroyed zones.",
+)
+@_pass_namespace
+def _trash_reap(
+    namespace: "zonys.core.namespace.Handle",
+):
+    result = namespace.reaper_manager.reap()
+
+    rich.console.Console().print(
+        "Reaped {} dataset(s), freed {} byte(s)".format(result.count, result.freed)
+    )
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,209 @@
+import contextlib
+import datetime
+import importlib
+import json
+import pathlib
+import platform
+import time
+import typing
+
+SUITES = {
+    "configuration": "zonys.core.benchmark.configuration",
+    "git": "zonys.core.benchmark.git",
+    "persistence": "zonys.core.benchmark.persistence",
+    "transfer": "zonys.core.benchmark.transfer",
+    "zone": "zonys.core.benchmark.zone",
+}
+
+
+class Error(RuntimeError):
+    pass
+
+
+class UnknownSuiteError(Error):
+    pass
+
+
+class Measurement:
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        suite: str,
+        operation: str,
+        scale: int,
+        seconds: float,
+        calls: typing.Optional[typing.Mapping[str, int]] = None,
+    ):
+        self.__suite = suite
+        self.__operation = operation
+        self.__scale = scale
+        self.__seconds = seconds
+        self.__calls = dict(calls or {})
+
+    @property
+    def suite(self) -> str:
+        return self.__suite
+
+    @property
+    def operation(self) -> str:
+        return self.__operation
+
+    @property
+    def scale(self) -> int:
+        return self.__scale
+
+    @property
+    def seconds(self) -> float:
+        return self.__seconds
+
+    @property
+    def calls(self) -> typing.Dict[str, int]:
+        return self.__calls
+
+    @property
+    def key(self) -> typing.Tuple[str, str, int]:
+        return (self.suite, self.operation, self.scale)
+
+    def to_dict(self) -> typing.Dict[str, typing.Any]:
+        return {
+            "suite": self.suite,
+            "operation": self.operation,
+            "scale": self.scale,
+            "seconds": self.seconds,
+            "calls": self.calls,
+        }
+
+    @staticmethod
+    def from_dict(data: typing.Mapping[str, typing.Any]) -> "Measurement":
+        return Measurement(
+            data["suite"],
+            data["operation"],
+            data["scale"],
+            data["seconds"],
+            data.get("calls", {}),
+        )
+
+
+class Regression:
+    def __init__(self, baseline: "Measurement", current: "Measurement"):
+        self.__baseline = baseline
+        self.__current = current
+
+    @property
+    def baseline(self) -> "Measurement":
+        return self.__baseline
+
+    @property
+    def current(self) -> "Measurement":
+        return self.__current
+
+    @property
+    def ratio(self) -> float:
+        if self.baseline.seconds == 0:
+            return float("inf")
+
+        return self.current.seconds / self.baseline.seconds
+
+
+class Report:
+    def __init__(
+        self,
+        measurements: typing.Optional[typing.List["Measurement"]] = None,
+        metadata: typing.Optional[typing.Mapping[str, typing.Any]] = None,
+    ):
+        self.__measurements = list(measurements or [])
+        self.__metadata = dict(
+            metadata
+            or {
+                "created": datetime.datetime.now().isoformat(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+            }
+        )
+
+    @property
+    def measurements(self) -> typing.List["Measurement"]:
+        return self.__measurements
+
+    @property
+    def metadata(self) -> typing.Dict[str, typing.Any]:
+        return self.__metadata
+
+    def extend(self, measurements: typing.Iterable["Measurement"]):
+        self.__measurements.extend(measurements)
+
+    def save(self, path: typing.Union[str, pathlib.Path]):
+        with pathlib.Path(path).open("w") as handle:
+            json.dump(
+                {
+                    "metadata": self.metadata,
+                    "measurements": [x.to_dict() for x in self.measurements],
+                },
+                handle,
+                indent=2,
+            )
+
+    @staticmethod
+    def load(path: typing.Union[str, pathlib.Path]) -> "Report":
+        with pathlib.Path(path).open("r") as handle:
+            data = json.load(handle)
+
+        return Report(
+            [Measurement.from_dict(x) for x in data["measurements"]],
+            data.get("metadata", {}),
+        )
+
+    def compare(
+        self,
+        baseline: "Report",
+        tolerance: float = 0.1,
+    ) -> typing.List["Regression"]:
+        baselines = {x.key: x for x in baseline.measurements}
+        result = []
+
+        for measurement in self.measurements:
+            previous = baselines.get(measurement.key)
+            if previous is None:
+                continue
+
+            regression = Regression(previous, measurement)
+            if regression.ratio > 1 + tolerance:
+                result.append(regression)
+
+        return result
+
+
+class Timer:
+    def __init__(self):
+        self.__seconds = 0.0
+
+    @property
+    def seconds(self) -> float:
+        return self.__seconds
+
+    @contextlib.contextmanager
+    def measure(self) -> typing.Iterator["Timer"]:
+        start = time.perf_counter()
+
+        try:
+            yield self
+        finally:
+            self.__seconds += time.perf_counter() - start
+
+
+def run(
+    suite: str,
+    scale: int,
+    latency: typing.Optional[typing.Mapping[str, float]] = None,
+) -> typing.List["Measurement"]:
+    if suite not in SUITES:
+        raise UnknownSuiteError(suite)
+
+    return importlib.import_module(SUITES[suite]).run(scale, latency or {})
+
+
+def scales(suite: str) -> typing.Tuple[int, ...]:
+    if suite not in SUITES:
+        raise UnknownSuiteError(suite)
+
+    return importlib.import_module(SUITES[suite]).SCALES
@@ -0,0 +1,140 @@
+import sys
+import typing
+
+import click
+import rich
+import rich.console
+import rich.table
+
+import zonys
+import zonys.core
+import zonys.core.benchmark
+
+
+def _latency(
+    _ctx: click.Context,
+    _parameter: click.Parameter,
+    values: typing.Tuple[str, ...],
+) -> typing.Dict[str, float]:
+    result = {}
+
+    for value in values:
+        try:
+            operation, seconds = value.split("=", 1)
+            result[operation] = float(seconds)
+        except ValueError as error:
+            raise click.BadParameter(
+                "{} must be given as OPERATION=SECONDS".format(value)
+            ) from error
+
+    return result
+
+
+@click.command(help="Run benchmark suites and compare them against a baseline.")
+@click.option(
+    "--suite",
+    "-s",
+    "suites",
+    multiple=True,
+    type=click.Choice(sorted(zonys.core.benchmark.SUITES)),
+    help="Suite to run. Defaults to all suites.",
+)
+@click.option(
+    "--scale",
+    "-n",
+    "scales",
+    multiple=True,
+    type=int,
+    help="Scale to run. Defaults to the scales of each suite.",
+)
+@click.option(
+    "--latency",
+    "-l",
+    "latency",
+    multiple=True,
+    callback=_latency,
+    help="Inject latency into fake libzfs operations, e.g. snapshot=0.01.",
+)
+@click.option(
+    "--output",
+    "-o",
+    "output",
+    type=click.Path(dir_okay=False),
+    help="Write the results as JSON.",
+)
+@click.option(
+    "--baseline",
+    "-b",
+    "baseline",
+    type=click.Path(exists=True, dir_okay=False),
+    help="Compare the results against a previous JSON result.",
+)
+@click.option(
+    "--tolerance",
+    "-t",
+    "tolerance",
+    type=float,
+    default=0.1,
+    show_default=True,
+    help="Relative slowdown that counts as regression.",
+)
+# pylint: disable=too-many-arguments
+def main(
+    suites: typing.Tuple[str, ...],
+    scales: typing.Tuple[int, ...],
+    latency: typing.Dict[str, float],
+    output: typing.Optional[str],
+    baseline: typing.Optional[str],
+    tolerance: float,
+):
+    report = zonys.core.benchmark.Report()
+    report.metadata["latency"] = latency
+
+    table = rich.table.Table()
+    table.add_column("Suite")
+    table.add_column("Operation")
+    table.add_column("Scale")
+    table.add_column("Seconds")
+
+    for suite in suites or sorted(zonys.core.benchmark.SUITES):
+        for scale in scales or zonys.core.benchmark.scales(suite):
+            measurements = zonys.core.benchmark.run(suite, scale, latency)
+            report.extend(measurements)
+
+            for measurement in measurements:
+                table.add_row(
+                    measurement.suite,
+                    measurement.operation,
+                    str(measurement.scale),
+                    "{:.4f}".format(measurement.seconds),
+                )
+
+    console = rich.console.Console()
+    console.print(table)
+
+    if output is not None:
+        report.save(output)
+
+    if baseline is not None:
+        regressions = report.compare(
+            zonys.core.benchmark.Report.load(baseline),
+            tolerance,
+        )
+
+        for regression in regressions:
+            console.print(
+                "Regression {} {} at {}: {:.4f}s -> {:.4f}s ({:.2f}x)".format(
+                    regression.current.suite,
+                    regression.current.operation,
+                    regression.current.scale,
+                    regression.baseline.seconds,
+                    regression.current.seconds,
+                    regression.ratio,
+                )
+            )
+
+        if len(regressions) > 0:
+            sys.exit(1)
+
+
+main()  # pylint: disable=no-value-for-parameter
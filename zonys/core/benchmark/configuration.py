@@ -0,0 +1,145 @@
+import os
+import typing
+
+import toolz
+
+import zonys
+import zonys.core
+import zonys.core.benchmark
+import zonys.core.configuration
+import zonys.core.handler
+import zonys.core.handler.variable
+
+SCALES = (10, 100, 500)
+
+EVENTS = (
+    "before_create_zone",
+    "after_create_zone",
+    "before_start_zone",
+    "after_start_zone",
+    "before_stop_zone",
+    "after_stop_zone",
+    "before_destroy_zone",
+    "after_destroy_zone",
+)
+
+_DEPTH = 8
+
+
+class _Handler(zonys.core.configuration.Handler):
+    pass
+
+
+for _event in EVENTS:
+    setattr(_Handler, "on_commit_{}".format(_event), staticmethod(lambda _: None))
+
+
+SCHEMAS = [
+    zonys.core.handler.variable.SCHEMA,
+    {
+        "provision": {
+            "type": "list",
+            "handler": _Handler,
+        },
+    },
+]
+
+
+def _variables(depth: int) -> typing.Dict[str, typing.Any]:
+    if depth == 0:
+        return {
+            "value": "leaf",
+        }
+
+    return {
+        "name": "level-{}".format(depth),
+        "child": _variables(depth - 1),
+    }
+
+
+def _configuration(scale: int) -> typing.Dict[str, typing.Any]:
+    path = ".".join(["tree", *(["child"] * _DEPTH), "value"])
+
+    return {
+        "variable": {
+            "tree": _variables(_DEPTH),
+            "name": "benchmark",
+        },
+        "provision": [
+            {
+                "file": {
+                    "path": "/usr/local/etc/{{name}}-{}.conf".format(index),
+                    "content": "{{{}}} {{tree.name}} {{env[HOME]}}".format(path),
+                },
+            }
+            for index in range(scale)
+        ],
+    }
+
+
+def _format(manager: "zonys.core.configuration.Manager", value: typing.Any):
+    if isinstance(value, dict):
+        return toolz.valmap(lambda x: _format(manager, x), value)
+
+    if isinstance(value, list):
+        return list(map(lambda x: _format(manager, x), value))
+
+    if isinstance(value, bool):
+        return value
+
+    if hasattr(value, "format") and callable(value.format):
+        return value.format(
+            env=dict(os.environ),
+            environment=dict(os.environ),
+            **toolz.valmap(
+                zonys.core.configuration.VariableAccessor,
+                manager.variables,
+            ),
+        )
+
+    return value
+
+
+def run(
+    scale: int,
+    latency: typing.Mapping[str, float],
+) -> typing.List["zonys.core.benchmark.Measurement"]:
+    # pylint: disable=unused-argument
+    result: typing.List["zonys.core.benchmark.Measurement"] = []
+
+    def measure(operation: str, function: typing.Callable[[], typing.Any]):
+        timer = zonys.core.benchmark.Timer()
+
+        with timer.measure():
+            function()
+
+        result.append(
+            zonys.core.benchmark.Measurement(
+                "configuration",
+                operation,
+                scale,
+                timer.seconds,
+                {},
+            )
+        )
+
+    configuration = _configuration(scale)
+    manager = zonys.core.configuration.Manager()
+
+    def read():
+        manager.read(SCHEMAS, configuration)
+
+    def commit_legacy():
+        for _event in EVENTS:
+            for _, options, _, _ in manager.commit_handlers:
+                _format(manager, options)
+
+    def commit():
+        for event in EVENTS:
+            manager.commit(event)
+
+    measure("read", read)
+    measure("commit-legacy", commit_legacy)
+    measure("commit", commit)
+
+    return result
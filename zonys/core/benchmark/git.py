@@ -0,0 +1,98 @@
+import typing
+
+import git
+
+import zonys
+import zonys.core
+import zonys.core.testing
+import zonys.core.benchmark
+import zonys.core.namespace
+import zonys.core.zfs
+import zonys.core.zfs.file_system
+
+SCALES = (10, 100, 500)
+
+_ACTOR = git.Actor("zonys", "zonys@localhost")
+
+
+def _upstream(root, scale: int) -> str:
+    work = git.Repo.init(root.joinpath("work"), initial_branch="main")
+
+    for index in range(scale):
+        path = root.joinpath("work", "file-{}".format(index % 50))
+        path.write_text("{}\n".format(index) * 1024)
+
+        work.index.add([path.name])
+        work.index.commit(
+            "commit {}".format(index),
+            author=_ACTOR,
+            committer=_ACTOR,
+        )
+
+    upstream = root.joinpath("upstream.git")
+    git.Repo.clone_from(work.working_dir, upstream, bare=True)
+
+    return upstream.as_uri()
+
+
+def run(
+    scale: int,
+    latency: typing.Mapping[str, float],
+) -> typing.List["zonys.core.benchmark.Measurement"]:
+    result: typing.List["zonys.core.benchmark.Measurement"] = []
+
+    def measure(operation: str, function: typing.Callable[[], typing.Any]):
+        timer = zonys.core.benchmark.Timer()
+
+        with timer.measure():
+            function()
+
+        result.append(
+            zonys.core.benchmark.Measurement(
+                "git",
+                operation,
+                scale,
+                timer.seconds,
+                {},
+            )
+        )
+
+    with zonys.core.testing.environment(
+        pool="benchmark",
+        fake=True,
+        latency=latency,
+    ) as environment:
+        url = _upstream(environment.root, scale)
+
+        file_system = zonys.core.zfs.file_system.Identifier(
+            [environment.pool, "zonys"],
+        ).use()
+
+        namespace = zonys.core.namespace.Handle(file_system)
+        checkouts = environment.root.joinpath("checkouts")
+
+        def clone():
+            git.Repo.clone_from(url, checkouts.joinpath("clone"), branch="main")
+
+        def cold():
+            namespace.mirror_manager.checkout(url, checkouts.joinpath("cold"), "main")
+
+        def warm():
+            namespace.mirror_manager.checkout(url, checkouts.joinpath("warm"), "main")
+
+        def shallow():
+            namespace.mirror_manager.checkout(
+                url,
+                checkouts.joinpath("shallow"),
+                "main",
+                depth=1,
+            )
+
+        measure("clone", clone)
+        measure("cold", cold)
+        measure("warm", warm)
+        measure("shallow", shallow)
+
+        file_system.destroy()
+
+    return result
@@ -0,0 +1,124 @@
+import pathlib
+import tempfile
+import typing
+import uuid
+
+from ruamel import yaml
+
+import zonys
+import zonys.core
+import zonys.core.benchmark
+import zonys.core.codec
+import zonys.core.store
+
+SCALES = (10, 100, 1000)
+
+_RECORD = {
+    "name": None,
+    "local": {
+        "autostart": True,
+        "jail": {
+            "allow.raw_sockets": True,
+        },
+        "network": {
+            "ip4.addr": "192.168.0.1",
+        },
+        "provision": [
+            {
+                "file": {
+                    "path": "/etc/motd",
+                    "content": "benchmark",
+                },
+            },
+            {
+                "execute": {
+                    "command": "pkg install -y nginx",
+                },
+            },
+        ],
+    },
+}
+
+
+def run(
+    scale: int,
+    latency: typing.Mapping[str, float],
+) -> typing.List["zonys.core.benchmark.Measurement"]:
+    # pylint: disable=unused-argument
+    result: typing.List["zonys.core.benchmark.Measurement"] = []
+
+    def measure(operation: str, function: typing.Callable[[], typing.Any]):
+        timer = zonys.core.benchmark.Timer()
+
+        with timer.measure():
+            function()
+
+        result.append(
+            zonys.core.benchmark.Measurement(
+                "persistence",
+                operation,
+                scale,
+                timer.seconds,
+                {},
+            )
+        )
+
+    with tempfile.TemporaryDirectory() as directory:
+        root = pathlib.Path(directory)
+        paths = []
+
+        for index in range(scale):
+            path = root.joinpath("{}.yaml".format(uuid.uuid4()))
+            yaml.YAML().dump(
+                {
+                    **_RECORD,
+                    "name": "zone-{}".format(index),
+                },
+                path,
+            )
+            paths.append(path)
+
+        include = root.joinpath("include.yaml")
+        yaml.YAML().dump(_RECORD["local"], include)
+
+        def load_round_trip():
+            for path in paths:
+                yaml.YAML().load(path)
+
+        def load():
+            for path in paths:
+                zonys.core.codec.load(path)
+
+        def include_round_trip():
+            for _ in range(scale):
+                yaml.YAML().load(include)
+
+        def include_cached():
+            zonys.core.codec.clear()
+
+            for _ in range(scale):
+                zonys.core.codec.load_include(include)
+
+        store = zonys.core.store.Store(root.joinpath("zonys.db"))
+
+        def migrate():
+            store.records()
+
+        def records():
+            store.records()
+
+        def lookup():
+            for index in range(scale):
+                store.find("zone-{}".format(index))
+
+        measure("load-round-trip", load_round_trip)
+        measure("load", load)
+        measure("include-round-trip", include_round_trip)
+        measure("include-cached", include_cached)
+        measure("migrate", migrate)
+        measure("records", records)
+        measure("lookup", lookup)
+
+        store.close()
+
+    return result
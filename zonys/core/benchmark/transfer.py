@@ -0,0 +1,78 @@
+import pathlib
+import shutil
+import tempfile
+import typing
+
+import zonys
+import zonys.core
+import zonys.core.benchmark
+import zonys.core.transfer
+
+SCALES = (1000, 10000, 50000)
+
+_FILES_PER_DIRECTORY = 100
+
+_FILE_SIZE = 4096
+
+
+def _tree(root: pathlib.Path, scale: int):
+    content = b"\0" * _FILE_SIZE
+
+    for index in range(scale):
+        path = root.joinpath(
+            "directory-{}".format(index // _FILES_PER_DIRECTORY),
+            "file-{}".format(index),
+        )
+
+        if index % _FILES_PER_DIRECTORY == 0:
+            path.parent.mkdir(parents=True)
+
+        path.write_bytes(content)
+
+
+def run(
+    scale: int,
+    latency: typing.Mapping[str, float],
+) -> typing.List["zonys.core.benchmark.Measurement"]:
+    # pylint: disable=unused-argument
+    result: typing.List["zonys.core.benchmark.Measurement"] = []
+
+    def measure(operation: str, function: typing.Callable[[], typing.Any]):
+        timer = zonys.core.benchmark.Timer()
+
+        with timer.measure():
+            function()
+
+        result.append(
+            zonys.core.benchmark.Measurement(
+                "transfer",
+                operation,
+                scale,
+                timer.seconds,
+                {},
+            )
+        )
+
+    with tempfile.TemporaryDirectory() as directory:
+        root = pathlib.Path(directory)
+        source = root.joinpath("source")
+        _tree(source, scale)
+
+        def copytree():
+            shutil.copytree(source, root.joinpath("copytree"))
+
+        def copy():
+            zonys.core.transfer.copy(source, root.joinpath("copy"))
+
+        def incremental():
+            zonys.core.transfer.copy(
+                source,
+                root.joinpath("copy"),
+                incremental=zonys.core.transfer.MTIME,
+            )
+
+        measure("copytree", copytree)
+        measure("copy", copy)
+        measure("incremental", incremental)
+
+    return result
@@ -0,0 +1,126 @@
+import copy
+import os
+import typing
+
+import click.testing
+
+import zonys
+import zonys.core
+import zonys.core.testing
+import zonys.cli
+import zonys.core.benchmark
+import zonys.core.namespace
+import zonys.core.zfs
+import zonys.core.zfs.fake
+import zonys.core.zfs.file_system
+
+SCALES = (10, 100, 1000)
+
+_CONFIGURATION = {
+    "provision": [
+        {
+            "directory": {
+                "path": "/etc",
+            },
+        },
+        {
+            "file": {
+                "path": "/etc/motd",
+                "content": "benchmark",
+            },
+        },
+    ],
+}
+
+
+def run(
+    scale: int,
+    latency: typing.Mapping[str, float],
+) -> typing.List["zonys.core.benchmark.Measurement"]:
+    result: typing.List["zonys.core.benchmark.Measurement"] = []
+
+    def measure(operation: str, function: typing.Callable[[], typing.Any]):
+        before = zonys.core.zfs.fake.calls()
+        timer = zonys.core.benchmark.Timer()
+
+        with timer.measure():
+            function()
+
+        after = zonys.core.zfs.fake.calls()
+
+        result.append(
+            zonys.core.benchmark.Measurement(
+                "zone",
+                operation,
+                scale,
+                timer.seconds,
+                {
+                    key: value - before.get(key, 0)
+                    for (key, value) in after.items()
+                    if value != before.get(key, 0)
+                },
+            )
+        )
+
+    with zonys.core.testing.environment(
+        pool="benchmark",
+        fake=True,
+        latency=latency,
+    ) as environment:
+        file_system = zonys.core.zfs.file_system.Identifier(
+            [environment.pool, "zonys"],
+        ).use()
+
+        namespace = zonys.core.namespace.Handle(file_system)
+        zones = namespace.zone_manager.zones
+        handles = []
+
+        def create():
+            for _ in range(scale):
+                handles.append(zones.create(**copy.deepcopy(_CONFIGURATION)))
+
+        def deploy():
+            for _ in range(scale):
+                handles.append(zones.deploy(**copy.deepcopy(_CONFIGURATION)))
+
+        def status():
+            output = click.testing.CliRunner().invoke(
+                zonys.cli.main,
+                [
+                    "--namespace",
+                    str(file_system.identifier),
+                    "zone",
+                    "status",
+                ],
+            )
+
+            if output.exit_code != 0:
+                raise zonys.core.benchmark.Error(output.output) from output.exception
+
+        def snapshot():
+            for handle in handles:
+                handle.snapshots.create("benchmark")
+
+        def send():
+            with open(os.devnull, "wb") as target:
+                for handle in handles:
+                    handle.send(target.fileno())
+
+        def destroy():
+            for handle in handles:
+                handle.undeploy()
+
+        def reap():
+            namespace.reaper_manager.reap()
+
+        measure("create", create)
+        measure("deploy", deploy)
+        measure("status", status)
+        measure("snapshot", snapshot)
+        measure("send", send)
+        measure("destroy", destroy)
+        measure("reap", reap)
+
+        file_system.destroy()
+
+    return result
@@ -0,0 +1,394 @@
+import datetime
+import hashlib
+import json
+import pathlib
+import typing
+
+import zonys
+import zonys.core
+import zonys.core.persistence
+import zonys.core.zfs
+import zonys.core.zfs.file_system
+
+LAYER = "layer"
+
+EMPTY = "empty"
+
+
+class Error(RuntimeError):
+    pass
+
+
+class NotFoundError(Error):
+    pass
+
+
+def key(parent: str, handler: typing.Any, options: typing.Any) -> str:
+    return hashlib.sha256(
+        json.dumps(
+            [
+                parent,
+                getattr(handler, "__module__", None),
+                options,
+            ],
+            sort_keys=True,
+            default=str,
+        ).encode()
+    ).hexdigest()
+
+
+class Manager:
+    def __init__(self, _namespace: "zonys.core.namespace.Handle"):
+        self.__namespace = _namespace
+        self.__index = None
+        self.__file_system = None
+
+    @property
+    def namespace(self) -> "zonys.core.namespace.Handle":
+        return self.__namespace
+
+    @property
+    def index(self) -> "zonys.core.persistence.Base":
+        if self.__index is None:
+            self.__index = zonys.core.persistence.Base(
+                self.__namespace.path.joinpath("zonys.cache.yaml")
+            )
+
+        return self.__index
+
+    @property
+    def file_system(self) -> "zonys.core.zfs.file_system.Handle":
+        if self.__file_system is None:
+            children = self.__namespace.file_system.children
+
+            if "cache" not in children:
+                self.__file_system = children.create("cache")
+            else:
+                self.__file_system = children.open("cache")
+
+        return self.__file_system
+
+    @property
+    def layers(self) -> typing.List["Layer"]:
+        return list(
+            map(
+                lambda x: Layer(self, x),
+                sorted(
+                    self.__definitions,
+                    key=lambda x: self.__definitions[x]["created"],
+                ),
+            )
+        )
+
+    @property
+    def hits(self) -> int:
+        return self.index.get("hits", 0)
+
+    @property
+    def misses(self) -> int:
+        return self.index.get("misses", 0)
+
+    @property
+    def __definitions(self) -> typing.Dict[str, typing.Any]:
+        return self.index.get("layers", {})
+
+    def __getitem__(self, value: str) -> "Layer":
+        if value not in self.__definitions:
+            raise NotFoundError(value)
+
+        return Layer(self, value)
+
+    def __contains__(self, value: str) -> bool:
+        return value in self.__definitions
+
+    def __flush(self, **kwargs):
+        self.index.update(kwargs)
+        self.index.flush()
+
+    def __lock(self) -> typing.ContextManager["zonys.core.lock.Lock"]:
+        return self.__namespace.lock_manager.lock("cache").acquire()
+
+    def build(
+        self,
+        base: str,
+        steps: typing.List[typing.Tuple[typing.Any, "zonys.core.configuration.Event"]],
+        root: pathlib.Path,
+    ) -> "Build":
+        keys = []
+        parent = key(base, None, None)
+        catalogs = zonys.core.zfs.file_system.catalogs(self.file_system.identifier)
+
+        for handler, event in steps:
+            value = key(
+                parent,
+                handler,
+                handler.key(event, self.__namespace, root),
+            )
+            identifier = self.file_system.identifier.child(value)
+
+            if LAYER not in catalogs.get(str(identifier), []):
+                break
+
+            keys.append(value)
+            parent = value
+            root = identifier.open().snapshots[LAYER].path
+
+        with self.__lock():
+            definitions = dict(self.__definitions)
+            now = datetime.datetime.now()
+
+            for value in keys:
+                definitions[value] = {
+                    **definitions.get(value, {"created": now}),
+                    "used": now,
+                    "hits": definitions.get(value, {}).get("hits", 0) + 1,
+                }
+
+            self.__flush(
+                layers=definitions,
+                hits=self.hits + len(keys),
+            )
+
+        return Build(self, base, keys, len(steps))
+
+    def restore(
+        self,
+        build: "Build",
+        identifier: "zonys.core.zfs.file_system.Identifier",
+        properties: typing.Optional[typing.Mapping[str, str]] = None,
+    ) -> "zonys.core.zfs.file_system.Handle":
+        return (
+            self.file_system.identifier.child(build.keys[build.depth - 1])
+            .open()
+            .snapshots[LAYER]
+            .clone(identifier, properties)
+        )
+
+    def record(
+        self,
+        value: str,
+        parent: typing.Optional[str],
+        file_system: "zonys.core.zfs.file_system.Handle",
+    ):
+        with self.__lock():
+            identifier = self.file_system.identifier.child(value)
+            now = datetime.datetime.now()
+
+            if not identifier.exists():
+                snapshot = file_system.snapshots.create(LAYER)
+                layer = None
+
+                try:
+                    layer = snapshot.clone(identifier)
+                    layer.promote()
+                except:
+                    if layer is not None:
+                        layer.destroy()
+
+                    snapshot.destroy()
+                    file_system.snapshots.refresh()
+                    raise
+
+                file_system.snapshots.refresh()
+
+            definitions = dict(self.__definitions)
+            definitions[value] = {
+                "created": now,
+                "used": now,
+                "hits": 0,
+                **definitions.get(value, {}),
+                "parent": parent,
+            }
+
+            self.__flush(
+                layers=definitions,
+                misses=self.misses + 1,
+            )
+
+    def release(self, file_system: "zonys.core.zfs.file_system.Handle") -> int:
+        identifier = self.__namespace.file_system.identifier.child("cache")
+        if not identifier.exists():
+            return 0
+
+        with self.__lock():
+            sources = set([str(file_system.identifier)])
+            dependents = []
+            pending = list(self.file_system.children)
+
+            while True:
+                found = list(
+                    filter(
+                        lambda x: str(x.properties["origin"].value).split("@")[0]
+                        in sources,
+                        pending,
+                    )
+                )
+
+                if len(found) == 0:
+                    break
+
+                for child in found:
+                    pending.remove(child)
+                    dependents.append(child)
+                    sources.add(str(child.identifier))
+
+            if len(dependents) > 0:
+                self.__namespace.reaper_manager.reap()
+
+            definitions = dict(self.__definitions)
+
+            try:
+                for child in reversed(dependents):
+                    child.destroy()
+                    definitions.pop(child.identifier.last, None)
+            finally:
+                self.__flush(layers=definitions)
+
+        return len(dependents)
+
+    def __origins(self) -> typing.Set[str]:
+        result = set()
+
+        for parent in [
+            self.__namespace.zone_manager.file_system,
+            self.file_system,
+        ]:
+            for child in parent.children:
+                origin = child.properties["origin"].value
+                if origin not in (None, "", "-"):
+                    result.add(origin)
+
+        return result
+
+    def prune(self, age: typing.Optional[datetime.timedelta] = None) -> int:
+        result = 0
+
+        with self.__lock():
+            self.__namespace.reaper_manager.reap()
+
+            definitions = dict(self.__definitions)
+            now = datetime.datetime.now()
+
+            while True:
+                origins = self.__origins()
+                pruned = 0
+
+                for child in list(self.file_system.children):
+                    value = child.identifier.last
+                    used = definitions.get(value, {}).get("used", None)
+
+                    if age is not None and used is not None and now - used < age:
+                        continue
+
+                    if "{}@{}".format(str(child.identifier), LAYER) in origins:
+                        continue
+
+                    child.destroy()
+                    definitions.pop(value, None)
+                    pruned = pruned + 1
+
+                result = result + pruned
+
+                if pruned == 0:
+                    break
+
+            self.__flush(
+                layers={
+                    name: value
+                    for (name, value) in definitions.items()
+                    if self.file_system.identifier.child(name).exists()
+                },
+            )
+
+        return result
+
+
+class Build:
+    def __init__(
+        self,
+        manager: "Manager",
+        base: str,
+        keys: typing.List[str],
+        size: int,
+    ):
+        self.__manager = manager
+        self.__base = base
+        self.__keys = keys
+        self.__depth = len(keys)
+        self.__size = size
+        self.__position = 0
+
+    @property
+    def keys(self) -> typing.List[str]:
+        return list(self.__keys)
+
+    @property
+    def depth(self) -> int:
+        return self.__depth
+
+    @property
+    def hits(self) -> int:
+        return self.__depth
+
+    @property
+    def misses(self) -> int:
+        return self.__size - self.__depth
+
+    def step(
+        self,
+        handler: typing.Any,
+        event: "zonys.core.configuration.CommitEvent",
+    ):
+        position = self.__position
+        self.__position = position + 1
+
+        if position < self.__depth:
+            return
+
+        zone = event.context["zone"]
+        parent = self.__keys[-1] if len(self.__keys) > 0 else None
+
+        handler.provision(event)
+
+        value = key(
+            parent if parent is not None else key(self.__base, None, None),
+            handler,
+            handler.key(event, self.__manager.namespace, zone.path),
+        )
+
+        self.__manager.record(value, parent, zone.file_system)
+        self.__keys.append(value)
+
+
+class Layer:
+    def __init__(self, manager: "Manager", value: str):
+        self.__manager = manager
+        self.__value = value
+
+    @property
+    def __definition(self) -> typing.Dict[str, typing.Any]:
+        return self.__manager.index["layers"][self.__value]
+
+    @property
+    def key(self) -> str:
+        return self.__value
+
+    @property
+    def parent(self) -> typing.Optional[str]:
+        return self.__definition.get("parent", None)
+
+    @property
+    def hits(self) -> int:
+        return self.__definition.get("hits", 0)
+
+    @property
+    def created(self) -> datetime.datetime:
+        return self.__definition["created"]
+
+    @property
+    def used(self) -> datetime.datetime:
+        return self.__definition["used"]
+
+    @property
+    def identifier(self) -> "zonys.core.zfs.file_system.Identifier":
+        return self.__manager.file_system.identifier.child(self.__value)
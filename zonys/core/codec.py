@@ -0,0 +1,112 @@
+import collections
+import collections.abc
+import copy
+import hashlib
+import io
+import pathlib
+import threading
+import typing
+
+from ruamel import yaml
+
+_INCLUDE_CACHE_SIZE = 256
+
+_local = threading.local()
+
+_include_cache: "collections.OrderedDict[str, typing.Any]" = collections.OrderedDict()
+
+_include_lock = threading.Lock()
+
+
+def _safe() -> "yaml.YAML":
+    if not hasattr(_local, "safe"):
+        parser = yaml.YAML(typ="safe")
+        parser.default_flow_style = False
+        _local.safe = parser
+
+    return _local.safe
+
+
+def _round_trip() -> "yaml.YAML":
+    if not hasattr(_local, "round_trip"):
+        _local.round_trip = yaml.YAML()
+
+    return _local.round_trip
+
+
+def _plain(data: typing.Any) -> typing.Any:
+    if isinstance(data, collections.abc.Mapping):
+        return {_plain(key): _plain(value) for (key, value) in data.items()}
+
+    if isinstance(data, (list, tuple)):
+        return list(map(_plain, data))
+
+    if isinstance(data, bool) or data is None:
+        return data
+
+    for kind in (int, float, str):
+        if isinstance(data, kind):
+            return kind(data)
+
+    return data
+
+
+def load(source: typing.Union[str, pathlib.Path, typing.IO]) -> typing.Any:
+    return _safe().load(source)
+
+
+def dump(data: typing.Any, target: typing.Union[pathlib.Path, typing.IO]):
+    _safe().dump(_plain(data), target)
+
+
+def dumps(data: typing.Any) -> str:
+    buffer = io.StringIO()
+    dump(data, buffer)
+
+    return buffer.getvalue()
+
+
+def load_configuration(
+    source: typing.Union[str, pathlib.Path, typing.IO],
+) -> typing.Any:
+    return _round_trip().load(source)
+
+
+def read_include(path: pathlib.Path) -> typing.Tuple[str, typing.Any, bool]:
+    stat = path.stat()
+    key = str(path.resolve())
+    version = (stat.st_mtime_ns, stat.st_size)
+
+    with _include_lock:
+        cached = _include_cache.get(key, None)
+
+        if cached is not None and cached[0] == version:
+            _include_cache.move_to_end(key)
+            return (cached[1], copy.deepcopy(cached[2]), True)
+
+    content = path.read_bytes()
+    digest = hashlib.sha256(content).hexdigest()
+
+    if cached is not None and cached[1] == digest:
+        configuration = cached[2]
+    else:
+        configuration = load_configuration(content.decode())
+        cached = None
+
+    with _include_lock:
+        _include_cache[key] = (version, digest, configuration)
+        _include_cache.move_to_end(key)
+
+        while len(_include_cache) > _INCLUDE_CACHE_SIZE:
+            _include_cache.popitem(last=False)
+
+    return (digest, copy.deepcopy(configuration), cached is not None)
+
+
+def load_include(path: pathlib.Path) -> typing.Any:
+    return read_include(path)[1]
+
+
+def clear():
+    with _include_lock:
+        _include_cache.clear()
@@ -1,7 +1,10 @@
 import collections
+import copy
 import os
 import pathlib
+import string
 import sys
+import threading
 import typing
 
 import cerberus
@@ -20,6 +23,16 @@ class InvalidConfigurationError(Error):
     pass
 
 
+_VALIDATION_CACHE_SIZE = 256
+
+_validations: "collections.OrderedDict[typing.Any, typing.Any]" = (
+    collections.OrderedDict()
+)
+
+_validations_lock = threading.Lock()
+
+_formatter = string.Formatter()
+
 cerberus.Validator.types_mapping["type"] = cerberus.TypeDefinition("type", (type,), ())
 
 
@@ -71,12 +84,161 @@ class ValidationContextHandlerDetail:
         return self.__configuration
 
 
+def _validate(
+    schema: typing.Mapping[str, typing.Any],
+    configuration: typing.Mapping[str, typing.Any],
+    digest: typing.Optional[str],
+) -> typing.List["ValidationContextHandlerDetail"]:
+    key = None
+
+    if digest is not None:
+        key = (digest, id(schema))
+
+        with _validations_lock:
+            cached = _validations.get(key, None)
+
+            if cached is not None:
+                _validations.move_to_end(key)
+                return copy.deepcopy(cached)
+
+    validator = Validator(allow_unknown=True, handler_details=[])
+
+    if not validator.validate(configuration, schema):
+        raise InvalidConfigurationError(validator.errors)
+
+    if key is not None:
+        with _validations_lock:
+            _validations[key] = copy.deepcopy(validator.handler_details)
+
+            while len(_validations) > _VALIDATION_CACHE_SIZE:
+                _validations.popitem(last=False)
+
+    return validator.handler_details
+
+
+def _constant(value: typing.Any) -> typing.Callable[[typing.Mapping], typing.Any]:
+    return lambda _context: value
+
+
+def _compile_field(
+    field_name: str,
+    format_spec: str,
+    conversion: typing.Optional[str],
+) -> typing.Callable[[typing.Mapping], str]:
+    def render(context: typing.Mapping) -> str:
+        value, _ = _formatter.get_field(field_name, (), context)
+        return format(_formatter.convert_field(value, conversion), format_spec)
+
+    return render
+
+
+def _compile_string(value: str) -> typing.Callable[[typing.Mapping], typing.Any]:
+    try:
+        parsed = list(_formatter.parse(value))
+    except ValueError:
+        return lambda context: value.format(**context)
+
+    parts: typing.List[typing.Callable[[typing.Mapping], str]] = []
+
+    for literal, field_name, format_spec, conversion in parsed:
+        if len(literal) > 0:
+            parts.append(_constant(literal))
+
+        if field_name is None:
+            continue
+
+        if (
+            len(field_name) == 0
+            or field_name[0].isdigit()
+            or "{" in (format_spec or "")
+        ):
+            return lambda context: value.format(**context)
+
+        parts.append(_compile_field(field_name, format_spec or "", conversion))
+
+    if all(map(lambda x: x[1] is None, parsed)):
+        return _constant("".join(map(lambda x: x[0], parsed)))
+
+    return lambda context: "".join(map(lambda x: x(context), parts))
+
+
+def _compile(value: typing.Any) -> typing.Callable[[typing.Mapping], typing.Any]:
+    if isinstance(value, dict):
+        items = [(key, _compile(item)) for (key, item) in value.items()]
+        return lambda context: {key: item(context) for (key, item) in items}
+
+    if isinstance(value, list):
+        items = list(map(_compile, value))
+        return lambda context: [item(context) for item in items]
+
+    if isinstance(value, bool):
+        return _constant(value)
+
+    if isinstance(value, str):
+        return _compile_string(value)
+
+    if hasattr(value, "format") and callable(value.format):
+        return lambda context: value.format(**context)
+
+    return _constant(value)
+
+
+def _commit_events(handler) -> typing.List[str]:
+    prefix = "on_commit_"
+
+    return [
+        name[len(prefix) :]
+        for name in dir(handler)
+        if name.startswith(prefix) and callable(getattr(handler, name))
+    ]
+
+
+class Include:
+    def __init__(self, path: pathlib.Path):
+        self.__path = path
+        self.__digest = None
+        self.__cached = False
+        self.__seconds = None
+
+    @property
+    def path(self) -> pathlib.Path:
+        return self.__path
+
+    @property
+    def digest(self) -> typing.Optional[str]:
+        return self.__digest
+
+    @property
+    def cached(self) -> bool:
+        return self.__cached
+
+    @property
+    def seconds(self) -> typing.Optional[float]:
+        return self.__seconds
+
+    def is_resolved(self) -> bool:
+        return self.__seconds is not None
+
+    def resolve(self, digest: str, cached: bool, seconds: float):
+        self.__digest = digest
+        self.__cached = cached
+        self.__seconds = seconds
+
+
 class Manager:
     def __init__(self, *args, **kwargs):
         self.__rollback_methods = collections.OrderedDict()
         self.__attached_handlers = set()
         self.__commit_handlers = []
         self.__variables = {}
+        self.__includes: "collections.OrderedDict[str, Include]" = (
+            collections.OrderedDict()
+        )
+        self.__templates = []
+        self.__rendered: typing.Optional[typing.List[typing.Any]] = None
+        self.__dispatch: typing.Dict[str, typing.List[int]] = {}
+        self.__normalized: typing.Dict[typing.Tuple[int, int], typing.Any] = {}
+        self.__configuration = None
 
         for (key, value) in kwargs.items():
             setattr(self, key, value)
@@ -86,21 +248,20 @@ class Manager:
         schemas,
         configuration,
         base: typing.Optional[pathlib.Path] = None,
+        digest: typing.Optional[str] = None,
     ):
         if base is None:
             base = pathlib.Path(os.getcwd())
 
+        if self.__configuration is None:
+            self.__configuration = configuration
+
         current_configuration = {
             **configuration,
         }
 
         for schema in schemas:
-            validator = Validator(allow_unknown=True, handler_details=[])
-
-            if not validator.validate(current_configuration, schema):
-                raise InvalidConfigurationError(validator.errors)
-
-            for handler_detail in validator.handler_details:
+            for handler_detail in _validate(schema, current_configuration, digest):
                 handler = handler_detail.handler
                 if handler_detail.handler not in self.__attached_handlers:
                     handler_detail.handler.on_attach(
@@ -129,6 +290,13 @@ class Manager:
                         base,
                     )
                 )
+                self.__templates.append(_compile(handler_detail.configuration))
+                self.__rendered = None
+
+                for event_name in _commit_events(handler):
+                    self.__dispatch.setdefault(event_name, []).append(
+                        len(self.__commit_handlers) - 1
+                    )
 
                 handler.after_configuration(
                     AfterConfigurationEvent(
@@ -148,66 +316,114 @@ class Manager:
     def variables(self):
         return self.__variables
 
-    def commit(self, __name, **kwargs):
-        name = __name
+    @property
+    def includes(self) -> "collections.OrderedDict[str, Include]":
+        return self.__includes
 
-        on_commit_method_name = "on_commit_{}".format(name)
-        on_rollback_method_name = "on_rollback_{}".format(name)
+    @property
+    def configuration(self):
+        return self.__configuration
 
-        for (
-            instance,
-            options,
-            configuration,
-            base,
-        ) in self.__commit_handlers:
-            if not hasattr(instance, on_commit_method_name):
-                continue
+    def transaction(self) -> "Manager":
+        memo: typing.Dict[int, typing.Any] = {}
+
+        result = copy.copy(self)
+        result.__rollback_methods = collections.OrderedDict()
+        result.__attached_handlers = set(self.__attached_handlers)
+        result.__commit_handlers = [
+            (instance, options, copy.deepcopy(configuration, memo), base)
+            for (instance, options, configuration, base) in self.__commit_handlers
+        ]
+        result.__variables = dict(self.__variables)
+        result.__includes = collections.OrderedDict(self.__includes)
+        result.__templates = list(self.__templates)
+        result.__rendered = None
+        result.__dispatch = {
+            key: list(value) for (key, value) in self.__dispatch.items()
+        }
+        result.__normalized = {}
+        result.__configuration = copy.deepcopy(self.__configuration, memo)
 
-            commit = getattr(instance, on_commit_method_name)
-            if not callable(commit):
-                continue
-
-            def format_value(value):
-                result = None
-
-                if isinstance(value, dict):
-                    result = toolz.valmap(format_value, value)
-                elif isinstance(value, list):
-                    result = list(map(format_value, value))
-                elif isinstance(value, bool):
-                    result = value
-                elif hasattr(value, "format") and callable(value.format):
-                    result = value.format(
-                        env=dict(os.environ),
-                        environment=dict(os.environ),
-                        **toolz.valmap(
-                            VariableAccessor,
-                            self.__variables,
-                        ),
-                    )
-                else:
-                    result = value
+        return result
 
-                return result
+    @property
+    def __rendered_options(self) -> typing.List[typing.Any]:
+        if self.__rendered is None:
+            environment = dict(os.environ)
+            context = {
+                "env": environment,
+                "environment": environment,
+                **toolz.valmap(
+                    VariableAccessor,
+                    self.__variables,
+                ),
+            }
+
+            self.__rendered = list(map(lambda x: x(context), self.__templates))
+
+        return self.__rendered
 
-            options = format_value(options)
+    def __normalize(self, index: int, options, context) -> typing.Dict[str, typing.Any]:
+        (instance, _options, configuration, base) = self.__commit_handlers[index]
 
+        if instance.on_normalize is Handler.on_normalize:
+            return {}
+
+        key = (index, id(context.get("zone", None)))
+
+        if key not in self.__normalized:
             normalize_event = NormalizeEvent(
                 self,
                 options,
                 configuration,
                 base,
-                kwargs,
+                context,
             )
             instance.on_normalize(normalize_event)
 
+            self.__normalized[key] = normalize_event.normalized
+
+        return self.__normalized[key]
+
+    def handlers(self, __name) -> typing.List[typing.Tuple[typing.Any, "Event"]]:
+        return [
+            (
+                self.__commit_handlers[index][0],
+                Event(
+                    self,
+                    self.__rendered_options[index],
+                    self.__commit_handlers[index][2],
+                    self.__commit_handlers[index][3],
+                ),
+            )
+            for index in self.__dispatch.get(__name, [])
+        ]
+
+    def commit(self, __name, **kwargs):
+        name = __name
+
+        on_commit_method_name = "on_commit_{}".format(name)
+        on_rollback_method_name = "on_rollback_{}".format(name)
+
+        for index in self.__dispatch.get(name, []):
+            (
+                instance,
+                _options,
+                configuration,
+                base,
+            ) = self.__commit_handlers[index]
+
+            commit = getattr(instance, on_commit_method_name)
+            options = self.__rendered_options[index]
+            normalized = self.__normalize(index, options, kwargs)
+
             commit_event = CommitEvent(
                 self,
                 options,
                 configuration,
                 base,
                 kwargs,
-                normalize_event.normalized,
+                normalized,
             )
             commit(commit_event)
 
@@ -222,7 +438,7 @@ class Manager:
                     configuration,
                     base,
                     kwargs,
-                    normalize_event.normalized,
+                    normalized,
                 )
                 self.__rollback_methods[name].append(lambda: rollback(rollback_event))
 
@@ -0,0 +1,180 @@
+import contextlib
+import json
+import os
+import pathlib
+import sys
+import typing
+
+_COMMANDS = [
+    "devfs",
+    "jail",
+    "jexec",
+    "jls",
+    "mount",
+    "umount",
+]
+
+_PROGRAM = """#!{python}
+import fcntl
+import json
+import os
+import sys
+
+STATE = {state!r}
+
+
+def main(name, arguments):
+    with open(STATE, "r+") as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        state = json.load(handle)
+        code = run(state, name, arguments)
+        handle.seek(0)
+        handle.truncate()
+        json.dump(state, handle)
+
+    return code
+
+
+def options(arguments):
+    result = {{}}
+
+    for argument in arguments:
+        if "=" in argument:
+            (key, value) = argument.split("=", 1)
+            result[key] = value
+
+    return result
+
+
+def run(state, name, arguments):
+    if name == "jls":
+        print(
+            json.dumps(
+                {{
+                    "jail-information": {{
+                        "jail": [{{"name": x, **y}} for (x, y) in state["jails"].items()],
+                    }},
+                }}
+            )
+        )
+    elif name == "jail" and arguments[:1] == ["-c"]:
+        values = options(arguments[1:])
+        if values["name"] in state["jails"]:
+            return 1
+
+        state["jails"][values["name"]] = {{"path": values.get("path")}}
+    elif name == "jail" and arguments[:1] == ["-r"]:
+        if arguments[1] not in state["jails"]:
+            return 1
+
+        del state["jails"][arguments[1]]
+    elif name == "jexec":
+        arguments = [x for x in arguments if x != "-l"]
+        if arguments[0] not in state["jails"]:
+            return 1
+
+        state["executed"].append(arguments)
+    elif name == "mount" and len(arguments) == 0:
+        for entry in state["mounts"]:
+            flags = [entry["type"], "local"]
+            if entry["read_only"]:
+                flags.append("read-only")
+
+            print("{{}} on {{}} ({{}})".format(entry["source"], entry["destination"], ", ".join(flags)))
+    elif name == "mount":
+        kind = arguments[arguments.index("-t") + 1]
+        positional = [x for x in arguments if not x.startswith("-") and x != kind]
+        (source, destination) = positional[-2:]
+
+        if any(x["destination"] == destination for x in state["mounts"]):
+            return 1
+
+        state["mounts"].append(
+            {{
+                "type": kind,
+                "source": source,
+                "destination": destination,
+                "read_only": "-r" in arguments,
+            }}
+        )
+    elif name == "umount":
+        remaining = [x for x in state["mounts"] if x["destination"] != arguments[-1]]
+        if len(remaining) == len(state["mounts"]):
+            return 1
+
+        state["mounts"] = remaining
+
+    return 0
+
+
+sys.exit(main(os.path.basename(sys.argv[0]), sys.argv[1:]))
+"""
+
+
+class Commands:
+    def __init__(self, directory: pathlib.Path):
+        self.__directory = directory
+        self.__state = directory.joinpath("state.json")
+
+    @property
+    def directory(self) -> pathlib.Path:
+        return self.__directory
+
+    def install(self):
+        self.__directory.mkdir(parents=True, exist_ok=True)
+        self.__state.write_text(
+            json.dumps(
+                {
+                    "jails": {},
+                    "executed": [],
+                    "mounts": [],
+                }
+            )
+        )
+
+        program = self.__directory.joinpath("program")
+        program.write_text(
+            _PROGRAM.format(
+                python=sys.executable,
+                state=str(self.__state),
+            )
+        )
+        program.chmod(0o755)
+
+        for name in _COMMANDS:
+            path = self.__directory.joinpath(name)
+            if path.exists():
+                path.unlink()
+
+            path.symlink_to(program)
+
+    def add(self, name: str, source: str):
+        path = self.__directory.joinpath(name)
+        path.write_text(source)
+        path.chmod(0o755)
+
+    def __read(self) -> typing.Dict[str, typing.Any]:
+        return json.loads(self.__state.read_text())
+
+    def jails(self) -> typing.Dict[str, typing.Dict[str, typing.Any]]:
+        return self.__read()["jails"]
+
+    def executed(self) -> typing.List[typing.List[str]]:
+        return self.__read()["executed"]
+
+    def mounts(self) -> typing.List[typing.Dict[str, typing.Any]]:
+        return self.__read()["mounts"]
+
+
+@contextlib.contextmanager
+def commands(directory: typing.Union[str, pathlib.Path]) -> typing.Iterator["Commands"]:
+    handle = Commands(pathlib.Path(directory))
+    handle.install()
+
+    path = os.environ.get("PATH", "")
+    os.environ["PATH"] = os.pathsep.join([str(handle.directory), path])
+
+    try:
+        yield handle
+    finally:
+        os.environ["PATH"] = path
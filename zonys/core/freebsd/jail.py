@@ -33,6 +33,28 @@ class NotRunningError(RuntimeError):
     pass
 
 
+def running() -> typing.Set[str]:
+    command = [
+        "jls",
+        "-N",
+        "--libxo",
+        "json",
+    ]
+
+    result = subprocess.run(
+        command,
+        capture_output=True,
+        check=True,
+    )
+
+    return set(
+        map(
+            lambda x: x["name"],
+            json.loads(result.stdout)["jail-information"]["jail"],
+        )
+    )
+
+
 class Identifier:
     def __init__(self, name):
         self.__name = name
@@ -42,24 +64,7 @@ class Identifier:
         return self.__name
 
     def exists(self):
-        command = [
-            "jls",
-            "-N",
-            "--libxo",
-            "json",
-        ]
-
-        result = subprocess.run(
-            command,
-            capture_output=True,
-            check=True,
-        )
-
-        for i in json.loads(result.stdout)["jail-information"]["jail"]:
-            if i["name"] == self.name:
-                return True
-
-        return False
+        return self.name in running()
 
     def create(self, **kwargs):
         if self.exists():
@@ -5,15 +5,12 @@ import typing
 DEFAULT_CONFIGURATION_PATH = pathlib.Path("/", "etc", "pkg", "FreeBSD.conf")
 
 
-def install(
-    packages: typing.List[str],
+def _command(
     root: typing.Optional[typing.Union[pathlib.Path, str]] = None,
     configuration: typing.Optional[typing.Union[pathlib.Path, str]] = None,
     chroot: typing.Optional[typing.Union[pathlib.Path, str]] = None,
-):
-    if len(packages) == 0:
-        return
-
+    options: typing.Optional[typing.Mapping[str, typing.Any]] = None,
+) -> typing.List[str]:
     command = ["pkg"]
 
     flags = {
@@ -26,7 +23,71 @@ def install(
         if value is not None:
             command.extend([key, str(value)])
 
-    command.extend(["install", "-y", *packages])
+    for (key, value) in (options or {}).items():
+        command.extend(["-o", "{}={}".format(key, str(value))])
+
+    return command
+
+
+def update(
+    root: typing.Optional[typing.Union[pathlib.Path, str]] = None,
+    configuration: typing.Optional[typing.Union[pathlib.Path, str]] = None,
+    options: typing.Optional[typing.Mapping[str, typing.Any]] = None,
+    force: bool = False,
+):
+    command = _command(root=root, configuration=configuration, options=options)
+    command.append("update")
+
+    if force:
+        command.append("-f")
+
+    subprocess.run(
+        command,
+        check=True,
+    )
+
+
+def fetch(
+    packages: typing.List[str],
+    root: typing.Optional[typing.Union[pathlib.Path, str]] = None,
+    configuration: typing.Optional[typing.Union[pathlib.Path, str]] = None,
+    options: typing.Optional[typing.Mapping[str, typing.Any]] = None,
+):
+    if len(packages) == 0:
+        return
+
+    command = _command(root=root, configuration=configuration, options=options)
+    command.extend(["fetch", "-y", "-U", "-d", *packages])
+
+    subprocess.run(
+        command,
+        check=True,
+    )
+
+
+def install(
+    packages: typing.List[str],
+    root: typing.Optional[typing.Union[pathlib.Path, str]] = None,
+    configuration: typing.Optional[typing.Union[pathlib.Path, str]] = None,
+    chroot: typing.Optional[typing.Union[pathlib.Path, str]] = None,
+    options: typing.Optional[typing.Mapping[str, typing.Any]] = None,
+    update: bool = True,
+):
+    if len(packages) == 0:
+        return
+
+    command = _command(
+        root=root,
+        configuration=configuration,
+        chroot=chroot,
+        options=options,
+    )
+    command.extend(["install", "-y"])
+
+    if not update:
+        command.append("-U")
+
+    command.extend(packages)
 
     subprocess.run(
         command,
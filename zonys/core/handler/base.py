@@ -2,11 +2,10 @@ import uuid
 import pathlib
 
 import mergedeep
-import ruamel
-import ruamel.yaml
 
 import zonys
 import zonys.core
+import zonys.core.codec
 import zonys.core.zfs
 import zonys.core.zfs.file_system
 import zonys.core.configuration
@@ -18,17 +17,17 @@ class _Handler(zonys.core.configuration.Handler):
         event: "zonys.core.configuration.BeforeConfigurationEvent",
     ):
         if isinstance(event.options, int):
-            identifier = zonys.core.zfs.file_system.Identifier(
-                *event.manager.namespace.zone_manager.path.joinpath(
+            identifier = (
+                event.manager.namespace.zone_manager.file_system.identifier.child(
                     str(uuid.uuid4()),
-                ).parts[1:]
+                )
             )
 
             snapshot = identifier.receive(event.options)
 
             path = snapshot.path.joinpath(".zonys.yaml")
             if path.exists():
-                configuration = dict(ruamel.yaml.YAML().load(path))
+                configuration = dict(zonys.core.codec.load(path))
 
                 event.manager.read(
                     event.schemas,
@@ -61,6 +60,7 @@ class _Handler(zonys.core.configuration.Handler):
             )
 
         file_system = None
+        properties = event.context.get("file_system_properties", {})
 
         if "base" in event.configuration and isinstance(
             event.configuration["base"],
@@ -75,6 +75,9 @@ class _Handler(zonys.core.configuration.Handler):
                 raise
 
             del event.configuration["base"]
+
+            for name, value in properties.items():
+                file_system.properties[name].value = value
         elif isinstance(event.options, str):
             parent = None
 
@@ -83,7 +86,7 @@ class _Handler(zonys.core.configuration.Handler):
                 path = event.base.joinpath(path)
 
             if path.exists():
-                configuration = ruamel.yaml.YAML().load(path)
+                configuration = zonys.core.codec.load_configuration(path)
 
                 if "name" not in configuration:
                     raise zonys.core.configuration.InvalidConfigurationError(
@@ -101,6 +104,7 @@ class _Handler(zonys.core.configuration.Handler):
 
             file_system = parent.snapshots["initial"].zfs_snapshot_handle.clone(
                 event.context["file_system_identifier"],
+                properties,
             )
 
             event.context["persistence"].update(
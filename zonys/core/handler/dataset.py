@@ -0,0 +1,36 @@
+import zonys
+import zonys.core
+import zonys.core.configuration
+import zonys.core.profile
+
+
+class _Handler(zonys.core.configuration.Handler):
+    @staticmethod
+    def on_commit_before_create_zone(
+        event: "zonys.core.configuration.CommitEvent",
+    ):
+        profile_manager = event.context["manager"].namespace.profile_manager
+
+        try:
+            properties = profile_manager.resolve(event.options)
+        except zonys.core.profile.Error as error:
+            raise zonys.core.configuration.InvalidConfigurationError(
+                str(error),
+            ) from error
+
+        event.context.update(
+            {
+                "file_system_properties": {
+                    **event.context.get("file_system_properties", {}),
+                    **properties,
+                },
+            }
+        )
+
+
+SCHEMA = {
+    "dataset": {
+        "type": ["string", "dict"],
+        "handler": _Handler,
+    }
+}
@@ -1,13 +1,17 @@
 import pathlib
+import time
 
 import mergedeep
-import ruamel
-import ruamel.yaml
 
 import zonys
 import zonys.core
+import zonys.core.codec
 import zonys.core.configuration
-import zonys.core.util
+
+
+class CycleError(zonys.core.configuration.InvalidConfigurationError):
+    def __init__(self, path: pathlib.Path):
+        super().__init__("Include {} includes itself".format(str(path)))
 
 
 class _Handler(zonys.core.configuration.Handler):
@@ -15,29 +19,60 @@ class _Handler(zonys.core.configuration.Handler):
     def before_configuration(
         event: "zonys.core.configuration.BeforeConfigurationEvent",
     ):
-        path = pathlib.Path(event.options)
-        if not path.is_absolute():
-            path = event.base.joinpath(path)
+        options = event.options
+        if not isinstance(options, list):
+            options = [options]
+
+        includes = event.manager.includes
+        included = {}
+
+        for option in options:
+            path = pathlib.Path(option)
+            if not path.is_absolute():
+                path = event.base.joinpath(path)
+
+            key = str(path.resolve())
 
-        configuration = ruamel.yaml.YAML().load(zonys.core.util.open(path))
+            if key in includes:
+                if not includes[key].is_resolved():
+                    raise CycleError(path)
 
-        if configuration is not None:
-            event.manager.read(event.schemas, configuration, path.parent)
+                continue
 
-            event.configuration.update(
-                mergedeep.merge(
+            include = zonys.core.configuration.Include(path)
+            includes[key] = include
+            start = time.monotonic()
+
+            digest, configuration, cached = zonys.core.codec.read_include(path)
+
+            if configuration is not None:
+                event.manager.read(event.schemas, configuration, path.parent, digest)
+
+                included = mergedeep.merge(
+                    included,
                     configuration,
-                    event.configuration,
                     strategy=mergedeep.Strategy.ADDITIVE,
                 )
+
+            include.resolve(digest, cached, time.monotonic() - start)
+
+        event.configuration.update(
+            mergedeep.merge(
+                included,
+                event.configuration,
+                strategy=mergedeep.Strategy.ADDITIVE,
             )
+        )
 
         del event.configuration["include"]
 
 
 SCHEMA = {
     "include": {
-        "type": "string",
+        "type": ["string", "list"],
+        "schema": {
+            "type": "string",
+        },
         "handler": _Handler,
     },
 }
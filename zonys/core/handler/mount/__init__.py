@@ -1,6 +1,7 @@
 from zonys.core.handler.mount import (
     devfs,
     nullfs,
+    volume,
     zfs,
 )
 
@@ -11,6 +12,7 @@ SCHEMA = {
             "anyof": [
                 devfs.SCHEMA,
                 nullfs.SCHEMA,
+                volume.SCHEMA,
                 zfs.SCHEMA,
             ],
         },
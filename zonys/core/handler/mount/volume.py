@@ -0,0 +1,137 @@
+import pathlib
+
+import zonys
+import zonys.core
+import zonys.core.configuration
+import zonys.core.freebsd
+import zonys.core.freebsd.mount
+import zonys.core.freebsd.mount.nullfs
+from zonys.core.handler.mount import nullfs, zfs
+
+
+def _delegate(event) -> "zonys.core.configuration.Handler":
+    if event.options.get("jail", False):
+        return zfs._Handler
+
+    return nullfs._Handler
+
+
+class _Handler(zonys.core.configuration.Handler):
+    @staticmethod
+    def on_normalize(
+        event: "zonys.core.configuration.NormalizeEvent",
+    ):
+        volumes = event.context["zone"].manager.namespace.volume_manager.volumes
+
+        if event.options["name"] not in volumes:
+            raise zonys.core.configuration.InvalidConfigurationError(
+                "Volume {} does not exist".format(event.options["name"]),
+            )
+
+        volume = volumes[event.options["name"]]
+
+        if event.options.get("jail", False):
+            event.normalized.update(
+                {
+                    "file_system": volume.file_system,
+                }
+            )
+
+            return
+
+        if "destination" not in event.options:
+            raise zonys.core.configuration.Error(
+                "destination path is required unless the volume is jailed",
+            )
+
+        destination = pathlib.Path(event.options["destination"])
+
+        if not destination.is_absolute():
+            raise zonys.core.configuration.Error(
+                "destination path must be absolute",
+            )
+
+        destination = event.context["zone"].path.joinpath(*destination.parts[1:])
+
+        event.normalized.update(
+            {
+                "mountpoint": zonys.core.freebsd.mount.nullfs.Mountpoint(
+                    volume.path,
+                    destination,
+                    event.options.get("readOnly", False),
+                ),
+            }
+        )
+
+    @staticmethod
+    def on_commit_before_start_zone(
+        event: "zonys.core.configuration.CommitEvent",
+    ):
+        if event.options.get("jail", False):
+            zfs._Handler.on_commit_before_start_zone(event)
+        else:
+            event.normalized["mountpoint"].destination.mkdir(
+                parents=True, exist_ok=True
+            )
+            nullfs._Handler.on_commit_before_start_zone(event)
+
+    @staticmethod
+    def on_rollback_before_start_zone(
+        event: "zonys.core.configuration.RollbackEvent",
+    ):
+        _delegate(event).on_rollback_before_start_zone(event)
+
+    @staticmethod
+    def on_commit_after_start_zone(
+        event: "zonys.core.configuration.CommitEvent",
+    ):
+        if event.options.get("jail", False):
+            zfs._Handler.on_commit_after_start_zone(event)
+
+    @staticmethod
+    def on_rollback_after_start_zone(
+        event: "zonys.core.configuration.RollbackEvent",
+    ):
+        if event.options.get("jail", False):
+            zfs._Handler.on_rollback_after_start_zone(event)
+
+    @staticmethod
+    def on_commit_before_stop_zone(
+        event: "zonys.core.configuration.CommitEvent",
+    ):
+        if event.options.get("jail", False):
+            zfs._Handler.on_commit_before_stop_zone(event)
+
+    @staticmethod
+    def on_commit_after_stop_zone(
+        event: "zonys.core.configuration.CommitEvent",
+    ):
+        _delegate(event).on_commit_after_stop_zone(event)
+
+
+SCHEMA = {
+    "type": "dict",
+    "allow_unknown": False,
+    "schema": {
+        "volume": {
+            "type": "dict",
+            "allow_unknown": False,
+            "schema": {
+                "name": {
+                    "type": "string",
+                    "required": True,
+                },
+                "destination": {
+                    "type": "string",
+                },
+                "readOnly": {
+                    "type": "boolean",
+                },
+                "jail": {
+                    "type": "boolean",
+                },
+            },
+            "handler": _Handler,
+        },
+    },
+}
@@ -1,15 +1,36 @@
 import pathlib
+import typing
 import urllib
 
 import zonys
 import zonys.core
 import zonys.core.util
 import zonys.core.configuration
+import zonys.core.transfer
+from zonys.core.handler.provision import step
 
 
-class _Handler(zonys.core.configuration.Handler):
+class _Handler(step.Handler):
+    @classmethod
+    def key(
+        cls,
+        event: "zonys.core.configuration.Event",
+        namespace: "zonys.core.namespace.Handle",
+        root: pathlib.Path,
+    ) -> typing.Any:
+        source = urllib.parse.urlparse(event.options["source"])
+        path = pathlib.Path(source.path)
+
+        if len(source.netloc) != 0 or not path.exists():
+            return event.options
+
+        return {
+            **event.options,
+            "fingerprint": zonys.core.transfer.fingerprint(path),
+        }
+
     @staticmethod
-    def on_commit_after_create_zone(
+    def provision(
         event: "zonys.core.configuration.CommitEvent",
     ):
         destination = pathlib.Path(event.options["destination"])
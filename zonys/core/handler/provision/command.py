@@ -3,11 +3,12 @@ import zonys.core
 import zonys.core.configuration
 import zonys.core.freebsd
 import zonys.core.freebsd.jail
+from zonys.core.handler.provision import step
 
 
-class _Handler(zonys.core.configuration.Handler):
+class _Handler(step.Handler):
     @staticmethod
-    def on_commit_after_create_zone(
+    def provision(
         event: "zonys.core.configuration.CommitEvent",
     ):
         with zonys.core.freebsd.jail.temporary(
@@ -3,11 +3,12 @@ import pathlib
 import zonys
 import zonys.core
 import zonys.core.configuration
+from zonys.core.handler.provision import step
 
 
-class _Handler(zonys.core.configuration.Handler):
+class _Handler(step.Handler):
     @staticmethod
-    def on_commit_after_create_zone(
+    def provision(
         event: "zonys.core.configuration.CommitEvent",
     ):
         path = pathlib.Path(event.options["path"])
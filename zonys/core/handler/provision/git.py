@@ -1,15 +1,31 @@
 import pathlib
-
-import git
+import typing
 
 import zonys
 import zonys.core
 import zonys.core.configuration
+import zonys.core.mirror
+from zonys.core.handler.provision import step
+
 
+class _Handler(step.Handler):
+    @classmethod
+    def key(
+        cls,
+        event: "zonys.core.configuration.Event",
+        namespace: "zonys.core.namespace.Handle",
+        root: pathlib.Path,
+    ) -> typing.Any:
+        mirror = namespace.mirror_manager[event.options["url"]]
+        mirror.update(event.options.get("object", None))
+
+        return {
+            **event.options,
+            "commit": mirror.resolve(event.options.get("object", None)),
+        }
 
-class _Handler(zonys.core.configuration.Handler):
     @staticmethod
-    def on_commit_after_create_zone(
+    def provision(
         event: "zonys.core.configuration.CommitEvent",
     ):
         path = pathlib.Path(event.options["path"])
@@ -19,7 +35,8 @@ class _Handler(zonys.core.configuration.Handler):
                 "path must be absolute",
             )
 
-        path = event.context["zone"].path.joinpath(
+        zone = event.context["zone"]
+        path = zone.path.joinpath(
             *path.parts[1:],
         )
 
@@ -28,10 +45,15 @@ class _Handler(zonys.core.configuration.Handler):
             exist_ok=True,
         )
 
-        git.Repo.clone_from(
+        zone.manager.namespace.mirror_manager.checkout(
             event.options["url"],
             path,
-            branch=event.options.get("object", None),
+            event.options.get("object", None),
+            depth=event.options.get("depth", None),
+            sparse=event.options.get("sparse", None),
+            submodules=event.options.get("submodules", False),
+            jobs=event.options.get("jobs", zonys.core.mirror.JOBS),
+            alternates=event.options.get("alternates", False),
         )
 
 
@@ -54,6 +76,26 @@ SCHEMA = {
                 "object": {
                     "type": "string",
                 },
+                "depth": {
+                    "type": "integer",
+                    "min": 1,
+                },
+                "sparse": {
+                    "type": "list",
+                    "schema": {
+                        "type": "string",
+                    },
+                },
+                "submodules": {
+                    "type": "boolean",
+                },
+                "jobs": {
+                    "type": "integer",
+                    "min": 1,
+                },
+                "alternates": {
+                    "type": "boolean",
+                },
             },
             "handler": _Handler,
         }
@@ -1,22 +1,45 @@
 import pathlib
+import typing
 
 import zonys
 import zonys.core
 import zonys.core.configuration
 import zonys.core.freebsd.pkg
+from zonys.core.handler.provision import step
 
 
-class _Handler(zonys.core.configuration.Handler):
+def _configuration(root: pathlib.Path) -> pathlib.Path:
+    return root.joinpath(
+        pathlib.Path(zonys.core.freebsd.pkg.DEFAULT_CONFIGURATION_PATH.parts[1])
+    )
+
+
+class _Handler(step.Handler):
+    @classmethod
+    def key(
+        cls,
+        event: "zonys.core.configuration.Event",
+        namespace: "zonys.core.namespace.Handle",
+        root: pathlib.Path,
+    ) -> typing.Any:
+        repository = namespace.package_manager.repository(root)
+
+        return {
+            "packages": sorted(set(event.options)),
+            "realm": repository.realm,
+            "catalogue": repository.digest,
+        }
+
     @staticmethod
-    def on_commit_after_create_zone(
+    def provision(
         event: "zonys.core.configuration.CommitEvent",
     ):
-        zonys.core.freebsd.pkg.install(
+        zone = event.context["zone"]
+
+        zone.manager.namespace.package_manager.install(
             event.options,
-            configuration=event.context["zone"].path.joinpath(
-                pathlib.Path(zonys.core.freebsd.pkg.DEFAULT_CONFIGURATION_PATH.parts[1])
-            ),
-            root=event.context["zone"].path,
+            configuration=_configuration(zone.path),
+            root=zone.path,
         )
 
 
@@ -1,15 +1,37 @@
 import pathlib
-import shutil
+import typing
 
 import zonys
 import zonys.core
 import zonys.core.util
 import zonys.core.configuration
+import zonys.core.transfer
+from zonys.core.handler.provision import step
 
 
-class _Handler(zonys.core.configuration.Handler):
+def _source(event: "zonys.core.configuration.Event") -> pathlib.Path:
+    source = pathlib.Path(event.options["source"])
+    if not source.is_absolute():
+        source = event.base.joinpath(source)
+
+    return source
+
+
+class _Handler(step.Handler):
+    @classmethod
+    def key(
+        cls,
+        event: "zonys.core.configuration.Event",
+        namespace: "zonys.core.namespace.Handle",
+        root: pathlib.Path,
+    ) -> typing.Any:
+        return {
+            **event.options,
+            "fingerprint": zonys.core.transfer.fingerprint(_source(event)),
+        }
+
     @staticmethod
-    def on_commit_after_create_zone(
+    def provision(
         event: "zonys.core.configuration.CommitEvent",
     ):
         destination = pathlib.Path(event.options["destination"])
@@ -23,14 +45,12 @@ class _Handler(zonys.core.configuration.Handler):
             *destination.parts[1:],
         )
 
-        source = pathlib.Path(event.options["source"])
-        if not source.is_absolute():
-            source = event.base.joinpath(source)
-
-        if source.is_dir():
-            shutil.copytree(source, destination)
-        else:
-            shutil.copyfile(source, destination)
+        zonys.core.transfer.copy(
+            _source(event),
+            destination,
+            incremental=event.options.get("incremental", None),
+            workers=event.options.get("workers", zonys.core.transfer.WORKERS),
+        )
 
 
 SCHEMA = {
@@ -49,6 +69,14 @@ SCHEMA = {
                     "type": "string",
                     "required": True,
                 },
+                "incremental": {
+                    "type": "string",
+                    "allowed": zonys.core.transfer.MODES,
+                },
+                "workers": {
+                    "type": "integer",
+                    "min": 1,
+                },
             },
             "handler": _Handler,
         },
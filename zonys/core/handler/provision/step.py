@@ -0,0 +1,37 @@
+import abc
+import pathlib
+import typing
+
+import zonys
+import zonys.core
+import zonys.core.configuration
+
+
+class Handler(zonys.core.configuration.Handler, abc.ABC):
+    @classmethod
+    def on_commit_after_create_zone(
+        cls,
+        event: "zonys.core.configuration.CommitEvent",
+    ):
+        build = event.context.get("build", None)
+
+        if build is None:
+            cls.provision(event)
+        else:
+            build.step(cls, event)
+
+    @classmethod
+    def key(
+        cls,
+        event: "zonys.core.configuration.Event",
+        namespace: "zonys.core.namespace.Handle",
+        root: pathlib.Path,
+    ) -> typing.Any:
+        return event.options
+
+    @staticmethod
+    @abc.abstractmethod
+    def provision(
+        event: "zonys.core.configuration.CommitEvent",
+    ):
+        pass
@@ -0,0 +1,87 @@
+import zonys
+import zonys.core
+import zonys.core.configuration
+import zonys.core.thin
+
+
+class _Handler(zonys.core.configuration.Handler):
+    @staticmethod
+    def on_commit_before_create_zone(
+        event: "zonys.core.configuration.CommitEvent",
+    ):
+        if event.context.get("file_system", None) is not None:
+            raise zonys.core.configuration.InvalidConfigurationError(
+                "File system already provided"
+            )
+
+        thin_manager = event.context["manager"].namespace.thin_manager
+
+        if event.options not in thin_manager:
+            raise zonys.core.configuration.InvalidConfigurationError(
+                "Thin base {} does not exist".format(event.options),
+            )
+
+        base = thin_manager[event.options]
+        file_system = event.context["file_system_identifier"].create(
+            properties=event.context.get("file_system_properties", {}),
+        )
+
+        try:
+            base.link(file_system.path)
+            base.mount(file_system.path)
+        except:
+            base.unmount(file_system.path)
+            file_system.destroy()
+            raise
+
+        event.context["persistence"].update(
+            {
+                "thin": base.name,
+            }
+        )
+
+        event.context.update(
+            {
+                "file_system": file_system,
+            }
+        )
+
+    @staticmethod
+    def on_rollback_before_create_zone(
+        event: "zonys.core.configuration.RollbackEvent",
+    ):
+        file_system = event.context.get("file_system", None)
+
+        if file_system is not None:
+            event.context["manager"].namespace.thin_manager[event.options].unmount(
+                file_system.path
+            )
+
+    @staticmethod
+    def on_commit_before_start_zone(
+        event: "zonys.core.configuration.CommitEvent",
+    ):
+        zone = event.context["zone"]
+        zone.thin.mount(zone.path)
+
+    @staticmethod
+    def on_commit_before_destroy_zone(
+        event: "zonys.core.configuration.CommitEvent",
+    ):
+        zone = event.context["zone"]
+        zone.thin.unmount(zone.path)
+
+    @staticmethod
+    def on_rollback_before_destroy_zone(
+        event: "zonys.core.configuration.RollbackEvent",
+    ):
+        zone = event.context["zone"]
+        zone.thin.mount(zone.path)
+
+
+SCHEMA = {
+    "thin": {
+        "type": "string",
+        "handler": _Handler,
+    }
+}
@@ -0,0 +1,164 @@
+import contextlib
+import fcntl
+import os
+import pathlib
+import threading
+import typing
+import uuid
+
+import zonys
+import zonys.core
+
+SHARED = "shared"
+
+EXCLUSIVE = "exclusive"
+
+MODES = {
+    SHARED: fcntl.LOCK_SH,
+    EXCLUSIVE: fcntl.LOCK_EX,
+}
+
+_local = threading.local()
+
+
+class Error(RuntimeError):
+    pass
+
+
+class InvalidModeError(Error):
+    pass
+
+
+class UpgradeError(Error):
+    def __init__(self, path: pathlib.Path):
+        super().__init__(
+            "Lock {} is held shared and cannot be upgraded to exclusive".format(
+                str(path),
+            )
+        )
+
+
+def _held() -> typing.Dict[str, typing.List[typing.Any]]:
+    if not hasattr(_local, "held"):
+        _local.held = {}
+
+    return _local.held
+
+
+def _pending() -> typing.Dict[str, typing.List[typing.Callable[[], None]]]:
+    if not hasattr(_local, "pending"):
+        _local.pending = {}
+
+    return _local.pending
+
+
+class Lock:
+    def __init__(self, path: pathlib.Path):
+        self.__path = path
+
+    @property
+    def path(self) -> pathlib.Path:
+        return self.__path
+
+    def is_held(self) -> bool:
+        return str(self.__path) in _held()
+
+    def defer(self, callback: typing.Callable[[], None]):
+        if not self.is_held():
+            callback()
+            return
+
+        _pending().setdefault(str(self.__path), []).append(callback)
+
+    @contextlib.contextmanager
+    def acquire(self, mode: str = EXCLUSIVE) -> typing.Iterator["Lock"]:
+        if mode not in MODES:
+            raise InvalidModeError(mode)
+
+        held = _held()
+        key = str(self.__path)
+
+        if key in held:
+            if mode == EXCLUSIVE and held[key][0] == SHARED:
+                raise UpgradeError(self.__path)
+
+            held[key][1] = held[key][1] + 1
+
+            try:
+                yield self
+            finally:
+                held[key][1] = held[key][1] - 1
+
+            return
+
+        self.__path.parent.mkdir(parents=True, exist_ok=True)
+        descriptor = os.open(
+            str(self.__path),
+            os.O_RDWR | os.O_CREAT | os.O_CLOEXEC,
+            0o644,
+        )
+
+        try:
+            try:
+                fcntl.flock(descriptor, MODES[mode])
+                held[key] = [mode, 1]
+
+                try:
+                    yield self
+                finally:
+                    del held[key]
+            finally:
+                os.close(descriptor)
+        finally:
+            for callback in _pending().pop(key, []):
+                callback()
+
+
+class Manager:
+    def __init__(self, _namespace: "zonys.core.namespace.Handle"):
+        self.__namespace = _namespace
+
+    @property
+    def namespace(self) -> "zonys.core.namespace.Handle":
+        return self.__namespace
+
+    @property
+    def path(self) -> pathlib.Path:
+        return self.__namespace.path.joinpath("lock")
+
+    def lock(self, name: str) -> "Lock":
+        return Lock(self.path.joinpath(name))
+
+    @contextlib.contextmanager
+    def exclusive(self) -> typing.Iterator["Lock"]:
+        with self.lock("namespace").acquire(EXCLUSIVE) as lock:
+            yield lock
+
+    @contextlib.contextmanager
+    def shared(self) -> typing.Iterator["Lock"]:
+        with self.lock("namespace").acquire(SHARED) as lock:
+            yield lock
+
+    @contextlib.contextmanager
+    def zone(
+        self,
+        value: typing.Union[str, uuid.UUID],
+        mode: str = EXCLUSIVE,
+    ) -> typing.Iterator["Lock"]:
+        with self.shared():
+            with self.lock(str(value)).acquire(mode) as lock:
+                yield lock
+
+    @contextlib.contextmanager
+    def names(self) -> typing.Iterator["Lock"]:
+        with self.lock("name").acquire(EXCLUSIVE) as lock:
+            yield lock
+
+    def discard(self, value: typing.Union[str, uuid.UUID]):
+        self.lock("namespace").defer(lambda: self.__discard(value))
+
+    def __discard(self, value: typing.Union[str, uuid.UUID]):
+        with self.exclusive():
+            path = self.lock(str(value)).path
+            if path.exists():
+                path.unlink()
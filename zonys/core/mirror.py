@@ -0,0 +1,228 @@
+import datetime
+import hashlib
+import pathlib
+import typing
+
+import git
+
+import zonys
+import zonys.core
+import zonys.core.persistence
+
+INTERVAL = datetime.timedelta(minutes=1)
+
+JOBS = 4
+
+
+class Error(RuntimeError):
+    pass
+
+
+class ObjectNotFoundError(Error):
+    pass
+
+
+def name(url: str) -> str:
+    return "{}.git".format(hashlib.sha256(url.encode()).hexdigest())
+
+
+class Manager:
+    def __init__(
+        self,
+        _namespace: "zonys.core.namespace.Handle",
+        interval: datetime.timedelta = INTERVAL,
+    ):
+        self.__namespace = _namespace
+        self.__interval = interval
+        self.__index = None
+
+    @property
+    def namespace(self) -> "zonys.core.namespace.Handle":
+        return self.__namespace
+
+    @property
+    def interval(self) -> datetime.timedelta:
+        return self.__interval
+
+    @property
+    def path(self) -> pathlib.Path:
+        return self.__namespace.path.joinpath("mirror")
+
+    @property
+    def index(self) -> "zonys.core.persistence.Base":
+        if self.__index is None:
+            self.__index = zonys.core.persistence.Base(
+                self.__namespace.path.joinpath("zonys.mirror.yaml")
+            )
+
+        return self.__index
+
+    @property
+    def mirrors(self) -> typing.List["Mirror"]:
+        return list(
+            map(
+                lambda x: Mirror(self, x),
+                sorted(self.index.get("mirrors", {}).keys()),
+            )
+        )
+
+    def __getitem__(self, url: str) -> "Mirror":
+        return Mirror(self, url)
+
+    def checkout(
+        self,
+        url: str,
+        path: pathlib.Path,
+        _object: typing.Optional[str] = None,
+        **kwargs,
+    ) -> "git.Repo":
+        mirror = self[url]
+        mirror.update(_object)
+
+        return mirror.checkout(path, _object, **kwargs)
+
+
+class Mirror:
+    def __init__(self, manager: "Manager", url: str):
+        self.__manager = manager
+        self.__url = url
+
+    @property
+    def manager(self) -> "Manager":
+        return self.__manager
+
+    @property
+    def url(self) -> str:
+        return self.__url
+
+    @property
+    def path(self) -> pathlib.Path:
+        return self.__manager.path.joinpath(name(self.__url))
+
+    @property
+    def uri(self) -> str:
+        return self.path.as_uri()
+
+    @property
+    def __definition(self) -> typing.Dict[str, typing.Any]:
+        return self.__manager.index.get("mirrors", {}).get(self.__url, {})
+
+    @property
+    def fetched(self) -> typing.Optional[datetime.datetime]:
+        return self.__definition.get("fetched", None)
+
+    def exists(self) -> bool:
+        return self.path.joinpath("HEAD").exists()
+
+    def __lock(self) -> typing.ContextManager["zonys.core.lock.Lock"]:
+        return self.__manager.namespace.lock_manager.lock(
+            "mirror-{}".format(self.path.name),
+        ).acquire()
+
+    def __flush(self, **kwargs):
+        index = self.__manager.index
+        mirrors = dict(index.get("mirrors", {}))
+        mirrors[self.__url] = {
+            **mirrors.get(self.__url, {}),
+            **kwargs,
+        }
+
+        index["mirrors"] = mirrors
+        index.flush()
+
+    def __repository(self) -> "git.Repo":
+        return git.Repo(self.path)
+
+    def __has(self, _object: typing.Optional[str]) -> bool:
+        if _object is None:
+            return True
+
+        try:
+            self.__repository().git.rev_parse(
+                "--verify", "{}^{{commit}}".format(_object)
+            )
+            return True
+        except git.GitCommandError:
+            return False
+
+    def is_stale(self) -> bool:
+        fetched = self.fetched
+
+        return (
+            fetched is None
+            or datetime.datetime.now() - fetched >= self.__manager.interval
+        )
+
+    def update(self, _object: typing.Optional[str] = None, force: bool = False) -> bool:
+        with self.__lock():
+            if not self.exists():
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                repository = git.Repo.clone_from(
+                    self.__url,
+                    self.path,
+                    mirror=True,
+                )
+                repository.git.config("uploadpack.allowAnySHA1InWant", "true")
+            elif force or self.is_stale() or not self.__has(_object):
+                self.__repository().git.fetch("--prune", "origin")
+            else:
+                return False
+
+            self.__flush(fetched=datetime.datetime.now())
+
+            return True
+
+    def resolve(self, _object: typing.Optional[str] = None) -> str:
+        try:
+            return self.__repository().git.rev_parse(
+                "--verify",
+                "{}^{{commit}}".format(_object or "HEAD"),
+            )
+        except git.GitCommandError as error:
+            raise ObjectNotFoundError(_object) from error
+
+    # pylint: disable=too-many-arguments
+    def checkout(
+        self,
+        path: pathlib.Path,
+        _object: typing.Optional[str] = None,
+        depth: typing.Optional[int] = None,
+        sparse: typing.Optional[typing.List[str]] = None,
+        submodules: bool = False,
+        jobs: int = JOBS,
+        alternates: bool = False,
+    ) -> "git.Repo":
+        commit = self.resolve(_object)
+
+        if depth is not None:
+            repository = git.Repo.init(path)
+            repository.create_remote("origin", self.uri)
+            repository.git.fetch("--depth", str(depth), "origin", commit)
+        else:
+            repository = git.Repo.clone_from(
+                self.path,
+                path,
+                no_checkout=True,
+                shared=alternates,
+            )
+
+        if sparse is not None and len(sparse) > 0:
+            repository.git.sparse_checkout("set", "--cone", *sparse)
+
+        if depth is not None:
+            repository.git.checkout("--detach", commit)
+        elif _object is None:
+            repository.git.reset("--hard")
+        else:
+            repository.git.checkout(_object)
+
+        repository.remotes.origin.set_url(self.__url)
+
+        if submodules:
+            arguments = ["update", "--init", "--recursive", "--jobs", str(jobs)]
+            if depth is not None:
+                arguments.extend(["--depth", str(depth)])
+
+            repository.git.submodule(*arguments)
+
+        return repository
@@ -4,13 +4,26 @@ import sys
 
 import zonys
 import zonys.core
+import zonys.core.cache
+import zonys.core.codec
 import zonys.core.zone
+import zonys.core.lock
+import zonys.core.mirror
+import zonys.core.package
 import zonys.core.persistence
+import zonys.core.profile
+import zonys.core.reaper
+import zonys.core.replication
+import zonys.core.snapshot
+import zonys.core.template
+import zonys.core.thin
 import zonys.core.volume
 import zonys.core.freebsd
 import zonys.core.freebsd.service
 import zonys.core.freebsd.sysrc
 
+_MANIFEST_NAME = ".zonys.yaml"
+
 _IDENTIFIER_SEPARATOR = "/"
 
 _DEFAULT_IDENTIFIER = _IDENTIFIER_SEPARATOR.join(
@@ -21,6 +34,18 @@ _DEFAULT_IDENTIFIER = _IDENTIFIER_SEPARATOR.join(
 )
 
 
+class Error(RuntimeError):
+    pass
+
+
+class SnapshotNotFoundError(Error):
+    pass
+
+
+class SnapshotAlreadyExistsError(Error):
+    pass
+
+
 class Handle:
     def __init__(self, file_system: "zonys.core.zfs.file_system.Handle"):
         self.__file_system = file_system
@@ -30,6 +55,17 @@ class Handle:
         self.__persistence = zonys.core.persistence.Base(
             self.__file_system.path.joinpath("zonys.core.yaml")
         )
+        self.__template_manager = zonys.core.template.Manager(self)
+        self.__snapshot_manager = zonys.core.snapshot.Manager(self)
+        self.__snapshots = _Snapshots(self)
+        self.__replication_manager = zonys.core.replication.Manager(self)
+        self.__lock_manager = zonys.core.lock.Manager(self)
+        self.__cache_manager = zonys.core.cache.Manager(self)
+        self.__package_manager = zonys.core.package.Manager(self)
+        self.__mirror_manager = zonys.core.mirror.Manager(self)
+        self.__thin_manager = zonys.core.thin.Manager(self)
+        self.__profile_manager = zonys.core.profile.Manager(self)
+        self.__reaper_manager = zonys.core.reaper.Manager(self)
 
     @property
     def file_system(self) -> "zonys.core.zfs.file_system.Handle":
@@ -43,10 +79,58 @@ class Handle:
     def zone_manager(self) -> "zonys.core.zone.Manager":
         return self.__zone_manager
 
+    @property
+    def lock_manager(self) -> "zonys.core.lock.Manager":
+        return self.__lock_manager
+
+    @property
+    def cache_manager(self) -> "zonys.core.cache.Manager":
+        return self.__cache_manager
+
+    @property
+    def package_manager(self) -> "zonys.core.package.Manager":
+        return self.__package_manager
+
+    @property
+    def mirror_manager(self) -> "zonys.core.mirror.Manager":
+        return self.__mirror_manager
+
+    @property
+    def thin_manager(self) -> "zonys.core.thin.Manager":
+        return self.__thin_manager
+
+    @property
+    def profile_manager(self) -> "zonys.core.profile.Manager":
+        return self.__profile_manager
+
+    @property
+    def reaper_manager(self) -> "zonys.core.reaper.Manager":
+        return self.__reaper_manager
+
     @property
     def volume_manager(self) -> "zonys.core.volume.Manager":
         return self.__volume_manager
 
+    @property
+    def template_manager(self) -> "zonys.core.template.Manager":
+        return self.__template_manager
+
+    @property
+    def snapshot_manager(self) -> "zonys.core.snapshot.Manager":
+        return self.__snapshot_manager
+
+    @property
+    def replication_manager(self) -> "zonys.core.replication.Manager":
+        return self.__replication_manager
+
+    @property
+    def snapshots(self) -> "_Snapshots":
+        return self.__snapshots
+
+    @property
+    def persistence(self) -> "zonys.core.persistence.Base":
+        return self.__persistence
+
     @property
     def service(self) -> "_Service":
         return self.__service
@@ -59,6 +143,99 @@ class Handle:
         return self.identifier == _DEFAULT_IDENTIFIER
 
 
+class _Snapshots:
+    def __init__(self, namespace: "Handle"):
+        self.__namespace = namespace
+
+    @property
+    def __file_system(self) -> "zonys.core.zfs.file_system.Handle":
+        return self.__namespace.zone_manager.file_system
+
+    def __iter__(self) -> typing.Iterator["_Snapshot"]:
+        return iter(
+            list(
+                map(
+                    lambda x: _Snapshot(self.__namespace, x.name),
+                    self.__file_system.snapshots.catalog,
+                )
+            )
+        )
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.__file_system.snapshots
+
+    def __getitem__(self, name: str) -> "_Snapshot":
+        if name not in self:
+            raise SnapshotNotFoundError(name)
+
+        return _Snapshot(self.__namespace, name)
+
+    def create(self, name: str) -> "_Snapshot":
+        with self.__namespace.lock_manager.exclusive():
+            if name in self:
+                raise SnapshotAlreadyExistsError(name)
+
+            manifest = {}
+
+            for zone in self.__namespace.zone_manager.zones.scan():
+                manifest[str(zone.uuid)] = {
+                    "name": zone.name,
+                    "base": None if zone.base_uuid is None else str(zone.base_uuid),
+                    "configuration": zone.configuration.merged,
+                }
+
+            path = self.__file_system.path.joinpath(_MANIFEST_NAME)
+
+            try:
+                with path.open("w") as handle:
+                    zonys.core.codec.dump(manifest, handle)
+
+                self.__file_system.snapshots.create(name, True)
+            finally:
+                if path.exists():
+                    path.unlink()
+
+            return _Snapshot(self.__namespace, name)
+
+
+class _Snapshot:
+    def __init__(self, namespace: "Handle", name: str):
+        self.__namespace = namespace
+        self.__name = name
+
+    @property
+    def name(self) -> str:
+        return self.__name
+
+    @property
+    def zfs_snapshot_handle(self) -> "zonys.core.zfs.snapshot.Handle":
+        return self.__namespace.zone_manager.file_system.snapshots[self.__name]
+
+    @property
+    def manifest(self) -> typing.Dict[str, typing.Any]:
+        path = self.zfs_snapshot_handle.path.joinpath(_MANIFEST_NAME)
+        if not path.exists():
+            return {}
+
+        return dict(zonys.core.codec.load(path) or {})
+
+    def send(self, destination: typing.Any):
+        if isinstance(destination, int):
+            self.zfs_snapshot_handle.send(
+                destination,
+                compress=True,
+                replicate=True,
+            )
+        else:
+            with pathlib.Path(destination).open("wb") as handle:
+                self.send(handle.fileno())
+
+    def destroy(self):
+        self.__namespace.zone_manager.file_system.snapshots.destroy_recursive(
+            self.__name
+        )
+
+
 _RC_DEFINITION = """
 #!/bin/sh
 
@@ -151,6 +328,7 @@ class _Service:
         zonys.core.freebsd.sysrc.update("zonys_namespaces", " ".join(namespaces))
 
     def start(self):
+        self.__namespace.template_manager.fill()
         self.__namespace.zone_manager.zones.autostart()
 
     def stop(self):
@@ -0,0 +1,281 @@
+import concurrent.futures
+import datetime
+import hashlib
+import pathlib
+import shutil
+import typing
+
+import zonys
+import zonys.core
+import zonys.core.freebsd
+import zonys.core.freebsd.pkg
+import zonys.core.persistence
+
+INTERVAL = datetime.timedelta(hours=1)
+
+WORKERS = 4
+
+CATALOGUE_PATTERN = "repo-*.sqlite"
+
+CONFIGURATION_PATHS = [
+    pathlib.Path("etc", "pkg"),
+    pathlib.Path("usr", "local", "etc", "pkg", "repos"),
+]
+
+DATABASE_PATH = pathlib.Path("var", "db", "pkg")
+
+
+def realm(root: pathlib.Path) -> str:
+    digest = hashlib.sha256()
+
+    for directory in CONFIGURATION_PATHS:
+        directory = root.joinpath(directory)
+        if not directory.is_dir():
+            continue
+
+        for path in sorted(directory.glob("*.conf")):
+            digest.update(str(path.relative_to(root)).encode())
+            digest.update(path.read_bytes())
+
+    return digest.hexdigest()
+
+
+class Manager:
+    def __init__(
+        self,
+        _namespace: "zonys.core.namespace.Handle",
+        interval: datetime.timedelta = INTERVAL,
+        workers: int = WORKERS,
+    ):
+        self.__namespace = _namespace
+        self.__interval = interval
+        self.__workers = workers
+        self.__index = None
+
+    @property
+    def namespace(self) -> "zonys.core.namespace.Handle":
+        return self.__namespace
+
+    @property
+    def interval(self) -> datetime.timedelta:
+        return self.__interval
+
+    @property
+    def workers(self) -> int:
+        return self.__workers
+
+    @property
+    def path(self) -> pathlib.Path:
+        return self.__namespace.path.joinpath("package")
+
+    @property
+    def index(self) -> "zonys.core.persistence.Base":
+        if self.__index is None:
+            self.__index = zonys.core.persistence.Base(
+                self.__namespace.path.joinpath("zonys.package.yaml")
+            )
+
+        return self.__index
+
+    @property
+    def repositories(self) -> typing.List["Repository"]:
+        return list(
+            map(
+                lambda x: Repository(self, x),
+                sorted(self.index.get("repositories", {}).keys()),
+            )
+        )
+
+    def repository(self, root: pathlib.Path) -> "Repository":
+        return Repository(self, realm(root))
+
+    def install(
+        self,
+        packages: typing.List[str],
+        root: pathlib.Path,
+        configuration: typing.Optional[typing.Union[pathlib.Path, str]] = None,
+    ):
+        if len(packages) == 0:
+            return
+
+        repository = self.repository(root)
+        repository.refresh(root, configuration)
+        repository.fetch(packages, root, configuration)
+        repository.install(packages, root, configuration)
+
+
+class Repository:
+    def __init__(self, manager: "Manager", value: str):
+        self.__manager = manager
+        self.__value = value
+
+    @property
+    def manager(self) -> "Manager":
+        return self.__manager
+
+    @property
+    def realm(self) -> str:
+        return self.__value
+
+    @property
+    def path(self) -> pathlib.Path:
+        return self.__manager.path.joinpath(self.__value)
+
+    @property
+    def cache_path(self) -> pathlib.Path:
+        return self.path.joinpath("cache")
+
+    @property
+    def database_path(self) -> pathlib.Path:
+        return self.path.joinpath("db")
+
+    @property
+    def catalogues(self) -> typing.List[pathlib.Path]:
+        return sorted(self.database_path.glob(CATALOGUE_PATTERN))
+
+    @property
+    def __definition(self) -> typing.Dict[str, typing.Any]:
+        return self.__manager.index.get("repositories", {}).get(self.__value, {})
+
+    @property
+    def refreshed(self) -> typing.Optional[datetime.datetime]:
+        return self.__definition.get("refreshed", None)
+
+    @property
+    def digest(self) -> typing.Optional[str]:
+        return self.__definition.get("digest", None)
+
+    @property
+    def fetched(self) -> typing.Dict[str, datetime.datetime]:
+        return dict(self.__definition.get("fetched", {}))
+
+    def __options(self) -> typing.Dict[str, str]:
+        return {
+            "PKG_CACHEDIR": str(self.cache_path),
+            "PKG_DBDIR": str(self.database_path),
+        }
+
+    def __lock(self) -> typing.ContextManager["zonys.core.lock.Lock"]:
+        return self.__manager.namespace.lock_manager.lock(
+            "package-{}".format(self.__value),
+        ).acquire()
+
+    def __flush(self, **kwargs):
+        index = self.__manager.index
+        repositories = dict(index.get("repositories", {}))
+        repositories[self.__value] = {
+            **repositories.get(self.__value, {}),
+            **kwargs,
+        }
+
+        index["repositories"] = repositories
+        index.flush()
+
+    def __digest(self) -> str:
+        digest = hashlib.sha256()
+
+        for path in self.catalogues:
+            digest.update(path.name.encode())
+            digest.update(path.read_bytes())
+
+        return digest.hexdigest()
+
+    def is_stale(self) -> bool:
+        refreshed = self.refreshed
+
+        return (
+            refreshed is None
+            or len(self.catalogues) == 0
+            or datetime.datetime.now() - refreshed >= self.__manager.interval
+        )
+
+    def refresh(
+        self,
+        root: pathlib.Path,
+        configuration: typing.Optional[typing.Union[pathlib.Path, str]] = None,
+        force: bool = False,
+    ) -> bool:
+        with self.__lock():
+            if not force and not self.is_stale():
+                return False
+
+            self.cache_path.mkdir(parents=True, exist_ok=True)
+            self.database_path.mkdir(parents=True, exist_ok=True)
+
+            zonys.core.freebsd.pkg.update(
+                root=root,
+                configuration=configuration,
+                options=self.__options(),
+                force=force,
+            )
+
+            digest = self.__digest()
+            fetched = self.fetched if digest == self.digest else {}
+
+            self.__flush(
+                refreshed=datetime.datetime.now(),
+                digest=digest,
+                fetched=fetched,
+            )
+
+            return True
+
+    def fetch(
+        self,
+        packages: typing.List[str],
+        root: pathlib.Path,
+        configuration: typing.Optional[typing.Union[pathlib.Path, str]] = None,
+    ) -> typing.List[str]:
+        with self.__lock():
+            fetched = self.fetched
+            missing = list(dict.fromkeys(x for x in packages if x not in fetched))
+
+            if len(missing) == 0:
+                return missing
+
+            options = self.__options()
+
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.__manager.workers,
+            ) as executor:
+                for future in [
+                    executor.submit(
+                        zonys.core.freebsd.pkg.fetch,
+                        [package],
+                        root=root,
+                        configuration=configuration,
+                        options=options,
+                    )
+                    for package in missing
+                ]:
+                    future.result()
+
+            now = datetime.datetime.now()
+            for package in missing:
+                fetched[package] = now
+
+            self.__flush(fetched=fetched)
+
+            return missing
+
+    def install(
+        self,
+        packages: typing.List[str],
+        root: pathlib.Path,
+        configuration: typing.Optional[typing.Union[pathlib.Path, str]] = None,
+    ):
+        database_path = root.joinpath(DATABASE_PATH)
+        database_path.mkdir(parents=True, exist_ok=True)
+
+        for path in self.catalogues:
+            shutil.copy2(path, database_path.joinpath(path.name))
+
+        zonys.core.freebsd.pkg.install(
+            packages,
+            root=root,
+            configuration=configuration,
+            options={
+                "PKG_CACHEDIR": str(self.cache_path),
+            },
+            update=False,
+        )
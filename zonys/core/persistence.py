@@ -2,7 +2,9 @@ import pathlib
 import collections
 import typing
 
-from ruamel import yaml
+import zonys
+import zonys.core
+import zonys.core.codec
 
 # pylint: disable=too-many-ancestors
 class Base(collections.UserDict):
@@ -14,7 +16,7 @@ class Base(collections.UserDict):
         data = None
 
         if self.path.exists():
-            data = yaml.YAML().load(self.path)
+            data = zonys.core.codec.load(self.path)
 
         if data is None:
             data = collections.OrderedDict()
@@ -38,4 +40,4 @@ class Base(collections.UserDict):
             self.path.unlink()
 
     def flush(self):
-        yaml.YAML().dump(self.data, self.path)
+        zonys.core.codec.dump(self.data, self.path)
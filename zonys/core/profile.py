@@ -0,0 +1,237 @@
+import copy
+import re
+import typing
+
+import zonys
+import zonys.core
+
+_SIZE = re.compile(r"([0-9]+)([KMGTP]?)")
+
+_UNITS = "KMGTP"
+
+
+def _choices(*values: str) -> typing.Callable[[str], bool]:
+    return lambda x: x in values
+
+
+def _size(value: str) -> bool:
+    return value == "none" or _SIZE.fullmatch(value) is not None
+
+
+def _record_size(value: str) -> bool:
+    match = _SIZE.fullmatch(value)
+    if match is None:
+        return False
+
+    size = int(match.group(1))
+    if match.group(2) != "":
+        size = size << (10 * (_UNITS.index(match.group(2)) + 1))
+
+    return 512 <= size <= 16 << 20 and size & (size - 1) == 0
+
+
+_SWITCH = _choices("on", "off")
+
+_CACHE = _choices("all", "none", "metadata")
+
+PROPERTIES: typing.Dict[str, typing.Callable[[str], bool]] = {
+    "atime": _SWITCH,
+    "compression": _choices(
+        "on",
+        "off",
+        "lzjb",
+        "zle",
+        "lz4",
+        "gzip",
+        *["gzip-{}".format(x) for x in range(1, 10)],
+        "zstd",
+        *["zstd-{}".format(x) for x in range(1, 20)],
+    ),
+    "copies": _choices("1", "2", "3"),
+    "exec": _SWITCH,
+    "logbias": _choices("latency", "throughput"),
+    "primarycache": _CACHE,
+    "quota": _size,
+    "recordsize": _record_size,
+    "reservation": _size,
+    "secondarycache": _CACHE,
+    "setuid": _SWITCH,
+    "sync": _choices("standard", "always", "disabled"),
+}
+
+DEFAULTS = {
+    "build": {
+        "atime": "off",
+        "compression": "lz4",
+        "sync": "disabled",
+    },
+    "db": {
+        "atime": "off",
+        "compression": "lz4",
+        "logbias": "throughput",
+        "primarycache": "metadata",
+        "recordsize": "16K",
+    },
+    "web": {
+        "atime": "off",
+        "compression": "lz4",
+    },
+}
+
+
+class Error(RuntimeError):
+    pass
+
+
+class NotFoundError(Error):
+    pass
+
+
+class AlreadyExistsError(Error):
+    pass
+
+
+class InvalidPropertyError(Error):
+    def __init__(self, name: str):
+        super().__init__("Property {} is not supported".format(name))
+
+
+class InvalidValueError(Error):
+    def __init__(self, name: str, value: str):
+        super().__init__("Value {} is not valid for property {}".format(value, name))
+
+
+def validate(properties: typing.Mapping[str, typing.Any]) -> typing.Dict[str, str]:
+    result = {}
+
+    for name, value in properties.items():
+        if name not in PROPERTIES:
+            raise InvalidPropertyError(name)
+
+        value = str(value)
+        if not PROPERTIES[name](value):
+            raise InvalidValueError(name, value)
+
+        result[name] = value
+
+    return result
+
+
+class Manager:
+    def __init__(self, _namespace: "zonys.core.namespace.Handle"):
+        self.__namespace = _namespace
+        self.__profiles = _Profiles(self)
+
+    @property
+    def namespace(self) -> "zonys.core.namespace.Handle":
+        return self.__namespace
+
+    @property
+    def profiles(self) -> "_Profiles":
+        return self.__profiles
+
+    def resolve(
+        self,
+        options: typing.Union[str, typing.Mapping[str, typing.Any]],
+    ) -> typing.Dict[str, str]:
+        if isinstance(options, str):
+            return self.profiles[options].properties
+
+        properties = dict(options)
+        profile = properties.pop("profile", None)
+
+        return {
+            **(self.profiles[profile].properties if profile is not None else {}),
+            **validate(properties),
+        }
+
+
+class _Profiles:
+    def __init__(self, manager: "Manager"):
+        self.__manager = manager
+
+    @property
+    def __definitions(self) -> typing.Dict[str, typing.Any]:
+        return self.__manager.namespace.persistence.get("profiles", {})
+
+    @property
+    def __merged(self) -> typing.Dict[str, typing.Any]:
+        return {
+            **DEFAULTS,
+            **self.__definitions,
+        }
+
+    def __flush(self, definitions: typing.Dict[str, typing.Any]):
+        self.__manager.namespace.persistence.update(
+            {
+                "profiles": definitions,
+            }
+        )
+        self.__manager.namespace.persistence.flush()
+
+    def __len__(self) -> int:
+        return len(self.__merged)
+
+    def __iter__(self) -> typing.Iterator["_Handle"]:
+        return iter(
+            list(map(lambda x: _Handle(self.__manager, x), sorted(self.__merged)))
+        )
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.__merged
+
+    def __getitem__(self, name: str) -> "_Handle":
+        if name not in self:
+            raise NotFoundError(name)
+
+        return _Handle(self.__manager, name)
+
+    def get(self, name: str) -> typing.Dict[str, str]:
+        return copy.deepcopy(dict(self.__merged[name]))
+
+    def create(
+        self,
+        name: str,
+        properties: typing.Mapping[str, typing.Any],
+    ) -> "_Handle":
+        if name in self:
+            raise AlreadyExistsError(name)
+
+        return self.update(name, properties)
+
+    def update(
+        self,
+        name: str,
+        properties: typing.Mapping[str, typing.Any],
+    ) -> "_Handle":
+        definitions = dict(self.__definitions)
+        definitions[name] = validate(properties)
+        self.__flush(definitions)
+
+        return _Handle(self.__manager, name)
+
+    def destroy(self, name: str):
+        definitions = dict(self.__definitions)
+
+        if name not in definitions:
+            raise NotFoundError(name)
+
+        del definitions[name]
+        self.__flush(definitions)
+
+
+class _Handle:
+    def __init__(self, manager: "Manager", name: str):
+        self.__manager = manager
+        self.__name = name
+
+    @property
+    def name(self) -> str:
+        return self.__name
+
+    @property
+    def properties(self) -> typing.Dict[str, str]:
+        return self.__manager.profiles.get(self.__name)
+
+    def is_default(self) -> bool:
+        return self.__name in DEFAULTS
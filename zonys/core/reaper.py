@@ -0,0 +1,86 @@
+import typing
+import uuid
+
+import zonys
+import zonys.core
+import zonys.core.zfs
+import zonys.core.zfs.file_system
+
+
+class Result:
+    def __init__(self, count: int, freed: int):
+        self.__count = count
+        self.__freed = freed
+
+    @property
+    def count(self) -> int:
+        return self.__count
+
+    @property
+    def freed(self) -> int:
+        return self.__freed
+
+
+class Manager:
+    def __init__(self, _namespace: "zonys.core.namespace.Handle"):
+        self.__namespace = _namespace
+        self.__file_system = None
+
+    @property
+    def namespace(self) -> "zonys.core.namespace.Handle":
+        return self.__namespace
+
+    @property
+    def file_system(self) -> "zonys.core.zfs.file_system.Handle":
+        if self.__file_system is None:
+            children = self.__namespace.file_system.children
+
+            if "trash" not in children:
+                self.__file_system = children.create("trash")
+            else:
+                self.__file_system = children.open("trash")
+
+        return self.__file_system
+
+    def exists(self) -> bool:
+        return (
+            self.__file_system is not None
+            or "trash" in self.__namespace.file_system.children
+        )
+
+    @property
+    def pending(self) -> typing.List["zonys.core.zfs.file_system.Handle"]:
+        if not self.exists():
+            return []
+
+        return sorted(
+            self.file_system.children,
+            key=lambda x: int(x.properties["createtxg"].value),
+            reverse=True,
+        )
+
+    def __len__(self) -> int:
+        if not self.exists():
+            return 0
+
+        return len(list(self.file_system.children))
+
+    def discard(
+        self,
+        file_system: "zonys.core.zfs.file_system.Handle",
+    ) -> "zonys.core.zfs.file_system.Handle":
+        identifier = self.file_system.identifier.child(
+            "{}-{}".format(file_system.identifier.last, uuid.uuid4().hex[:8]),
+        )
+
+        return file_system.rename(identifier)
+
+    def reap(self) -> "Result":
+        with self.__namespace.lock_manager.lock("reaper").acquire():
+            if not self.exists():
+                return Result(0, 0)
+
+            count = len(self)
+            freed = self.file_system.children.destroy_all()
+
+        return Result(count, freed)
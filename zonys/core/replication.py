@@ -0,0 +1,540 @@
+import abc
+import concurrent.futures
+import datetime
+import json
+import os
+import shlex
+import subprocess
+import threading
+import time
+import typing
+
+import zonys
+import zonys.core
+import zonys.core.namespace
+import zonys.core.persistence
+import zonys.core.zfs
+import zonys.core.zfs.file_system
+
+PREFIX = "replicate-"
+
+PARENT = "."
+
+_CHUNK_SIZE = 1 << 16
+
+
+class Error(RuntimeError):
+    pass
+
+
+class DivergedError(Error):
+    def __init__(self, relative: str):
+        super().__init__(
+            "Target dataset {} has no snapshot in common with the source".format(
+                relative or "zone",
+            )
+        )
+
+
+class ReceiveError(Error):
+    pass
+
+
+class Transfer:
+    def __init__(
+        self,
+        relative: str,
+        snapshot: str,
+        fromname: typing.Optional[str],
+        skip: bool = False,
+    ):
+        self.__relative = relative
+        self.__snapshot = snapshot
+        self.__fromname = fromname
+        self.__skip = skip
+
+    @property
+    def relative(self) -> str:
+        return self.__relative
+
+    @property
+    def snapshot(self) -> str:
+        return self.__snapshot
+
+    @property
+    def fromname(self) -> typing.Optional[str]:
+        return self.__fromname
+
+    @property
+    def skip(self) -> bool:
+        return self.__skip
+
+    @property
+    def mode(self) -> str:
+        if self.__skip:
+            return "skip"
+
+        if self.__fromname is None:
+            return "full"
+
+        return "incremental"
+
+    @property
+    def depth(self) -> int:
+        if len(self.__relative) == 0:
+            return 0
+
+        return len(self.__relative.split(zonys.core.zfs.SEPARATOR))
+
+
+class Manager:
+    def __init__(self, _namespace: "zonys.core.namespace.Handle"):
+        self.__namespace = _namespace
+        self.__state = None
+
+    @property
+    def namespace(self) -> "zonys.core.namespace.Handle":
+        return self.__namespace
+
+    @property
+    def state(self) -> "zonys.core.persistence.Base":
+        if self.__state is None:
+            self.__state = zonys.core.persistence.Base(
+                self.__namespace.path.joinpath("zonys.replicate.yaml")
+            )
+
+        return self.__state
+
+    @property
+    def __identifier(self) -> "zonys.core.zfs.file_system.Identifier":
+        return self.__namespace.zone_manager.file_system.identifier
+
+    def __relative(self, dataset: str) -> str:
+        return zonys.core.zfs.SEPARATOR.join(
+            dataset.split(zonys.core.zfs.SEPARATOR)[len(self.__identifier.segments) :]
+        )
+
+    def __dataset(self, relative: str) -> "zonys.core.zfs.file_system.Identifier":
+        if len(relative) == 0:
+            return self.__identifier
+
+        return self.__identifier.child(*relative.split(zonys.core.zfs.SEPARATOR))
+
+    def snapshots(self) -> typing.Dict[str, typing.List[int]]:
+        return {
+            self.__relative(key): list(map(lambda x: x.guid, value))
+            for (key, value) in zonys.core.zfs.file_system.catalogs(
+                self.__identifier
+            ).items()
+        }
+
+    def __lock(self, relative: str) -> typing.ContextManager["zonys.core.lock.Lock"]:
+        if len(relative) == 0:
+            return self.__namespace.lock_manager.exclusive()
+
+        return self.__namespace.lock_manager.zone(
+            relative.split(zonys.core.zfs.SEPARATOR)[0],
+        )
+
+    def receive(self, relative: str, descriptor: int, full: bool = False):
+        if relative == PARENT:
+            relative = ""
+
+        with self.__lock(relative):
+            dataset = self.__dataset(relative)
+            if full and dataset.exists():
+                dataset.open().snapshots.destroy_all()
+
+            dataset.receive(descriptor, True)
+
+    def discard(
+        self,
+        identifier: "zonys.core.zfs.file_system.Identifier",
+        name: str,
+    ):
+        if not name.startswith(PREFIX):
+            return
+
+        relative = self.__relative(str(identifier))
+
+        for to, progress in self.state.get("targets", {}).items():
+            if name not in (progress.get("snapshot"), progress.get("last")):
+                continue
+
+            self.__update(
+                to,
+                lambda x: {
+                    **x,
+                    "done": [y for y in x.get("done", []) if y != relative],
+                    "full": sorted({*x.get("full", []), relative}),
+                },
+            )
+
+    def plan(
+        self,
+        target: "_Target",
+        snapshot: str,
+        full: typing.Collection[str] = (),
+    ) -> typing.List["Transfer"]:
+        received = target.snapshots()
+        result = []
+
+        for dataset, catalog in zonys.core.zfs.file_system.catalogs(
+            self.__identifier
+        ).items():
+            if snapshot not in catalog:
+                continue
+
+            relative = self.__relative(dataset)
+            guids = set(received.get(relative, []))
+
+            if catalog[snapshot].guid in guids:
+                result.append(Transfer(relative, snapshot, None, True))
+                continue
+
+            if relative in full:
+                result.append(Transfer(relative, snapshot, None))
+                continue
+
+            common = list(
+                filter(
+                    lambda x: x.guid in guids
+                    and x.createtxg < catalog[snapshot].createtxg,
+                    catalog,
+                )
+            )
+
+            if len(common) == 0 and len(guids) > 0:
+                raise DivergedError(relative)
+
+            result.append(
+                Transfer(
+                    relative,
+                    snapshot,
+                    common[-1].name if len(common) > 0 else None,
+                )
+            )
+
+        return sorted(result, key=lambda x: (x.depth, x.relative))
+
+    def replicate(
+        self,
+        to: str,
+        jobs: int = 4,
+        limit: typing.Optional[int] = None,
+    ) -> typing.List["Transfer"]:
+        with self.__namespace.lock_manager.lock("replicate").acquire():
+            target = _target(to)
+            progress = self.state.get("targets", {}).get(to, {})
+
+            snapshot = progress.get("snapshot", None)
+            if snapshot is None or snapshot not in self.__namespace.snapshots:
+                snapshot = "{}{}".format(
+                    PREFIX,
+                    datetime.datetime.now().strftime("%Y%m%dT%H%M%S%f"),
+                )
+                self.__namespace.snapshots.create(snapshot)
+                progress = self.__update(
+                    to,
+                    lambda x: {
+                        "snapshot": snapshot,
+                        "last": x.get("last", None),
+                        "done": [],
+                        "full": x.get("full", []),
+                    },
+                )
+
+            full = set(progress.get("full", []))
+            transfers = self.plan(target, snapshot, full)
+            bucket = None if limit is None else _Bucket(limit)
+
+            for depth in sorted(set(map(lambda x: x.depth, transfers))):
+                pending = list(
+                    filter(
+                        lambda x: x.depth == depth
+                        and not x.skip
+                        and x.relative not in progress["done"],
+                        transfers,
+                    )
+                )
+
+                with concurrent.futures.ThreadPoolExecutor(
+                    max_workers=max(1, jobs)
+                ) as executor:
+                    futures = {
+                        executor.submit(
+                            self.__transfer,
+                            target,
+                            transfer,
+                            bucket,
+                        ): transfer
+                        for transfer in pending
+                    }
+
+                    errors = []
+
+                    for future in concurrent.futures.as_completed(futures):
+                        try:
+                            future.result()
+                        except Exception as error:  # pylint: disable=broad-except
+                            errors.append(error)
+                            continue
+
+                        relative = futures[future].relative
+                        progress = self.__update(
+                            to,
+                            lambda x: {
+                                **x,
+                                "done": [*x.get("done", []), relative],
+                            },
+                        )
+
+                if len(errors) > 0:
+                    raise errors[0]
+
+            sent = full.intersection(map(lambda x: x.relative, transfers))
+
+            self.__update(
+                to,
+                lambda x: {
+                    "snapshot": None,
+                    "last": snapshot,
+                    "done": [],
+                    "full": sorted(set(x.get("full", [])).difference(sent)),
+                },
+            )
+            self.__prune()
+
+            return transfers
+
+    def __transfer(
+        self,
+        target: "_Target",
+        transfer: "Transfer",
+        bucket: typing.Optional["_Bucket"],
+    ):
+        handle = self.__dataset(transfer.relative).open().snapshots[transfer.snapshot]
+        source, destination = os.pipe()
+        errors = []
+
+        def send():
+            try:
+                handle.send(destination, fromname=transfer.fromname)
+            except BaseException as error:  # pylint: disable=broad-except
+                errors.append(error)
+            finally:
+                os.close(destination)
+
+        sender = threading.Thread(target=send)
+        sender.start()
+
+        try:
+            target.receive(
+                transfer.relative,
+                source,
+                bucket,
+                transfer.fromname is None,
+            )
+        finally:
+            os.close(source)
+            sender.join()
+
+        if len(errors) > 0:
+            raise errors[0]
+
+    def __update(
+        self,
+        to: str,
+        function: typing.Callable[
+            [typing.Dict[str, typing.Any]], typing.Dict[str, typing.Any]
+        ],
+    ) -> typing.Dict[str, typing.Any]:
+        with self.__namespace.lock_manager.lock("replication").acquire():
+            targets = dict(self.state.get("targets", {}))
+            targets[to] = function(dict(targets.get(to, {})))
+
+            self.state.update(
+                {
+                    "targets": targets,
+                }
+            )
+            self.state.flush()
+
+            return targets[to]
+
+    def __prune(self):
+        with self.__namespace.lock_manager.exclusive():
+            used = set()
+
+            for progress in self.state.get("targets", {}).values():
+                used.add(progress.get("snapshot", None))
+                used.add(progress.get("last", None))
+
+            for snapshot in self.__namespace.snapshots:
+                if snapshot.name.startswith(PREFIX) and snapshot.name not in used:
+                    snapshot.destroy()
+
+
+class _Bucket:
+    def __init__(self, rate: int):
+        self.__rate = rate
+        self.__tokens = float(rate)
+        self.__time = time.monotonic()
+        self.__lock = threading.Lock()
+
+    def consume(self, size: int):
+        while True:
+            with self.__lock:
+                now = time.monotonic()
+                self.__tokens = min(
+                    float(self.__rate),
+                    self.__tokens + (now - self.__time) * self.__rate,
+                )
+                self.__time = now
+
+                if self.__tokens >= size or self.__tokens >= self.__rate:
+                    self.__tokens = self.__tokens - size
+                    return
+
+                wait = (min(size, self.__rate) - self.__tokens) / self.__rate
+
+            time.sleep(wait)
+
+
+def _pump(
+    source: int,
+    write: typing.Callable[[bytes], typing.Any],
+    bucket: typing.Optional["_Bucket"],
+):
+    while True:
+        data = os.read(source, _CHUNK_SIZE)
+        if len(data) == 0:
+            break
+
+        if bucket is not None:
+            bucket.consume(len(data))
+
+        write(data)
+
+
+class _Target(abc.ABC):
+    @abc.abstractmethod
+    def snapshots(self) -> typing.Dict[str, typing.List[int]]:
+        pass
+
+    @abc.abstractmethod
+    def receive(
+        self,
+        relative: str,
+        source: int,
+        bucket: typing.Optional["_Bucket"],
+        full: bool = False,
+    ):
+        pass
+
+
+class _LocalTarget(_Target):
+    def __init__(self, identifier: str):
+        self.__identifier = zonys.core.zfs.file_system.Identifier(identifier)
+        self.__manager = None
+
+    @property
+    def __replication_manager(self) -> "Manager":
+        if self.__manager is None:
+            file_system = self.__identifier.use()
+            if not file_system.is_mounted():
+                file_system.mount()
+
+            self.__manager = zonys.core.namespace.Handle(
+                file_system
+            ).replication_manager
+
+        return self.__manager
+
+    def snapshots(self) -> typing.Dict[str, typing.List[int]]:
+        return self.__replication_manager.snapshots()
+
+    def receive(
+        self,
+        relative: str,
+        source: int,
+        bucket: typing.Optional["_Bucket"],
+        full: bool = False,
+    ):
+        if bucket is None:
+            self.__replication_manager.receive(relative, source, full)
+            return
+
+        reader, writer = os.pipe()
+        errors = []
+
+        def pump():
+            try:
+                _pump(source, lambda x: os.write(writer, x), bucket)
+            except BaseException as error:  # pylint: disable=broad-except
+                errors.append(error)
+            finally:
+                os.close(writer)
+
+        pumper = threading.Thread(target=pump)
+        pumper.start()
+
+        try:
+            self.__replication_manager.receive(relative, reader, full)
+        finally:
+            os.close(reader)
+            pumper.join()
+
+        if len(errors) > 0:
+            raise errors[0]
+
+
+class _CommandTarget(_Target):
+    def __init__(self, command: str):
+        self.__command = shlex.split(command)
+
+    def snapshots(self) -> typing.Dict[str, typing.List[int]]:
+        output = subprocess.run(
+            [*self.__command, "namespace", "replicated"],
+            check=True,
+            stdout=subprocess.PIPE,
+        ).stdout
+
+        return json.loads(output)
+
+    def receive(
+        self,
+        relative: str,
+        source: int,
+        bucket: typing.Optional["_Bucket"],
+        full: bool = False,
+    ):
+        with subprocess.Popen(
+            [
+                *self.__command,
+                "namespace",
+                "receive",
+                *(["--full"] if full else []),
+                relative or PARENT,
+            ],
+            stdin=subprocess.PIPE,
+        ) as process:
+            try:
+                _pump(source, process.stdin.write, bucket)
+            finally:
+                process.stdin.close()
+
+        if process.returncode != 0:
+            raise ReceiveError(
+                "Receiving {} failed with exit code {}".format(
+                    relative or "zone",
+                    process.returncode,
+                )
+            )
+
+
+def _target(to: str) -> "_Target":
+    if len(shlex.split(to)) > 1:
+        return _CommandTarget(to)
+
+    return _LocalTarget(to)
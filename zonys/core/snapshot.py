@@ -0,0 +1,342 @@
+import datetime
+import typing
+
+import zonys
+import zonys.core
+import zonys.core.persistence
+import zonys.core.zfs
+import zonys.core.zfs.file_system
+
+PREFIX = "auto-"
+
+LABELS = {
+    "hourly": "%Y%m%d%H",
+    "daily": "%Y%m%d",
+    "weekly": "%G%V",
+}
+
+
+class Error(RuntimeError):
+    pass
+
+
+class NotFoundError(Error):
+    pass
+
+
+class InvalidPolicyError(Error):
+    pass
+
+
+class Manager:
+    def __init__(self, _namespace: "zonys.core.namespace.Handle"):
+        self.__namespace = _namespace
+        self.__index = None
+        self.__policies = _Policies(self)
+
+    @property
+    def namespace(self) -> "zonys.core.namespace.Handle":
+        return self.__namespace
+
+    @property
+    def index(self) -> "zonys.core.persistence.Base":
+        if self.__index is None:
+            self.__index = zonys.core.persistence.Base(
+                self.__namespace.path.joinpath("zonys.snapshot.yaml")
+            )
+
+        return self.__index
+
+    @property
+    def policies(self) -> "_Policies":
+        return self.__policies
+
+    @property
+    def snapshots(self) -> typing.Dict[str, typing.Any]:
+        return self.index.get("snapshots", {})
+
+    def __flush(self, snapshots: typing.Dict[str, typing.Any]):
+        self.index.update(
+            {
+                "snapshots": snapshots,
+            }
+        )
+        self.index.flush()
+
+    def discard(self, zone: str, name: str):
+        with self.__namespace.lock_manager.lock("snapshot").acquire():
+            snapshots = dict(self.snapshots)
+            if zone not in snapshots.get(name, {}).get("zones", {}):
+                return
+
+            zones = {
+                key: value
+                for (key, value) in snapshots[name]["zones"].items()
+                if key != zone
+            }
+
+            if len(zones) == 0:
+                del snapshots[name]
+            else:
+                snapshots[name] = {
+                    **snapshots[name],
+                    "zones": zones,
+                }
+
+            self.__flush(snapshots)
+
+    def names(self, zone: str) -> typing.List[str]:
+        return sorted(
+            filter(lambda x: zone in self.snapshots[x]["zones"], self.snapshots),
+            key=lambda x: self.snapshots[x]["time"],
+        )
+
+    def __due(
+        self,
+        zone: str,
+        policy: "_Policy",
+        now: datetime.datetime,
+    ) -> typing.List[str]:
+        result = []
+
+        for label, bucket in LABELS.items():
+            if policy.retention(label) == 0:
+                continue
+
+            taken = any(
+                map(
+                    lambda x: label in self.snapshots[x]["zones"][zone]
+                    and self.snapshots[x]["time"].strftime(bucket)
+                    == now.strftime(bucket),
+                    self.names(zone),
+                )
+            )
+
+            if not taken:
+                result.append(label)
+
+        return result
+
+    def tick(self, now: typing.Optional[datetime.datetime] = None) -> "Result":
+        with self.__namespace.lock_manager.exclusive():
+            if now is None:
+                now = datetime.datetime.now()
+
+            zone_manager = self.__namespace.zone_manager
+            due = {}
+
+            for zone in zone_manager.zones.scan():
+                policy = self.policies.get(str(zone.uuid))
+                if policy is None:
+                    continue
+
+                labels = self.__due(str(zone.uuid), policy, now)
+                if len(labels) > 0:
+                    due[str(zone.uuid)] = labels
+
+            name = None
+
+            if len(due) > 0:
+                name = "{}{}".format(PREFIX, now.strftime("%Y%m%dT%H%M%S"))
+                identifier = zone_manager.file_system.identifier
+
+                zone_manager.file_system.snapshots.create(name, True)
+
+                for zone in _owners(identifier, name).difference(due):
+                    identifier.child(zone).open().snapshots.destroy_recursive(name)
+
+                snapshots = dict(self.snapshots)
+                snapshots[name] = {
+                    "time": now,
+                    "zones": due,
+                }
+                self.__flush(snapshots)
+
+            return Result(name, list(due), self.prune())
+
+    def prune(self) -> int:
+        with self.__namespace.lock_manager.exclusive():
+            zone_manager = self.__namespace.zone_manager
+            identifier = zone_manager.file_system.identifier
+
+            expired: typing.Dict[str, typing.Set[str]] = {}
+
+            for zone in set().union(
+                *map(lambda x: x["zones"], self.snapshots.values())
+            ):
+                names = list(reversed(self.names(zone)))
+                policy = self.policies.get(zone)
+                kept = set()
+
+                if policy is not None:
+                    for label in LABELS:
+                        kept.update(
+                            list(
+                                filter(
+                                    lambda x: label in self.snapshots[x]["zones"][zone],
+                                    names,
+                                )
+                            )[: policy.retention(label)]
+                        )
+
+                for name in set(names).difference(kept):
+                    expired.setdefault(name, set()).add(zone)
+
+            if len(expired) == 0:
+                return 0
+
+            catalogs = zonys.core.zfs.file_system.catalogs(identifier)
+            snapshots = dict(self.snapshots)
+            result = 0
+
+            for name, zones in expired.items():
+                present = set(
+                    filter(
+                        lambda x: name in catalogs.get(str(identifier.child(x)), []),
+                        snapshots[name]["zones"],
+                    )
+                )
+
+                remaining = present.difference(zones)
+
+                if len(remaining) == 0:
+                    zone_manager.file_system.snapshots.destroy_recursive(name)
+                    del snapshots[name]
+                else:
+                    for zone in present.intersection(zones):
+                        identifier.child(zone).open().snapshots.destroy_recursive(name)
+
+                    snapshots[name] = {
+                        **snapshots[name],
+                        "zones": {
+                            key: value
+                            for (key, value) in snapshots[name]["zones"].items()
+                            if key in remaining
+                        },
+                    }
+
+                result = result + len(present.intersection(zones))
+
+            self.__flush(snapshots)
+
+            return result
+
+
+def _owners(
+    identifier: "zonys.core.zfs.file_system.Identifier",
+    name: str,
+) -> typing.Set[str]:
+    result = set()
+
+    for dataset, catalog in zonys.core.zfs.file_system.catalogs(identifier).items():
+        segments = dataset.split(zonys.core.zfs.SEPARATOR)
+
+        if len(segments) > len(identifier.segments) and name in catalog:
+            result.add(segments[len(identifier.segments)])
+
+    return result
+
+
+class Result:
+    def __init__(
+        self, name: typing.Optional[str], zones: typing.List[str], pruned: int
+    ):
+        self.__name = name
+        self.__zones = zones
+        self.__pruned = pruned
+
+    @property
+    def name(self) -> typing.Optional[str]:
+        return self.__name
+
+    @property
+    def zones(self) -> typing.List[str]:
+        return self.__zones
+
+    @property
+    def pruned(self) -> int:
+        return self.__pruned
+
+
+class _Policies:
+    def __init__(self, manager: "Manager"):
+        self.__manager = manager
+
+    @property
+    def __definitions(self) -> typing.Dict[str, typing.Any]:
+        return self.__manager.index.get("policies", {})
+
+    def __flush(self, definitions: typing.Dict[str, typing.Any]):
+        self.__manager.index.update(
+            {
+                "policies": definitions,
+            }
+        )
+        self.__manager.index.flush()
+
+    def __len__(self) -> int:
+        return len(self.__definitions)
+
+    def __iter__(self) -> typing.Iterator["_Policy"]:
+        return iter(list(map(lambda x: _Policy(self.__manager, x), self.__definitions)))
+
+    def __contains__(self, zone: str) -> bool:
+        return zone in self.__definitions
+
+    def __getitem__(self, zone: str) -> "_Policy":
+        if zone not in self:
+            raise NotFoundError(zone)
+
+        return _Policy(self.__manager, zone)
+
+    def get(self, zone: str) -> typing.Optional["_Policy"]:
+        if zone not in self:
+            return None
+
+        return _Policy(self.__manager, zone)
+
+    def set(self, zone: str, **kwargs) -> "_Policy":
+        invalid = set(kwargs).difference(LABELS)
+        if len(invalid) > 0:
+            raise InvalidPolicyError(
+                "Unknown retentions {}".format(", ".join(sorted(invalid)))
+            )
+
+        if any(map(lambda x: not isinstance(x, int) or x < 0, kwargs.values())):
+            raise InvalidPolicyError("Retentions must be non-negative integers")
+
+        definitions = dict(self.__definitions)
+        definitions[zone] = {
+            **{x: 0 for x in LABELS},
+            **definitions.get(zone, {}),
+            **kwargs,
+        }
+        self.__flush(definitions)
+
+        return _Policy(self.__manager, zone)
+
+    def unset(self, zone: str):
+        definitions = dict(self.__definitions)
+
+        if zone not in definitions:
+            raise NotFoundError(zone)
+
+        del definitions[zone]
+        self.__flush(definitions)
+
+
+class _Policy:
+    def __init__(self, manager: "Manager", zone: str):
+        self.__manager = manager
+        self.__zone = zone
+
+    @property
+    def zone(self) -> str:
+        return self.__zone
+
+    @property
+    def snapshots(self) -> typing.List[str]:
+        return self.__manager.names(self.__zone)
+
+    def retention(self, label: str) -> int:
+        return self.__manager.index["policies"][self.__zone].get(label, 0)
@@ -0,0 +1,88 @@
+import concurrent.futures
+import typing
+
+import zonys
+import zonys.core
+import zonys.core.freebsd
+import zonys.core.freebsd.jail
+import zonys.core.zfs
+import zonys.core.zfs.file_system
+
+COLUMNS = (
+    "uuid",
+    "name",
+    "base",
+    "snapshots",
+    "status",
+)
+
+TITLES = {
+    "uuid": "UUID",
+    "name": "Name",
+    "base": "Base",
+    "snapshots": "Snapshots",
+    "status": "Status",
+}
+
+
+class Error(RuntimeError):
+    pass
+
+
+class UnknownColumnError(Error):
+    pass
+
+
+def rows(
+    namespace: "zonys.core.namespace.Handle",
+    columns: typing.Sequence[str] = COLUMNS,
+) -> typing.Iterator[typing.Dict[str, typing.Any]]:
+    unknown = set(columns).difference(COLUMNS)
+    if len(unknown) > 0:
+        raise UnknownColumnError(", ".join(sorted(unknown)))
+
+    zone_manager = namespace.zone_manager
+    identifiers: typing.Dict[str, str] = {}
+
+    def base(zone: "zonys.core.zone._Handle") -> typing.Optional[str]:
+        base_uuid = zone.base_uuid
+        if base_uuid is None:
+            return None
+
+        if str(base_uuid) not in identifiers:
+            identifiers[str(base_uuid)] = zone_manager.zones.open(base_uuid).identifier
+
+        return "{}@initial".format(identifiers[str(base_uuid)])
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        running = None
+        if "status" in columns:
+            running = executor.submit(zonys.core.freebsd.jail.running)
+
+        snapshots = None
+        if "snapshots" in columns:
+            snapshots = executor.submit(
+                zonys.core.zfs.file_system.snapshot_names,
+                zone_manager.file_system.identifier,
+            )
+
+        for zone in zone_manager.zones.scan():
+            identifiers[str(zone.uuid)] = zone.identifier
+            row: typing.Dict[str, typing.Any] = {}
+
+            for column in columns:
+                if column == "uuid":
+                    row[column] = str(zone.uuid)
+                elif column == "name":
+                    row[column] = zone.name
+                elif column == "base":
+                    row[column] = base(zone)
+                elif column == "snapshots":
+                    row[column] = snapshots.result().get(
+                        str(zone_manager.file_system.identifier.child(str(zone.uuid))),
+                        [],
+                    )
+                elif column == "status":
+                    row[column] = "Up" if str(zone.uuid) in running.result() else "Down"
+
+            yield row
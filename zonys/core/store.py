@@ -0,0 +1,237 @@
+import collections
+import contextlib
+import json
+import pathlib
+import sqlite3
+import threading
+import typing
+import uuid
+
+import zonys
+import zonys.core
+import zonys.core.codec
+
+_SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS zone (
+    uuid TEXT PRIMARY KEY,
+    name TEXT,
+    base TEXT,
+    spare TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS zone_name ON zone (name);
+CREATE INDEX IF NOT EXISTS zone_base ON zone (base);
+CREATE INDEX IF NOT EXISTS zone_spare ON zone (spare);
+"""
+
+
+class Store:
+    def __init__(self, path: typing.Union[str, pathlib.Path]):
+        self.__path = pathlib.Path(path)
+        self.__connection = None
+        self.__lock = threading.RLock()
+
+    @property
+    def path(self) -> pathlib.Path:
+        return self.__path
+
+    @property
+    def __database(self) -> sqlite3.Connection:
+        if self.__connection is None:
+            connection = sqlite3.connect(
+                str(self.__path),
+                isolation_level=None,
+                check_same_thread=False,
+                timeout=30,
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("PRAGMA case_sensitive_like=ON")
+            connection.executescript(_SCHEMA)
+
+            self.__connection = connection
+            self.__migrate()
+
+        return self.__connection
+
+    def close(self):
+        with self.__lock:
+            if self.__connection is not None:
+                self.__connection.close()
+                self.__connection = None
+
+    @contextlib.contextmanager
+    def transaction(self) -> typing.Iterator[sqlite3.Connection]:
+        with self.__lock:
+            database = self.__database
+
+            if database.in_transaction:
+                yield database
+                return
+
+            database.execute("BEGIN IMMEDIATE")
+
+            try:
+                yield database
+            except:
+                database.execute("ROLLBACK")
+                raise
+
+            database.execute("COMMIT")
+
+    def __query(
+        self,
+        statement: str,
+        parameters: typing.Sequence[typing.Any] = (),
+    ) -> typing.List[typing.Tuple[typing.Any, ...]]:
+        with self.__lock:
+            return self.__database.execute(statement, parameters).fetchall()
+
+    def __migrate(self):
+        with self.transaction() as database:
+            version = database.execute(
+                "SELECT value FROM meta WHERE key = 'version'"
+            ).fetchone()
+
+            if version is not None:
+                return
+
+            migrated = []
+
+            for path in sorted(self.__path.parent.glob("*.yaml")):
+                try:
+                    uuid.UUID(path.stem)
+                except ValueError:
+                    continue
+
+                data = zonys.core.codec.load(path) or {}
+                Store.__put(database, path.stem, data)
+                migrated.append(path)
+
+            database.execute(
+                "INSERT INTO meta (key, value) VALUES ('version', ?)",
+                (str(_SCHEMA_VERSION),),
+            )
+
+        for path in migrated:
+            path.unlink()
+
+    @staticmethod
+    def __put(
+        database: sqlite3.Connection,
+        key: str,
+        data: typing.Mapping[str, typing.Any],
+    ):
+        database.execute(
+            "INSERT INTO zone (uuid, name, base, spare, data) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (uuid) DO UPDATE SET "
+            "name = excluded.name, base = excluded.base, "
+            "spare = excluded.spare, data = excluded.data",
+            (
+                key,
+                data.get("name", None),
+                data.get("base", None),
+                data.get("spare", None),
+                json.dumps(data, default=str),
+            ),
+        )
+
+    def put(self, key: str, data: typing.Mapping[str, typing.Any]):
+        with self.transaction() as database:
+            Store.__put(database, key, data)
+
+    def delete(self, key: str):
+        with self.transaction() as database:
+            database.execute("DELETE FROM zone WHERE uuid = ?", (key,))
+
+    def get(self, key: str) -> typing.Optional[typing.Dict[str, typing.Any]]:
+        rows = self.__query("SELECT data FROM zone WHERE uuid = ?", (key,))
+        if len(rows) == 0:
+            return None
+
+        return json.loads(rows[0][0])
+
+    def records(self) -> typing.Dict[str, typing.Dict[str, typing.Any]]:
+        return {
+            key: json.loads(data)
+            for (key, data) in self.__query("SELECT uuid, data FROM zone")
+        }
+
+    def find(self, value: str) -> typing.Optional[str]:
+        rows = self.__query(
+            "SELECT uuid FROM zone WHERE spare IS NULL AND (uuid = ? OR name = ?) "
+            "ORDER BY uuid = ? DESC LIMIT 1",
+            (value, value, value),
+        )
+        if len(rows) == 0:
+            return None
+
+        return rows[0][0]
+
+    def match(self, prefix: str) -> typing.List[str]:
+        pattern = "{}%".format(
+            prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        )
+
+        return list(
+            map(
+                lambda x: x[0],
+                self.__query(
+                    "SELECT uuid FROM zone WHERE spare IS NULL AND "
+                    "(uuid LIKE ? ESCAPE '\\' OR name LIKE ? ESCAPE '\\') "
+                    "ORDER BY uuid",
+                    (pattern, pattern),
+                ),
+            )
+        )
+
+    def spares(self, template: str) -> typing.List[str]:
+        return list(
+            map(
+                lambda x: x[0],
+                self.__query(
+                    "SELECT uuid FROM zone WHERE spare = ? ORDER BY uuid",
+                    (template,),
+                ),
+            )
+        )
+
+    def record(
+        self,
+        key: str,
+        data: typing.Optional[typing.Mapping[str, typing.Any]] = None,
+    ) -> "Record":
+        if data is None:
+            data = self.get(key) or {}
+
+        return Record(self, key, data)
+
+
+# pylint: disable=too-many-ancestors
+class Record(collections.UserDict):
+    def __init__(
+        self,
+        store: "Store",
+        key: str,
+        data: typing.Mapping[str, typing.Any],
+    ):
+        super().__init__(data)
+
+        self.__store = store
+        self.__key = key
+
+    @property
+    def key(self) -> str:
+        return self.__key
+
+    def destroy(self):
+        self.__store.delete(self.__key)
+
+    def flush(self):
+        self.__store.put(self.__key, self.data)
@@ -0,0 +1,192 @@
+import copy
+import typing
+
+import mergedeep
+
+import zonys
+import zonys.core
+import zonys.core.zone
+
+INSTANCE_KEYS = {
+    "autostart",
+    "jail",
+    "mount",
+    "name",
+    "network",
+    "temporary",
+}
+
+
+class Error(RuntimeError):
+    pass
+
+
+class NotFoundError(Error):
+    pass
+
+
+class AlreadyExistsError(Error):
+    pass
+
+
+class InvalidDeltaError(Error):
+    pass
+
+
+class Manager:
+    def __init__(self, _namespace: "zonys.core.namespace.Handle"):
+        self.__namespace = _namespace
+        self.__templates = _Templates(self)
+
+    @property
+    def namespace(self) -> "zonys.core.namespace.Handle":
+        return self.__namespace
+
+    @property
+    def templates(self) -> "_Templates":
+        return self.__templates
+
+    def fill(self):
+        for template in self.templates:
+            template.fill()
+
+
+class _Templates:
+    def __init__(self, manager: "Manager"):
+        self.__manager = manager
+
+    @property
+    def __definitions(self) -> typing.Dict[str, typing.Any]:
+        return self.__manager.namespace.persistence.get("templates", {})
+
+    def __flush(self, definitions: typing.Dict[str, typing.Any]):
+        self.__manager.namespace.persistence.update(
+            {
+                "templates": definitions,
+            }
+        )
+        self.__manager.namespace.persistence.flush()
+
+    def __len__(self) -> int:
+        return len(self.__definitions)
+
+    def __iter__(self) -> typing.Iterator["_Handle"]:
+        return iter(list(map(lambda x: _Handle(self.__manager, x), self.__definitions)))
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.__definitions
+
+    def __getitem__(self, name: str) -> "_Handle":
+        if name not in self:
+            raise NotFoundError(name)
+
+        return _Handle(self.__manager, name)
+
+    def create(
+        self,
+        name: str,
+        size: int,
+        configuration: typing.Mapping[str, typing.Any],
+    ) -> "_Handle":
+        if name in self:
+            raise AlreadyExistsError(name)
+
+        invalid = INSTANCE_KEYS.intersection(configuration)
+        if len(invalid) > 0:
+            raise InvalidDeltaError(
+                "Templates must not define instance keys {}".format(
+                    ", ".join(sorted(invalid)),
+                )
+            )
+
+        definitions = dict(self.__definitions)
+        definitions[name] = {
+            "size": size,
+            "configuration": dict(configuration),
+        }
+        self.__flush(definitions)
+
+        return _Handle(self.__manager, name)
+
+    def update(self, name: str, size: int):
+        definitions = dict(self.__definitions)
+
+        if name not in definitions:
+            raise NotFoundError(name)
+
+        definitions[name] = {
+            **definitions[name],
+            "size": size,
+        }
+        self.__flush(definitions)
+
+    def destroy(self, name: str):
+        self[name].drain()
+
+        definitions = dict(self.__definitions)
+        del definitions[name]
+        self.__flush(definitions)
+
+
+class _Handle:
+    def __init__(self, manager: "Manager", name: str):
+        self.__manager = manager
+        self.__name = name
+
+    @property
+    def __definition(self) -> typing.Dict[str, typing.Any]:
+        return self.__manager.namespace.persistence["templates"][self.__name]
+
+    @property
+    def name(self) -> str:
+        return self.__name
+
+    @property
+    def size(self) -> int:
+        return self.__definition["size"]
+
+    @property
+    def configuration(self) -> typing.Dict[str, typing.Any]:
+        return copy.deepcopy(dict(self.__definition["configuration"]))
+
+    @property
+    def spares(self) -> typing.List["zonys.core.zone._Handle"]:
+        return self.__manager.namespace.zone_manager.zones.spares(self.__name)
+
+    def fill(self) -> typing.List["zonys.core.zone._Handle"]:
+        zones = self.__manager.namespace.zone_manager.zones
+        result = []
+
+        for _ in range(max(0, self.size - len(self.spares))):
+            result.append(zones.prepare(self.__name, **self.configuration))
+
+        return result
+
+    def drain(self):
+        for spare in self.spares:
+            spare.destroy()
+
+    def claim(self, **kwargs) -> "zonys.core.zone._Handle":
+        invalid = set(kwargs).difference(INSTANCE_KEYS)
+        if len(invalid) > 0:
+            raise InvalidDeltaError(
+                "Only instance keys can be applied to a template, got {}".format(
+                    ", ".join(sorted(invalid)),
+                )
+            )
+
+        configuration = mergedeep.merge(
+            self.configuration,
+            kwargs,
+            strategy=mergedeep.Strategy.ADDITIVE,
+        )
+
+        for handle in self.spares:
+            try:
+                handle.claim(configuration)
+            except zonys.core.zone.NotSpareError:
+                continue
+
+            return handle
+
+        return self.__manager.namespace.zone_manager.zones.create(**configuration)
@@ -0,0 +1,128 @@
+import contextlib
+import datetime
+import shutil
+import unittest
+
+import zonys
+import zonys.core
+import zonys.core.testing
+import zonys.core.cache
+
+
+def _provision(*contents):
+    return [
+        {
+            "file": {
+                "path": "/{}".format(index),
+                "content": content,
+            },
+        }
+        for (index, content) in enumerate(contents)
+    ]
+
+
+class TestCache(unittest.TestCase):
+    def setUp(self):
+        self._exit_stack = contextlib.ExitStack()
+        environment = self._exit_stack.enter_context(
+            zonys.core.testing.environment(),
+        )
+        self._root = environment.root
+
+        self._namespace = self._exit_stack.enter_context(
+            zonys.core.testing.namespace(environment),
+        )
+        self._zones = self._namespace.zone_manager.zones
+        self._manager = self._namespace.cache_manager
+
+    def tearDown(self):
+        self._exit_stack.close()
+
+    def test_miss(self):
+        zone = self._zones.create(provision=_provision("a", "b", "c"))
+
+        self.assertEqual(0, self._manager.hits)
+        self.assertEqual(3, self._manager.misses)
+        self.assertEqual(3, len(self._manager.layers))
+        self.assertEqual("c", zone.path.joinpath("2").read_text())
+
+    def test_prefix(self):
+        first = self._zones.create(provision=_provision("a", "b", "c"))
+        second = self._zones.create(provision=_provision("a", "b", "d"))
+
+        self.assertEqual(2, self._manager.hits)
+        self.assertEqual(4, self._manager.misses)
+        self.assertEqual("c", first.path.joinpath("2").read_text())
+        self.assertEqual("d", second.path.joinpath("2").read_text())
+        self.assertEqual("b", second.path.joinpath("1").read_text())
+
+        layers = self._manager.layers
+        self.assertEqual(
+            [1, 1, 0, 0],
+            [x.hits for x in layers],
+        )
+        self.assertEqual(layers[1].key, layers[3].parent)
+
+    def test_base(self):
+        base = self._zones.create(name="base", provision=_provision("a"))
+        provision = [{"file": {"path": "/extra", "content": "b"}}]
+        first = self._zones.create(base="base", provision=provision)
+        second = self._zones.create(base="base", provision=provision)
+
+        self.assertEqual(1, self._manager.hits)
+        self.assertEqual(2, self._manager.misses)
+        self.assertEqual("a", second.path.joinpath("0").read_text())
+        self.assertEqual("b", second.path.joinpath("extra").read_text())
+        self.assertFalse(base.path.joinpath("extra").exists())
+        self.assertEqual(first.path.joinpath("extra").read_text(), "b")
+
+        first.destroy()
+        second.destroy()
+        base.destroy()
+
+        self.assertEqual(1, len(self._manager.layers))
+
+    def test_archive(self):
+        source = self._root.joinpath("source")
+        source.mkdir()
+        archive = self._root.joinpath("archive.tar")
+        provision = [
+            {
+                "archive": {
+                    "source": str(archive),
+                    "destination": "/archive",
+                },
+            },
+        ]
+
+        source.joinpath("content").write_text("a")
+        shutil.make_archive(str(archive.with_suffix("")), "tar", source)
+        first = self._zones.create(provision=provision)
+
+        source.joinpath("content").write_text("bb")
+        shutil.make_archive(str(archive.with_suffix("")), "tar", source)
+        second = self._zones.create(provision=provision)
+
+        self.assertEqual(0, self._manager.hits)
+        self.assertEqual("a", first.path.joinpath("archive", "content").read_text())
+        self.assertEqual("bb", second.path.joinpath("archive", "content").read_text())
+
+    def test_prune(self):
+        zone = self._zones.create(provision=_provision("a", "b"))
+
+        self.assertEqual(0, self._manager.prune())
+        self.assertEqual(2, len(self._manager.layers))
+
+        zone.destroy()
+
+        self.assertEqual(0, self._manager.prune(datetime.timedelta(days=1)))
+        self.assertEqual(2, self._manager.prune())
+        self.assertEqual(0, len(self._manager.layers))
+        self.assertEqual(0, len(list(self._manager.file_system.children)))
+
+        self._zones.create(provision=_provision("a", "b"))
+        self.assertEqual(0, self._manager.hits)
+
+
+if __name__ == "main":  # pragma: no cover
+    unittest.main()
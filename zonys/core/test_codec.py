@@ -0,0 +1,50 @@
+import os
+import pathlib
+import tempfile
+import unittest
+
+from ruamel import yaml
+
+import zonys
+import zonys.core
+import zonys.core.codec
+
+
+class TestCodec(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self._path = pathlib.Path(self._directory.name)
+        zonys.core.codec.clear()
+
+    def tearDown(self):
+        zonys.core.codec.clear()
+        self._directory.cleanup()
+
+    def test_dump_round_trip_types(self):
+        data = yaml.YAML().load("name: zone\nvalue: 1.5\nlist: [a, b]\n")
+        path = self._path.joinpath("data.yaml")
+
+        zonys.core.codec.dump(data, path)
+
+        self.assertEqual(
+            {"name": "zone", "value": 1.5, "list": ["a", "b"]},
+            zonys.core.codec.load(path),
+        )
+
+    def test_include_cache(self):
+        path = self._path.joinpath("include.yaml")
+        path.write_text("value: first\n")
+
+        first = zonys.core.codec.load_include(path)
+        first["value"] = "changed"
+
+        self.assertEqual("first", zonys.core.codec.load_include(path)["value"])
+
+        path.write_text("value: second\n")
+        os.utime(path, ns=(0, 1))
+
+        self.assertEqual("second", zonys.core.codec.load_include(path)["value"])
+
+
+if __name__ == "main":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,275 @@
+import pathlib
+import tempfile
+import unittest
+
+import zonys
+import zonys.core
+import zonys.core.codec
+import zonys.core.configuration
+import zonys.core.handler
+import zonys.core.handler.include
+import zonys.core.handler.variable
+
+
+class _Handler(zonys.core.configuration.Handler):
+    calls = []
+
+    @staticmethod
+    def before_configuration(
+        event: "zonys.core.configuration.BeforeConfigurationEvent",
+    ):
+        _Handler.calls.append(event.options)
+
+
+class _Recorder(zonys.core.configuration.Handler):
+    calls = []
+
+    @staticmethod
+    def on_commit_test(event: "zonys.core.configuration.CommitEvent"):
+        _Recorder.calls.append(event.options)
+
+
+class _Mutator(zonys.core.configuration.Handler):
+    calls = []
+
+    @staticmethod
+    def on_commit_mutate(event: "zonys.core.configuration.CommitEvent"):
+        event.configuration.pop("mutate")
+
+    @staticmethod
+    def on_rollback_mutate(event: "zonys.core.configuration.RollbackEvent"):
+        _Mutator.calls.append(event.options)
+
+
+class _Normalizer(zonys.core.configuration.Handler):
+    calls = []
+
+    @staticmethod
+    def on_normalize(event: "zonys.core.configuration.NormalizeEvent"):
+        _Normalizer.calls.append(event.options)
+        event.normalized.update({"value": event.options})
+
+    @staticmethod
+    def on_commit_first(event: "zonys.core.configuration.CommitEvent"):
+        event.context.update({"first": event.normalized["value"]})
+
+    @staticmethod
+    def on_commit_second(event: "zonys.core.configuration.CommitEvent"):
+        event.context.update({"second": event.normalized["value"]})
+
+
+SCHEMAS = [
+    zonys.core.handler.include.SCHEMA,
+    {
+        "record": {
+            "type": "string",
+            "handler": _Handler,
+        },
+    },
+]
+
+RENDER_SCHEMAS = [
+    zonys.core.handler.variable.SCHEMA,
+    {
+        "render": {
+            "handler": _Recorder,
+        },
+        "normalize": {
+            "handler": _Normalizer,
+        },
+        "mutate": {
+            "handler": _Mutator,
+        },
+    },
+]
+
+
+class TestConfiguration(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self._path = pathlib.Path(self._directory.name)
+        _Handler.calls = []
+        _Recorder.calls = []
+        _Normalizer.calls = []
+        _Mutator.calls = []
+        zonys.core.codec.clear()
+
+    def tearDown(self):
+        zonys.core.codec.clear()
+        self._directory.cleanup()
+
+    def _write(self, name: str, content: str) -> pathlib.Path:
+        path = self._path.joinpath(name)
+        path.write_text(content)
+
+        return path
+
+    def _read(self, configuration) -> "zonys.core.configuration.Manager":
+        manager = zonys.core.configuration.Manager()
+        manager.read(SCHEMAS, configuration, self._path)
+
+        return manager
+
+    def test_render(self):
+        manager = zonys.core.configuration.Manager()
+        manager.read(
+            RENDER_SCHEMAS,
+            {
+                "variable": {
+                    "name": "web",
+                    "network": {
+                        "address": "10.0.0.1",
+                    },
+                },
+                "render": {
+                    "steps": [
+                        "echo {name!s:>6}",
+                        "ping {network.address}",
+                        "{{literal}}",
+                        True,
+                        1,
+                    ],
+                    "missing": "{network.gateway}",
+                },
+            },
+            self._path,
+        )
+
+        manager.commit("test")
+
+        self.assertEqual(
+            [
+                {
+                    "steps": [
+                        "echo    web",
+                        "ping 10.0.0.1",
+                        "{literal}",
+                        True,
+                        1,
+                    ],
+                    "missing": "None",
+                }
+            ],
+            _Recorder.calls,
+        )
+
+    def test_render_once(self):
+        manager = zonys.core.configuration.Manager()
+        manager.read(
+            RENDER_SCHEMAS,
+            {
+                "variable": {
+                    "name": "web",
+                },
+                "render": "{name}",
+            },
+            self._path,
+        )
+
+        manager.commit("test")
+        manager.variables["name"] = "changed"
+        manager.commit("test")
+
+        self.assertEqual(["web", "web"], _Recorder.calls)
+
+    def test_render_positional(self):
+        manager = zonys.core.configuration.Manager()
+        manager.read(RENDER_SCHEMAS, {"render": "{0}"}, self._path)
+
+        with self.assertRaises(IndexError):
+            manager.commit("test")
+
+    def test_dispatch(self):
+        manager = zonys.core.configuration.Manager()
+        manager.read(
+            RENDER_SCHEMAS,
+            {
+                "render": "render",
+                "normalize": "normalize",
+            },
+            self._path,
+        )
+
+        self.assertEqual({}, manager.commit("unknown"))
+        self.assertEqual({"first": "normalize"}, manager.commit("first"))
+        self.assertEqual({"second": "normalize"}, manager.commit("second"))
+        self.assertEqual(["normalize"], _Normalizer.calls)
+        self.assertEqual([], _Recorder.calls)
+
+        manager.commit("test")
+        self.assertEqual(["render"], _Recorder.calls)
+
+    def test_transaction(self):
+        manager = zonys.core.configuration.Manager()
+        manager.read(RENDER_SCHEMAS, {"mutate": "mutate"}, self._path)
+
+        first = manager.transaction()
+        first.commit("mutate")
+        second = manager.transaction()
+        second.commit("mutate")
+
+        self.assertEqual({}, first.configuration)
+        self.assertEqual({}, second.configuration)
+        self.assertEqual({"mutate": "mutate"}, manager.configuration)
+
+        first.rollback()
+        self.assertEqual(["mutate"], _Mutator.calls)
+
+        first.rollback()
+        self.assertEqual(["mutate"], _Mutator.calls)
+
+        second.rollback()
+        self.assertEqual(["mutate", "mutate"], _Mutator.calls)
+
+    def test_diamond(self):
+        self._write("d.yaml", "record: d\n")
+        self._write("b.yaml", "include: d.yaml\nrecord: b\n")
+        self._write("c.yaml", "include: d.yaml\nrecord: c\n")
+
+        manager = self._read(
+            {
+                "include": ["b.yaml", "c.yaml"],
+                "record": "a",
+            }
+        )
+
+        self.assertEqual(["d", "b", "c", "a"], _Handler.calls)
+        self.assertEqual(
+            ["b.yaml", "d.yaml", "c.yaml"],
+            list(map(lambda x: x.path.name, manager.includes.values())),
+        )
+
+    def test_cycle(self):
+        self._write("a.yaml", "include: b.yaml\n")
+        self._write("b.yaml", "include: a.yaml\n")
+
+        with self.assertRaises(zonys.core.handler.include.CycleError):
+            self._read({"include": "a.yaml"})
+
+    def test_cached(self):
+        self._write("base.yaml", "record: base\n")
+
+        first = self._read({"include": "base.yaml"})
+        second = self._read({"include": "base.yaml"})
+
+        (include,) = first.includes.values()
+        self.assertFalse(include.cached)
+        self.assertGreaterEqual(include.seconds, 0)
+
+        (include,) = second.includes.values()
+        self.assertTrue(include.cached)
+        self.assertEqual(["base", "base"], _Handler.calls)
+
+    def test_changed(self):
+        path = self._write("base.yaml", "record: first\n")
+        self._read({"include": "base.yaml"})
+
+        path.write_text("record: second, changed\n")
+        manager = self._read({"include": "base.yaml"})
+
+        self.assertFalse(list(manager.includes.values())[0].cached)
+        self.assertEqual(["first", "second, changed"], _Handler.calls)
+
+
+if __name__ == "main":  # pragma: no cover
+    unittest.main()
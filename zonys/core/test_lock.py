@@ -0,0 +1,168 @@
+import concurrent.futures
+import contextlib
+import pathlib
+import tempfile
+import threading
+import time
+import unittest
+
+import zonys
+import zonys.core
+import zonys.core.testing
+import zonys.core.lock
+import zonys.core.zone
+
+
+class TestLock(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self._lock = zonys.core.lock.Lock(
+            pathlib.Path(self._directory.name).joinpath("lock", "test")
+        )
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def _hold(self, mode: str, events: list, name: str):
+        with self._lock.acquire(mode):
+            events.append("{}-enter".format(name))
+            time.sleep(0.05)
+            events.append("{}-exit".format(name))
+
+    def _run(self, first: str, second: str) -> list:
+        events: list = []
+        threads = [
+            threading.Thread(target=self._hold, args=(first, events, "first")),
+            threading.Thread(target=self._hold, args=(second, events, "second")),
+        ]
+
+        for thread in threads:
+            thread.start()
+            time.sleep(0.01)
+
+        for thread in threads:
+            thread.join()
+
+        return events
+
+    def test_exclusive(self):
+        self.assertEqual(
+            ["first-enter", "first-exit", "second-enter", "second-exit"],
+            self._run(zonys.core.lock.EXCLUSIVE, zonys.core.lock.SHARED),
+        )
+
+    def test_shared(self):
+        self.assertEqual(
+            ["first-enter", "second-enter", "first-exit", "second-exit"],
+            self._run(zonys.core.lock.SHARED, zonys.core.lock.SHARED),
+        )
+
+    def test_reentrant(self):
+        with self._lock.acquire():
+            with self._lock.acquire(zonys.core.lock.SHARED):
+                self.assertTrue(self._lock.is_held())
+
+            self.assertTrue(self._lock.is_held())
+
+        self.assertFalse(self._lock.is_held())
+
+    def test_upgrade(self):
+        with self._lock.acquire(zonys.core.lock.SHARED):
+            with self.assertRaises(zonys.core.lock.UpgradeError):
+                with self._lock.acquire(zonys.core.lock.EXCLUSIVE):
+                    pass
+
+    def test_invalid_mode(self):
+        with self.assertRaises(zonys.core.lock.InvalidModeError):
+            with self._lock.acquire("unknown"):
+                pass
+
+
+class TestConcurrentZones(unittest.TestCase):
+    def setUp(self):
+        self._exit_stack = contextlib.ExitStack()
+        environment = self._exit_stack.enter_context(
+            zonys.core.testing.environment(),
+        )
+
+        self._namespace = self._exit_stack.enter_context(
+            zonys.core.testing.namespace(environment),
+        )
+
+    def tearDown(self):
+        self._exit_stack.close()
+
+    def test_discard(self):
+        manager = self._namespace.lock_manager
+
+        with manager.zone("zone"):
+            manager.discard("zone")
+            self.assertTrue(manager.lock("zone").path.exists())
+
+        self.assertFalse(manager.lock("zone").path.exists())
+
+        with manager.zone("zone"):
+            pass
+
+        manager.discard("zone")
+        self.assertFalse(manager.lock("zone").path.exists())
+
+    def test_destroy_discards_lock(self):
+        handle = self._namespace.zone_manager.zones.create(name="zone")
+        path = self._namespace.lock_manager.lock(str(handle.uuid)).path
+
+        self.assertTrue(path.exists())
+
+        handle.destroy()
+        self.assertFalse(path.exists())
+
+    def test_temporary_discards_lock(self):
+        handle = self._namespace.zone_manager.zones.run()
+        path = self._namespace.lock_manager.lock(str(handle.uuid)).path
+
+        self.assertTrue(path.exists())
+
+        handle.stop()
+        self.assertFalse(path.exists())
+
+    def test_create_destroy(self):
+        zones = self._namespace.zone_manager.zones
+
+        def create_destroy(index: int) -> bool:
+            try:
+                handle = zones.create(name="zone-{}".format(index % 10))
+            except zonys.core.zone.NameAlreadyUsedError:
+                return False
+
+            handle.snapshots.create("second")
+            handle.destroy()
+
+            return True
+
+        def create(index: int) -> bool:
+            try:
+                zones.create(name="unique-{}".format(index % 5))
+            except zonys.core.zone.NameAlreadyUsedError:
+                return False
+
+            return True
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+            destroyed = list(executor.map(create_destroy, range(25)))
+            created = list(executor.map(create, range(25)))
+
+        self.assertGreaterEqual(sum(destroyed), 10)
+        self.assertEqual(5, sum(created))
+        self.assertEqual(
+            sorted("unique-{}".format(x) for x in range(5)),
+            sorted(x.name for x in zones),
+        )
+
+        for handle in list(zones):
+            handle.destroy()
+
+        self.assertEqual(0, len(zones))
+
+
+if __name__ == "main":  # pragma: no cover
+    unittest.main()
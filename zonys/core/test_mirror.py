@@ -0,0 +1,129 @@
+import contextlib
+import pathlib
+import unittest
+
+import git
+
+import zonys
+import zonys.core
+import zonys.core.testing
+import zonys.core.mirror
+
+_ACTOR = git.Actor("zonys", "zonys@localhost")
+
+
+class TestMirror(unittest.TestCase):
+    def setUp(self):
+        self._exit_stack = contextlib.ExitStack()
+        environment = self._exit_stack.enter_context(
+            zonys.core.testing.environment(),
+        )
+
+        self._work = git.Repo.init(
+            environment.root.joinpath("work"),
+            initial_branch="main",
+        )
+        self._first = self._commit({"a/x": "1", "b/y": "1"})
+
+        self._upstream = environment.root.joinpath("upstream.git")
+        git.Repo.clone_from(self._work.working_dir, self._upstream, bare=True)
+        self._work.create_remote("upstream", str(self._upstream))
+        self._url = self._upstream.as_uri()
+
+        self._namespace = self._exit_stack.enter_context(
+            zonys.core.testing.namespace(environment),
+        )
+        self._manager = self._namespace.mirror_manager
+        self._zones = self._namespace.zone_manager.zones
+
+    def tearDown(self):
+        self._exit_stack.close()
+
+    def _commit(self, files) -> str:
+        root = pathlib.Path(self._work.working_dir)
+
+        for name, content in files.items():
+            path = root.joinpath(name)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content)
+
+        self._work.index.add(list(files))
+
+        return self._work.index.commit(
+            "commit",
+            author=_ACTOR,
+            committer=_ACTOR,
+        ).hexsha
+
+    def test_checkout(self):
+        path = self._namespace.path.joinpath("checkout")
+        repository = self._manager.checkout(self._url, path)
+
+        self.assertEqual("1", path.joinpath("a", "x").read_text())
+        self.assertEqual(self._url, repository.remotes.origin.url)
+        self.assertTrue(self._manager[self._url].exists())
+        self.assertEqual(self._first, repository.head.commit.hexsha)
+
+    def test_incremental(self):
+        mirror = self._manager[self._url]
+
+        self.assertTrue(mirror.update())
+        self.assertFalse(mirror.update())
+
+        second = self._commit({"a/x": "2"})
+        self._work.remotes.upstream.push("main")
+
+        self.assertTrue(mirror.update(second))
+        self.assertEqual(second, mirror.resolve("main"))
+
+        path = self._namespace.path.joinpath("checkout")
+        self._manager.checkout(self._url, path, "main")
+
+        self.assertEqual("2", path.joinpath("a", "x").read_text())
+
+    def test_shallow(self):
+        second = self._commit({"a/x": "2"})
+        self._work.remotes.upstream.push("main")
+
+        path = self._namespace.path.joinpath("checkout")
+        repository = self._manager.checkout(self._url, path, self._first, depth=1)
+
+        self.assertEqual("1", path.joinpath("a", "x").read_text())
+        self.assertEqual("true", repository.git.rev_parse("--is-shallow-repository"))
+        self.assertNotEqual(second, repository.head.commit.hexsha)
+
+    def test_sparse(self):
+        path = self._namespace.path.joinpath("checkout")
+        self._manager.checkout(self._url, path, sparse=["a"])
+
+        self.assertTrue(path.joinpath("a", "x").exists())
+        self.assertFalse(path.joinpath("b", "y").exists())
+
+    def test_unknown_object(self):
+        with self.assertRaises(zonys.core.mirror.ObjectNotFoundError):
+            self._manager.checkout(
+                self._url,
+                self._namespace.path.joinpath("checkout"),
+                "unknown",
+            )
+
+    def test_provision(self):
+        provision = [
+            {
+                "git": {
+                    "url": self._url,
+                    "path": "/srv/app",
+                    "object": "main",
+                },
+            },
+        ]
+
+        self._zones.create(provision=provision)
+        zone = self._zones.create(provision=provision)
+
+        self.assertEqual(1, self._namespace.cache_manager.hits)
+        self.assertEqual("1", zone.path.joinpath("srv", "app", "a", "x").read_text())
+
+
+if __name__ == "main":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,89 @@
+import contextlib
+import tempfile
+import unittest
+
+import zonys
+import zonys.core
+import zonys.core.testing
+import zonys.core.namespace
+
+
+class TestNamespaceSnapshot(unittest.TestCase):
+    def setUp(self):
+        self._exit_stack = contextlib.ExitStack()
+        self._environment = self._exit_stack.enter_context(
+            zonys.core.testing.environment(),
+        )
+
+        self._namespace = self._exit_stack.enter_context(
+            zonys.core.testing.namespace(self._environment),
+        )
+        self._zones = [
+            self._namespace.zone_manager.zones.create(name="app"),
+            self._namespace.zone_manager.zones.create(name="database"),
+        ]
+
+    def tearDown(self):
+        self._exit_stack.close()
+
+    def test_snapshot(self):
+        snapshot = self._namespace.snapshots.create("backup")
+
+        for zone in self._zones:
+            self.assertIn("backup", zone.snapshots)
+            self.assertEqual(
+                zone.name,
+                snapshot.manifest[str(zone.uuid)]["name"],
+            )
+
+        self.assertEqual(
+            1,
+            len({x.snapshots.catalog["backup"].createtxg for x in self._zones}),
+        )
+        self.assertFalse(
+            self._namespace.zone_manager.path.joinpath(".zonys.yaml").exists()
+        )
+
+    def test_snapshot_cached(self):
+        zone = self._zones[0]
+        zone.snapshots.create("zone")
+        self.assertEqual(["initial", "zone"], zone.file_system.snapshots.catalog.names)
+
+        self._namespace.snapshots.create("backup")
+
+        self.assertEqual("backup", zone.snapshots["backup"].name)
+        self.assertEqual(["backup"], zone.snapshots["zone"].newer)
+
+        self._namespace.snapshots["backup"].destroy()
+
+        self.assertNotIn("backup", zone.file_system.snapshots)
+
+    def test_snapshot_exists(self):
+        self._namespace.snapshots.create("backup")
+
+        with self.assertRaises(zonys.core.namespace.SnapshotAlreadyExistsError):
+            self._namespace.snapshots.create("backup")
+
+    def test_send(self):
+        self._namespace.snapshots.create("backup")
+        target = self._namespace.file_system.identifier.child("copy")
+
+        with tempfile.TemporaryFile() as handle:
+            self._namespace.snapshots["backup"].send(handle.fileno())
+            handle.seek(0)
+            target.receive(handle.fileno())
+
+        self.assertEqual(
+            {str(x.uuid) for x in self._zones},
+            {x.identifier.last for x in target.open().children},
+        )
+
+    def test_destroy(self):
+        self._namespace.snapshots.create("backup").destroy()
+
+        self.assertNotIn("backup", self._namespace.snapshots)
+        self.assertNotIn("backup", self._zones[0].snapshots)
+
+
+if __name__ == "main":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,232 @@
+import contextlib
+import datetime
+import json
+import sys
+import unittest
+
+import zonys
+import zonys.core
+import zonys.core.testing
+import zonys.core.package
+
+_PKG = """#!{python}
+import json
+import pathlib
+import shutil
+import sys
+import urllib.parse
+
+REPOSITORY = {repository!r}
+
+LOG = {log!r}
+
+
+def main(arguments):
+    options = {{}}
+    root = pathlib.Path("/")
+
+    while arguments[0].startswith("-"):
+        (flag, value) = arguments[:2]
+        arguments = arguments[2:]
+
+        if flag == "-o":
+            (key, value) = value.split("=", 1)
+            options[key] = value
+        elif flag == "--root":
+            root = pathlib.Path(value)
+
+    (command, arguments) = (arguments[0], arguments[1:])
+    packages = [x for x in arguments if not x.startswith("-")]
+
+    database = pathlib.Path(options.get("PKG_DBDIR", root.joinpath("var", "db", "pkg")))
+    cache = pathlib.Path(options.get("PKG_CACHEDIR", root.joinpath("var", "cache", "pkg")))
+    catalogue = database.joinpath("repo-FreeBSD.sqlite")
+    repository = pathlib.Path(urllib.parse.urlparse(REPOSITORY).path)
+
+    with open(LOG, "a") as handle:
+        handle.write(json.dumps([command, *packages]) + "\\n")
+
+    if command == "update":
+        database.mkdir(parents=True, exist_ok=True)
+        shutil.copy(repository.joinpath("catalogue"), catalogue)
+    elif command == "fetch":
+        if not catalogue.exists():
+            return 1
+
+        cache.joinpath("All").mkdir(parents=True, exist_ok=True)
+
+        for package in packages:
+            shutil.copy(
+                repository.joinpath("All", package + ".pkg"),
+                cache.joinpath("All", package + ".pkg"),
+            )
+    elif command == "install":
+        if not catalogue.exists():
+            return 1
+
+        for package in packages:
+            source = cache.joinpath("All", package + ".pkg")
+            if not source.exists():
+                return 1
+
+            target = root.joinpath("usr", "local", package)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy(source, target)
+
+    return 0
+
+
+sys.exit(main(sys.argv[1:]))
+"""
+
+
+class TestPackage(unittest.TestCase):
+    def setUp(self):
+        self._exit_stack = contextlib.ExitStack()
+        environment = self._exit_stack.enter_context(
+            zonys.core.testing.environment(),
+        )
+
+        if not environment.is_fake():  # pragma: no cover
+            self._exit_stack.close()
+            self.skipTest("stub pkg requires the fake environment")
+
+        self._repository = environment.root.joinpath("repository")
+        self._repository.joinpath("All").mkdir(parents=True)
+        self._repository.joinpath("catalogue").write_text("1")
+
+        for name in ["a", "b", "c"]:
+            self._repository.joinpath("All", name + ".pkg").write_text(name)
+
+        self._log = environment.root.joinpath("pkg.log")
+        environment.commands.add(
+            "pkg",
+            _PKG.format(
+                python=sys.executable,
+                repository=self._repository.as_uri(),
+                log=str(self._log),
+            ),
+        )
+
+        self._namespace = self._exit_stack.enter_context(
+            zonys.core.testing.namespace(environment),
+        )
+        self._zones = self._namespace.zone_manager.zones
+
+    def tearDown(self):
+        self._exit_stack.close()
+
+    def _calls(self, command: str):
+        return [
+            x[1:]
+            for x in map(json.loads, self._log.read_text().splitlines())
+            if x[0] == command
+        ]
+
+    def test_install(self):
+        first = self._zones.create(provision=[{"package": ["a", "b"]}])
+        second = self._zones.create(provision=[{"package": ["b", "c"]}])
+
+        self.assertEqual(1, len(self._calls("update")))
+        self.assertEqual(
+            [["a"], ["b"], ["c"]],
+            sorted(self._calls("fetch")),
+        )
+        self.assertEqual(
+            [["a", "b"], ["b", "c"]],
+            self._calls("install"),
+        )
+
+        self.assertEqual("b", first.path.joinpath("usr", "local", "b").read_text())
+        self.assertEqual("c", second.path.joinpath("usr", "local", "c").read_text())
+        self.assertTrue(
+            second.path.joinpath("var", "db", "pkg", "repo-FreeBSD.sqlite").exists()
+        )
+
+        (repository,) = self._namespace.package_manager.repositories
+        self.assertEqual(["a", "b", "c"], sorted(repository.fetched))
+
+    def test_refresh(self):
+        root = self._namespace.path.joinpath("root")
+        root.mkdir()
+
+        manager = zonys.core.package.Manager(
+            self._namespace,
+            interval=datetime.timedelta(0),
+        )
+
+        manager.install(["a"], root)
+        manager.install(["a"], root)
+
+        self.assertEqual(2, len(self._calls("update")))
+        self.assertEqual([["a"]], self._calls("fetch"))
+
+        self._repository.joinpath("catalogue").write_text("2")
+        manager.install(["a"], root)
+
+        self.assertEqual([["a"], ["a"]], self._calls("fetch"))
+
+    def test_rate_limit(self):
+        root = self._namespace.path.joinpath("root")
+        root.mkdir()
+
+        repository = self._namespace.package_manager.repository(root)
+
+        self.assertTrue(repository.refresh(root))
+        self.assertFalse(repository.refresh(root))
+        self.assertTrue(repository.refresh(root, force=True))
+        self.assertEqual(2, len(self._calls("update")))
+
+    def test_layer(self):
+        self._zones.create(provision=[{"package": ["a", "b"]}])
+        second = self._zones.create(provision=[{"package": ["b", "a", "a"]}])
+
+        self.assertEqual([["a", "b"]], self._calls("install"))
+        self.assertEqual("a", second.path.joinpath("usr", "local", "a").read_text())
+        self.assertEqual(1, self._namespace.cache_manager.hits)
+
+    def test_layer_realm(self):
+        provision = [
+            {
+                "file": {
+                    "path": "/usr/local/etc/pkg/repos/local.conf",
+                    "content": "local",
+                },
+            },
+            {
+                "package": ["a"],
+            },
+        ]
+
+        first = self._zones.create(provision=provision)
+        realm = self._namespace.package_manager.repository(first.path).realm
+
+        self.assertEqual(
+            [realm],
+            [x.realm for x in self._namespace.package_manager.repositories],
+        )
+        self.assertEqual(1, len(self._calls("update")))
+
+        self._zones.create(provision=provision)
+
+        self.assertEqual(1, len(self._calls("update")))
+        self.assertEqual([["a"]], self._calls("install"))
+        self.assertEqual(2, self._namespace.cache_manager.hits)
+
+    def test_layer_catalogue(self):
+        first = self._zones.create(provision=[{"package": ["a"]}])
+
+        self._repository.joinpath("catalogue").write_text("2")
+        self._namespace.package_manager.repository(first.path).refresh(
+            first.path,
+            force=True,
+        )
+
+        self._zones.create(provision=[{"package": ["a"]}])
+
+        self.assertEqual([["a"], ["a"]], self._calls("install"))
+        self.assertEqual(0, self._namespace.cache_manager.hits)
+
+
+if __name__ == "main":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,127 @@
+import contextlib
+import unittest
+
+import zonys
+import zonys.core
+import zonys.core.testing
+import zonys.core.configuration
+import zonys.core.profile
+
+
+class TestValidate(unittest.TestCase):
+    def test_valid(self):
+        self.assertEqual(
+            {"recordsize": "16K", "compression": "zstd-3", "quota": "none"},
+            zonys.core.profile.validate(
+                {"recordsize": "16K", "compression": "zstd-3", "quota": "none"}
+            ),
+        )
+
+    def test_invalid_property(self):
+        with self.assertRaises(zonys.core.profile.InvalidPropertyError):
+            zonys.core.profile.validate({"mountpoint": "/tmp"})
+
+    def test_invalid_value(self):
+        for name, value in [
+            ("recordsize", "3K"),
+            ("recordsize", "32M"),
+            ("compression", "brotli"),
+            ("sync", "sometimes"),
+        ]:
+            with self.assertRaises(zonys.core.profile.InvalidValueError):
+                zonys.core.profile.validate({name: value})
+
+
+class TestProfile(unittest.TestCase):
+    def setUp(self):
+        self._exit_stack = contextlib.ExitStack()
+        environment = self._exit_stack.enter_context(
+            zonys.core.testing.environment(),
+        )
+
+        self._namespace = self._exit_stack.enter_context(
+            zonys.core.testing.namespace(environment),
+        )
+        self._zones = self._namespace.zone_manager.zones
+        self._profiles = self._namespace.profile_manager.profiles
+
+    def tearDown(self):
+        self._exit_stack.close()
+
+    def _properties(self, zone, *names):
+        properties = zone.file_system.identifier.open().properties
+        return {x: properties[x].value for x in names}
+
+    def test_profile(self):
+        zone = self._zones.create(dataset="db")
+
+        self.assertEqual(
+            {"recordsize": "16K", "primarycache": "metadata", "atime": "off"},
+            self._properties(zone, "recordsize", "primarycache", "atime"),
+        )
+
+    def test_override(self):
+        zone = self._zones.create(
+            dataset={
+                "profile": "web",
+                "recordsize": "1M",
+            }
+        )
+
+        self.assertEqual(
+            {"recordsize": "1M", "compression": "lz4", "atime": "off"},
+            self._properties(zone, "recordsize", "compression", "atime"),
+        )
+
+    def test_clone(self):
+        parent = self._zones.create(name="parent")
+        zone = self._zones.create(base="parent", dataset="build")
+
+        self.assertEqual(
+            {"sync": "disabled"},
+            self._properties(zone, "sync"),
+        )
+        self.assertEqual(
+            {"sync": "standard"},
+            self._properties(parent, "sync"),
+        )
+
+        zone.destroy()
+
+    def test_namespace(self):
+        self._profiles.create("cache", {"primarycache": "all", "sync": "disabled"})
+        self._profiles.update("web", {"compression": "zstd"})
+
+        self.assertIn("cache", self._profiles)
+        self.assertEqual(
+            ["build", "cache", "db", "web"],
+            [x.name for x in self._profiles],
+        )
+
+        zone = self._zones.create(dataset="web")
+        self.assertEqual(
+            {"compression": "zstd", "atime": "on"},
+            self._properties(zone, "compression", "atime"),
+        )
+
+        with self.assertRaises(zonys.core.profile.AlreadyExistsError):
+            self._profiles.create("cache", {})
+
+        self._profiles.destroy("web")
+        self.assertEqual(
+            zonys.core.profile.DEFAULTS["web"],
+            self._profiles["web"].properties,
+        )
+
+    def test_invalid(self):
+        for options in ["unknown", {"recordsize": "3K"}, {"mountpoint": "/"}]:
+            with self.assertRaises(
+                zonys.core.configuration.InvalidConfigurationError,
+            ):
+                self._zones.create(dataset=options)
+
+        self.assertEqual(0, len(self._zones))
+
+
+if __name__ == "main":  # pragma: no cover
+    unittest.main()
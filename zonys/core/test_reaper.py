@@ -0,0 +1,87 @@
+import contextlib
+import unittest
+
+import zonys
+import zonys.core
+import zonys.core.testing
+
+
+class TestReaper(unittest.TestCase):
+    def setUp(self):
+        self._exit_stack = contextlib.ExitStack()
+        environment = self._exit_stack.enter_context(
+            zonys.core.testing.environment(),
+        )
+
+        self._namespace = self._exit_stack.enter_context(
+            zonys.core.testing.namespace(environment),
+        )
+        self._zones = self._namespace.zone_manager.zones
+        self._manager = self._namespace.reaper_manager
+
+    def tearDown(self):
+        self._exit_stack.close()
+
+    def test_missing(self):
+        children = self._namespace.file_system.children
+
+        self.assertEqual(0, len(self._manager))
+        self.assertEqual([], self._manager.pending)
+        self.assertEqual(0, self._manager.reap().count)
+        self.assertNotIn("trash", children)
+
+    def test_destroy(self):
+        zone = self._zones.create(name="first")
+        identifier = zone.file_system.identifier
+        zone.destroy()
+
+        self.assertNotIn("first", self._zones)
+        self.assertFalse(identifier.exists())
+        self.assertEqual(1, len(self._manager))
+        self.assertTrue(
+            self._manager.pending[0].identifier.last.startswith(str(zone.uuid)),
+        )
+
+        result = self._manager.reap()
+
+        self.assertEqual(1, result.count)
+        self.assertGreater(result.freed, 0)
+        self.assertEqual(0, len(self._manager))
+
+    def test_temporary(self):
+        zone = self._zones.run()
+        zone.stop()
+
+        self.assertEqual(0, len(self._zones))
+        self.assertEqual(1, len(self._manager))
+
+    def test_redeploy(self):
+        zone = self._zones.deploy(name="first")
+        zone = zone.redeploy(name="first")
+
+        self.assertEqual([zone.uuid], [x.uuid for x in self._zones])
+        self.assertEqual(1, len(self._manager))
+
+    def test_base(self):
+        base = self._zones.create(name="base")
+        child = self._zones.create(base="base")
+
+        child.destroy()
+        base.destroy()
+
+        self.assertEqual(2, self._manager.reap().count)
+        self.assertEqual(0, len(self._manager))
+
+    def test_dependents(self):
+        base = self._zones.create(name="base")
+        child = self._zones.create(base="base")
+
+        self.assertTrue(base.has_dependents())
+        self.assertFalse(child.has_dependents())
+
+        child.destroy()
+        self.assertFalse(base.has_dependents())
+
+
+if __name__ == "main":  # pragma: no cover
+    unittest.main()
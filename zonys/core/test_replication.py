@@ -0,0 +1,204 @@
+import contextlib
+import threading
+import time
+import unittest
+import unittest.mock
+
+import zonys
+import zonys.core
+import zonys.core.testing
+import zonys.core.namespace
+import zonys.core.replication
+import zonys.core.zfs
+import zonys.core.zfs.file_system
+
+
+class TestReplication(unittest.TestCase):
+    def setUp(self):
+        self._exit_stack = contextlib.ExitStack()
+        environment = self._exit_stack.enter_context(
+            zonys.core.testing.environment(),
+        )
+
+        self._file_system = self._exit_stack.enter_context(
+            zonys.core.testing.file_system(environment),
+        )
+
+        self._namespace = zonys.core.namespace.Handle(
+            self._file_system.children.create("source")
+        )
+        self._target = str(self._file_system.identifier.child("target"))
+        self._zones = [
+            self._namespace.zone_manager.zones.create(name="app"),
+            self._namespace.zone_manager.zones.create(name="database"),
+        ]
+
+        for zone in self._zones:
+            zone.path.joinpath("file").write_text(zone.name)
+
+    def tearDown(self):
+        self._exit_stack.close()
+
+    def _standby(self) -> "zonys.core.namespace.Handle":
+        return zonys.core.namespace.Handle(
+            zonys.core.zfs.file_system.Identifier(self._target).open()
+        )
+
+    def test_full(self):
+        transfers = self._namespace.replication_manager.replicate(self._target)
+
+        self.assertEqual(
+            ["full"] * 3,
+            [x.mode for x in transfers],
+        )
+
+        standby = self._standby()
+        for zone in self._zones:
+            self.assertEqual(
+                zone.name,
+                standby.zone_manager.zones[zone.name].path.joinpath("file").read_text(),
+            )
+
+    def test_incremental(self):
+        first = self._namespace.replication_manager.replicate(self._target)
+        self._zones[0].path.joinpath("file").write_text("changed")
+
+        transfers = self._namespace.replication_manager.replicate(
+            self._target,
+            jobs=2,
+            limit=1 << 20,
+        )
+
+        self.assertEqual(["incremental"] * 3, [x.mode for x in transfers])
+        self.assertEqual(first[0].snapshot, transfers[0].fromname)
+        self.assertEqual(
+            "changed",
+            self._standby().zone_manager.zones["app"].path.joinpath("file").read_text(),
+        )
+        self.assertEqual(
+            [transfers[0].snapshot],
+            [
+                x.name
+                for x in self._namespace.snapshots
+                if x.name.startswith(zonys.core.replication.PREFIX)
+            ],
+        )
+
+    def test_resume(self):
+        failing = str(self._zones[1].uuid)
+        receive = zonys.core.replication._LocalTarget.receive
+
+        def interrupt(target, relative, source, bucket, full):
+            if relative == failing:
+                raise zonys.core.replication.ReceiveError(relative)
+
+            receive(target, relative, source, bucket, full)
+
+        with unittest.mock.patch.object(
+            zonys.core.replication._LocalTarget,
+            "receive",
+            interrupt,
+        ):
+            with self.assertRaises(zonys.core.replication.ReceiveError):
+                self._namespace.replication_manager.replicate(self._target)
+
+        progress = self._namespace.replication_manager.state["targets"][self._target]
+        self.assertNotIn(failing, progress["done"])
+        self.assertIn(str(self._zones[0].uuid), progress["done"])
+
+        transfers = self._namespace.replication_manager.replicate(self._target)
+
+        self.assertEqual(progress["snapshot"], transfers[0].snapshot)
+        self.assertIn(failing, self._standby().zone_manager.zones)
+
+    def test_reset(self):
+        self._namespace.replication_manager.replicate(self._target)
+        self._zones[0].reset(force=True)
+
+        progress = self._namespace.replication_manager.state["targets"][self._target]
+        self.assertEqual([str(self._zones[0].uuid)], progress["full"])
+
+        transfers = self._namespace.replication_manager.replicate(self._target)
+
+        self.assertEqual(
+            {
+                "": "incremental",
+                str(self._zones[0].uuid): "full",
+                str(self._zones[1].uuid): "incremental",
+            },
+            {x.relative: x.mode for x in transfers},
+        )
+        self.assertFalse(
+            self._standby().zone_manager.zones["app"].path.joinpath("file").exists(),
+        )
+
+        progress = self._namespace.replication_manager.state["targets"][self._target]
+        self.assertEqual([], progress["full"])
+
+    def test_parallel(self):
+        for index in range(6):
+            self._namespace.zone_manager.zones.create(name="zone-{}".format(index))
+
+        receive = zonys.core.zfs.file_system.Identifier.receive
+        lock = threading.Lock()
+        active = [0]
+        peak = [0]
+
+        def track(identifier, descriptor, force=False):
+            with lock:
+                active[0] = active[0] + 1
+                peak[0] = max(peak[0], active[0])
+
+            try:
+                time.sleep(0.05)
+                return receive(identifier, descriptor, force)
+            finally:
+                with lock:
+                    active[0] = active[0] - 1
+
+        with unittest.mock.patch.object(
+            zonys.core.zfs.file_system.Identifier,
+            "receive",
+            track,
+        ):
+            self._namespace.replication_manager.replicate(self._target, jobs=8)
+
+        self.assertGreater(peak[0], 1)
+        self.assertEqual(8, len(self._standby().zone_manager.zones))
+
+    def test_source_unlocked(self):
+        receive = zonys.core.zfs.file_system.Identifier.receive
+        created = []
+
+        def create():
+            created.append(self._namespace.zone_manager.zones.create(name="late"))
+
+        def interleave(identifier, descriptor, force=False):
+            if identifier.last == str(self._zones[0].uuid):
+                thread = threading.Thread(target=create, daemon=True)
+                thread.start()
+                thread.join(10)
+
+            return receive(identifier, descriptor, force)
+
+        with unittest.mock.patch.object(
+            zonys.core.zfs.file_system.Identifier,
+            "receive",
+            interleave,
+        ):
+            self._namespace.replication_manager.replicate(self._target)
+
+        self.assertEqual(["late"], [x.name for x in created])
+
+    def test_target_modified(self):
+        self._namespace.replication_manager.replicate(self._target)
+        self._standby().zone_manager.zones["app"].snapshots.create("local")
+
+        self._namespace.replication_manager.replicate(self._target)
+
+        standby = self._standby().zone_manager.zones["app"]
+        self.assertNotIn("local", standby.snapshots)
+
+
+if __name__ == "main":  # pragma: no cover
+    unittest.main()
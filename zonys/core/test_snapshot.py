@@ -0,0 +1,88 @@
+import contextlib
+import datetime
+import unittest
+
+import zonys
+import zonys.core
+import zonys.core.testing
+import zonys.core.snapshot
+
+
+class TestSnapshotPolicy(unittest.TestCase):
+    def setUp(self):
+        self._exit_stack = contextlib.ExitStack()
+        environment = self._exit_stack.enter_context(
+            zonys.core.testing.environment(),
+        )
+
+        self._namespace = self._exit_stack.enter_context(
+            zonys.core.testing.namespace(environment),
+        )
+        self._manager = self._namespace.snapshot_manager
+        self._zone = self._namespace.zone_manager.zones.create(name="policy")
+        self._other = self._namespace.zone_manager.zones.create(name="other")
+        self._time = datetime.datetime(2024, 1, 1, 12, 0, 0)
+
+    def tearDown(self):
+        self._exit_stack.close()
+
+    def _tick(self, hours: int = 0) -> "zonys.core.snapshot.Result":
+        return self._manager.tick(self._time + datetime.timedelta(hours=hours))
+
+    def test_tick_without_policies(self):
+        result = self._tick()
+
+        self.assertIsNone(result.name)
+        self.assertEqual(0, result.pruned)
+
+    def test_tick_matching_zones(self):
+        self._manager.policies.set(str(self._zone.uuid), hourly=2)
+        result = self._tick()
+
+        self.assertEqual([str(self._zone.uuid)], result.zones)
+        self.assertIn(result.name, self._zone.snapshots)
+        self.assertNotIn(result.name, self._other.snapshots)
+        self.assertIsNone(self._tick().name)
+
+    def test_retention(self):
+        self._manager.policies.set(str(self._zone.uuid), hourly=2, daily=1)
+
+        names = [self._tick(x).name for x in range(4)]
+
+        self.assertEqual(
+            [names[0], names[2], names[3]],
+            self._manager.policies[str(self._zone.uuid)].snapshots,
+        )
+        self.assertEqual(
+            ["initial", names[0], names[2], names[3]],
+            self._zone.snapshots.catalog.names,
+        )
+
+    def test_unset_prunes(self):
+        self._manager.policies.set(str(self._zone.uuid), hourly=2)
+        self._manager.policies.set(str(self._other.uuid), hourly=2)
+        name = self._tick().name
+
+        self._manager.policies.unset(str(self._zone.uuid))
+        self.assertEqual(1, self._manager.prune())
+        self.assertNotIn(name, self._zone.snapshots)
+        self.assertIn(name, self._other.snapshots)
+
+        self._manager.policies.unset(str(self._other.uuid))
+        self.assertEqual(1, self._manager.prune())
+        self.assertEqual({}, dict(self._manager.snapshots))
+        self.assertNotIn(
+            name,
+            self._namespace.zone_manager.file_system.snapshots,
+        )
+
+    def test_invalid_policy(self):
+        with self.assertRaises(zonys.core.snapshot.InvalidPolicyError):
+            self._manager.policies.set(str(self._zone.uuid), monthly=1)
+
+        with self.assertRaises(zonys.core.snapshot.InvalidPolicyError):
+            self._manager.policies.set(str(self._zone.uuid), hourly=-1)
+
+
+if __name__ == "main":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,95 @@
+import contextlib
+import json
+import unittest
+
+import click.testing
+
+import zonys
+import zonys.core
+import zonys.core.testing
+import zonys.cli
+import zonys.core.status
+
+
+class TestStatus(unittest.TestCase):
+    def setUp(self):
+        self._exit_stack = contextlib.ExitStack()
+        self._environment = self._exit_stack.enter_context(
+            zonys.core.testing.environment(),
+        )
+
+        self._namespace = self._exit_stack.enter_context(
+            zonys.core.testing.namespace(self._environment),
+        )
+        self._base = self._namespace.zone_manager.zones.create(name="base")
+        self._zone = self._namespace.zone_manager.zones.create(
+            name="child",
+            base=str(self._base.uuid),
+        )
+
+    def tearDown(self):
+        self._zone.undeploy()
+        self._base.undeploy()
+        self._exit_stack.close()
+
+    def test_rows(self):
+        rows = {x["name"]: x for x in zonys.core.status.rows(self._namespace)}
+
+        self.assertEqual({"base", "child"}, set(rows))
+        self.assertEqual(
+            "{}@initial".format(self._base.identifier),
+            rows["child"]["base"],
+        )
+        self.assertIsNone(rows["base"]["base"])
+        self.assertEqual(["initial"], rows["base"]["snapshots"])
+        self.assertEqual("Down", rows["child"]["status"])
+
+    def test_rows_columns(self):
+        for row in zonys.core.status.rows(self._namespace, ["name"]):
+            self.assertEqual(["name"], list(row))
+
+    def test_rows_unknown_column(self):
+        with self.assertRaises(zonys.core.status.UnknownColumnError):
+            list(zonys.core.status.rows(self._namespace, ["unknown"]))
+
+    def test_cli_json(self):
+        result = click.testing.CliRunner().invoke(
+            zonys.cli.main,
+            [
+                "--namespace",
+                str(self._namespace.file_system.identifier),
+                "zone",
+                "status",
+                "--format",
+                "json",
+                "--columns",
+                "name,status",
+            ],
+        )
+
+        self.assertEqual(0, result.exit_code, result.output)
+        self.assertEqual(
+            [{"name": "base", "status": "Down"}, {"name": "child", "status": "Down"}],
+            sorted(
+                map(json.loads, result.output.splitlines()),
+                key=lambda x: x["name"],
+            ),
+        )
+
+    def test_cli_trash(self):
+        result = click.testing.CliRunner().invoke(
+            zonys.cli.main,
+            [
+                "--namespace",
+                str(self._namespace.file_system.identifier),
+                "zone",
+                "status",
+            ],
+        )
+
+        self.assertEqual(0, result.exit_code, result.output)
+        self.assertNotIn("trash", self._namespace.file_system.children)
+
+
+if __name__ == "main":  # pragma: no cover
+    unittest.main()
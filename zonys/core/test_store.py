@@ -0,0 +1,96 @@
+import pathlib
+import tempfile
+import threading
+import unittest
+import uuid
+
+from ruamel import yaml
+
+import zonys
+import zonys.core
+import zonys.core.store
+
+
+class TestStore(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self._path = pathlib.Path(self._directory.name)
+        self._store = zonys.core.store.Store(self._path.joinpath("zonys.db"))
+
+    def tearDown(self):
+        self._store.close()
+        self._directory.cleanup()
+
+    def test_migrate(self):
+        key = str(uuid.uuid4())
+        path = self._path.joinpath("{}.yaml".format(key))
+        yaml.YAML().dump({"name": "migrated", "local": {"name": "migrated"}}, path)
+        self._path.joinpath("other.yaml").write_text("name: other")
+
+        self.assertEqual(key, self._store.find("migrated"))
+        self.assertEqual({"name": "migrated"}, self._store.get(key)["local"])
+        self.assertFalse(path.exists())
+        self.assertTrue(self._path.joinpath("other.yaml").exists())
+
+    def test_record(self):
+        key = str(uuid.uuid4())
+        record = self._store.record(key, {})
+        record.update({"name": "zone", "spare": "web"})
+        record.flush()
+
+        self.assertIsNone(self._store.find("zone"))
+        self.assertEqual([key], self._store.spares("web"))
+
+        del record["spare"]
+        record.flush()
+
+        self.assertEqual(key, self._store.find("zone"))
+        self.assertEqual(key, self._store.find(key))
+
+        record.destroy()
+        self.assertIsNone(self._store.get(key))
+
+    def test_match(self):
+        keys = [str(uuid.uuid4()) for _ in range(2)]
+        self._store.put(keys[0], {"name": "web_1"})
+        self._store.put(keys[1], {"name": "web%1"})
+
+        self.assertEqual([keys[1]], self._store.match("web%"))
+        self.assertEqual([keys[0]], self._store.match("web_"))
+        self.assertEqual([keys[0]], self._store.match(keys[0][:8]))
+        self.assertEqual([], self._store.match("WEB"))
+
+    def test_transaction_rollback(self):
+        key = str(uuid.uuid4())
+
+        with self.assertRaises(RuntimeError):
+            with self._store.transaction():
+                self._store.put(key, {"name": "rolled-back"})
+                raise RuntimeError()
+
+        self.assertIsNone(self._store.get(key))
+
+    def test_concurrent_writers(self):
+        other = zonys.core.store.Store(self._path.joinpath("zonys.db"))
+
+        def write(store, offset):
+            for index in range(25):
+                store.put(str(uuid.UUID(int=offset + index)), {"name": str(index)})
+
+        threads = [
+            threading.Thread(target=write, args=(self._store, 0)),
+            threading.Thread(target=write, args=(other, 100)),
+        ]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        other.close()
+        self.assertEqual(50, len(self._store.records()))
+
+
+if __name__ == "main":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,113 @@
+import concurrent.futures
+import contextlib
+import unittest
+import unittest.mock
+
+import zonys
+import zonys.core
+import zonys.core.testing
+import zonys.core.template
+
+
+class TestTemplate(unittest.TestCase):
+    def setUp(self):
+        self._exit_stack = contextlib.ExitStack()
+        environment = self._exit_stack.enter_context(
+            zonys.core.testing.environment(),
+        )
+
+        self._namespace = self._exit_stack.enter_context(
+            zonys.core.testing.namespace(environment),
+        )
+        self._template = self._namespace.template_manager.templates.create(
+            "web",
+            2,
+            {
+                "provision": [
+                    {
+                        "file": {
+                            "path": "/file",
+                            "content": "hello-world",
+                        },
+                    },
+                ],
+            },
+        )
+        self._template.fill()
+
+    def tearDown(self):
+        for zone in self._namespace.zone_manager.zones:
+            zone.undeploy()
+
+        self._namespace.template_manager.templates.destroy("web")
+        self._exit_stack.close()
+
+    def test_spares_are_hidden(self):
+        self.assertEqual(2, len(self._template.spares))
+        self.assertEqual(0, len(self._namespace.zone_manager.zones))
+
+    def test_claim(self):
+        zone = self._template.claim(name="claimed")
+
+        self.assertEqual("claimed", zone.name)
+        self.assertEqual(
+            "hello-world",
+            zone.path.joinpath("file").read_text(),
+        )
+        self.assertIn("claimed", self._namespace.zone_manager.zones)
+        self.assertEqual(1, len(self._template.spares))
+
+    def test_claim_invalid_delta(self):
+        with self.assertRaises(zonys.core.template.InvalidDeltaError):
+            self._template.claim(provision=[])
+
+    def test_claim_without_spares(self):
+        self._template.drain()
+        zone = self._template.claim(name="created")
+
+        self.assertEqual(
+            "hello-world",
+            zone.path.joinpath("file").read_text(),
+        )
+
+    def test_claim_stale_spare(self):
+        spares = self._template.spares
+        first = self._template.claim(name="first")
+
+        with unittest.mock.patch.object(
+            zonys.core.template._Handle,
+            "spares",
+            new_callable=unittest.mock.PropertyMock,
+            return_value=spares,
+        ):
+            second = self._template.claim(name="second")
+
+        self.assertEqual(
+            {str(x.uuid) for x in spares},
+            {str(first.uuid), str(second.uuid)},
+        )
+        self.assertEqual(0, len(self._template.spares))
+
+    def test_claim_concurrent(self):
+        with concurrent.futures.ThreadPoolExecutor(3) as executor:
+            zones = list(
+                executor.map(
+                    lambda x: self._template.claim(name="zone-{}".format(x)),
+                    range(3),
+                )
+            )
+
+        self.assertEqual(3, len({str(x.uuid) for x in zones}))
+        self.assertEqual(0, len(self._template.spares))
+        self.assertEqual(3, len(self._namespace.zone_manager.zones))
+
+    def test_run(self):
+        zone = self._namespace.zone_manager.zones.run(template="web")
+        self.assertTrue(zone.is_running())
+
+        zone.stop()
+        self.assertNotIn(str(zone.uuid), self._namespace.zone_manager.zones)
+
+
+if __name__ == "main":  # pragma: no cover
+    unittest.main()
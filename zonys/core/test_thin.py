@@ -0,0 +1,186 @@
+import contextlib
+import os
+import unittest
+import unittest.mock
+
+import zonys
+import zonys.core
+import zonys.core.testing
+import zonys.core.configuration
+import zonys.core.thin
+import zonys.core.transfer
+
+_TREE = {
+    "bin/sh": "sh",
+    "lib/libc.so": "libc",
+    "etc/rc.conf": "rc",
+    "var/log/messages": "",
+    "usr/bin/env": "env",
+    "usr/lib/libz.so": "libz",
+    "usr/local/etc/app.conf": "app",
+    "root/.profile": "profile",
+}
+
+
+class TestThin(unittest.TestCase):
+    def setUp(self):
+        self._exit_stack = contextlib.ExitStack()
+        self._environment = self._exit_stack.enter_context(
+            zonys.core.testing.environment(),
+        )
+
+        self._source = self._environment.root.joinpath("source")
+        for name, content in _TREE.items():
+            path = self._source.joinpath(name)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content)
+
+        self._namespace = self._exit_stack.enter_context(
+            zonys.core.testing.namespace(self._environment),
+        )
+        self._zones = self._namespace.zone_manager.zones
+        self._base = self._namespace.thin_manager.create("base", self._source)
+
+    def tearDown(self):
+        self._exit_stack.close()
+
+    def _mounts(self):
+        if not self._environment.is_fake():  # pragma: no cover
+            return []
+
+        return self._environment.commands.mounts()
+
+    def test_create(self):
+        zone = self._zones.create(thin="base")
+
+        self.assertEqual(".base/bin", os.readlink(zone.path.joinpath("bin")))
+        self.assertEqual(
+            "../.base/usr/bin",
+            os.readlink(zone.path.joinpath("usr", "bin")),
+        )
+        self.assertFalse(zone.path.joinpath("etc").is_symlink())
+        self.assertEqual("rc", zone.path.joinpath("etc", "rc.conf").read_text())
+        self.assertEqual(
+            "app",
+            zone.path.joinpath("usr", "local", "etc", "app.conf").read_text(),
+        )
+        self.assertEqual("profile", zone.path.joinpath("root", ".profile").read_text())
+
+        self.assertEqual("base", zone.thin_name)
+        self.assertEqual([zone.uuid], [x.uuid for x in self._base.zones])
+
+        if self._environment.is_fake():
+            self.assertEqual(
+                [
+                    {
+                        "type": "nullfs",
+                        "source": str(self._base.path),
+                        "destination": str(zone.path.joinpath(".base")),
+                        "read_only": True,
+                    }
+                ],
+                self._mounts(),
+            )
+
+    def test_destroy_zone(self):
+        zone = self._zones.create(thin="base")
+        zone.destroy()
+
+        self.assertEqual([], self._mounts())
+        self.assertEqual([], self._base.zones)
+
+    def test_update(self):
+        self._zones.create(thin="base")
+        self._zones.create(thin="base")
+
+        self._source.joinpath("usr", "bin", "env").write_text("patched")
+        self._source.joinpath("lib", "libc.so").unlink()
+        self._source.joinpath("sbin").mkdir()
+        self._source.joinpath("sbin", "init").write_text("init")
+
+        self._base.update(self._source)
+
+        self.assertEqual(1, len(self._base.updates))
+        self.assertEqual(
+            "patched",
+            self._base.path.joinpath("usr", "bin", "env").read_text(),
+        )
+        self.assertFalse(self._base.path.joinpath("lib", "libc.so").exists())
+        self.assertTrue(self._base.path.joinpath("sbin", "init").exists())
+
+        self._base.rollback()
+
+        self.assertEqual(0, len(self._base.updates))
+        self.assertEqual(
+            "env", self._base.path.joinpath("usr", "bin", "env").read_text()
+        )
+        self.assertTrue(self._base.path.joinpath("lib", "libc.so").exists())
+
+        with self.assertRaises(zonys.core.thin.NoUpdateError):
+            self._base.rollback()
+
+    def test_update_replaces(self):
+        path = self._base.path.joinpath("usr", "bin", "env")
+        inode = path.stat().st_ino
+
+        self._source.joinpath("usr", "bin", "env").write_text("patched")
+
+        with path.open() as reader:
+            self._base.update(self._source)
+
+            self.assertEqual("env", reader.read())
+
+        self.assertNotEqual(inode, path.stat().st_ino)
+        self.assertEqual("patched", path.read_text())
+        self.assertEqual(["env"], os.listdir(path.parent))
+
+    def test_update_failure(self):
+        self._source.joinpath("usr", "bin", "env").write_text("patched")
+        self._source.joinpath("lib", "libc.so").write_text("patched")
+
+        copy_file = zonys.core.transfer.copy_file
+
+        def fail(source, destination):
+            if source.name == "libc.so":
+                raise OSError(source)
+
+            return copy_file(source, destination)
+
+        with unittest.mock.patch.object(
+            zonys.core.transfer,
+            "copy_file",
+            side_effect=fail,
+        ):
+            with self.assertRaises(OSError):
+                self._base.update(self._source)
+
+        self.assertEqual(0, len(self._base.updates))
+        self.assertEqual(
+            "env", self._base.path.joinpath("usr", "bin", "env").read_text()
+        )
+        self.assertEqual(["libc.so"], os.listdir(self._base.path.joinpath("lib")))
+
+    def test_destroy_in_use(self):
+        zone = self._zones.create(thin="base")
+
+        with self.assertRaises(zonys.core.thin.InUseError):
+            self._base.destroy()
+
+        zone.destroy()
+        self._base.destroy()
+
+        self.assertNotIn("base", self._namespace.thin_manager)
+
+    def test_unknown(self):
+        with self.assertRaises(zonys.core.configuration.InvalidConfigurationError):
+            self._zones.create(thin="unknown")
+
+        self.assertEqual(0, len(self._zones))
+
+    def test_already_exists(self):
+        with self.assertRaises(zonys.core.thin.AlreadyExistsError):
+            self._namespace.thin_manager.create("base", self._source)
+
+
+if __name__ == "main":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,174 @@
+import contextlib
+import errno
+import os
+import pathlib
+import tempfile
+import unittest
+import unittest.mock
+
+import zonys
+import zonys.core
+import zonys.core.testing
+import zonys.core.transfer
+
+
+class TestTransfer(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        root = pathlib.Path(self._directory.name)
+
+        self._source = root.joinpath("source")
+        self._destination = root.joinpath("destination")
+
+        for index in range(20):
+            path = self._source.joinpath(
+                "directory-{}".format(index % 4),
+                "nested-{}".format(index % 2),
+                "file-{}".format(index),
+            )
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text("content-{}".format(index) * (index + 1))
+
+        self._source.joinpath("link").symlink_to("directory-0")
+        self._source.joinpath("directory-1", "file").write_text("mode")
+        self._source.joinpath("directory-1", "file").chmod(0o600)
+        os.utime(self._source.joinpath("directory-2"), ns=(10**18, 10**18))
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def _files(self, root: pathlib.Path):
+        return {
+            str(x.relative_to(root)): x.read_text()
+            for x in root.rglob("*")
+            if x.is_file() and not x.is_symlink()
+        }
+
+    def test_copy(self):
+        result = zonys.core.transfer.copy(self._source, self._destination)
+
+        self.assertEqual(self._files(self._source), self._files(self._destination))
+        self.assertEqual(22, result.copied)
+        self.assertEqual("directory-0", os.readlink(self._destination.joinpath("link")))
+        self.assertEqual(
+            0o600,
+            self._destination.joinpath("directory-1", "file").stat().st_mode & 0o777,
+        )
+        self.assertEqual(
+            10**18,
+            self._destination.joinpath("directory-2").stat().st_mtime_ns,
+        )
+
+    def test_file(self):
+        source = self._source.joinpath("directory-1", "file")
+        destination = self._destination.joinpath("file")
+        self._destination.mkdir()
+
+        zonys.core.transfer.copy(source, destination)
+
+        self.assertEqual("mode", destination.read_text())
+
+    def test_incremental_mtime(self):
+        zonys.core.transfer.copy(self._source, self._destination)
+
+        path = self._source.joinpath("directory-0", "nested-0", "file-0")
+        path.write_text("changed")
+
+        result = zonys.core.transfer.copy(
+            self._source,
+            self._destination,
+            incremental=zonys.core.transfer.MTIME,
+        )
+
+        self.assertEqual(1, result.copied)
+        self.assertEqual(21, result.skipped)
+        self.assertEqual(self._files(self._source), self._files(self._destination))
+
+    def test_incremental_hash(self):
+        zonys.core.transfer.copy(self._source, self._destination)
+
+        path = self._source.joinpath("directory-0", "nested-0", "file-0")
+        os.utime(path, ns=(0, 0))
+
+        result = zonys.core.transfer.copy(
+            self._source,
+            self._destination,
+            incremental=zonys.core.transfer.HASH,
+        )
+        self.assertEqual(0, result.copied)
+
+        result = zonys.core.transfer.copy(
+            self._source,
+            self._destination,
+            incremental=zonys.core.transfer.MTIME,
+        )
+        self.assertEqual(1, result.copied)
+
+    def test_fallback(self):
+        with unittest.mock.patch.object(
+            os,
+            "copy_file_range",
+            side_effect=OSError(errno.EXDEV, "cross-device"),
+            create=True,
+        ):
+            zonys.core.transfer.copy(self._source, self._destination)
+
+        self.assertEqual(self._files(self._source), self._files(self._destination))
+
+    def test_invalid_mode(self):
+        with self.assertRaises(zonys.core.transfer.InvalidModeError):
+            zonys.core.transfer.copy(self._source, self._destination, "size")
+
+    def test_fingerprint(self):
+        before = zonys.core.transfer.fingerprint(self._source)
+        self.assertEqual(before, zonys.core.transfer.fingerprint(self._source))
+
+        self._source.joinpath("directory-3", "new").write_text("new")
+        self.assertNotEqual(before, zonys.core.transfer.fingerprint(self._source))
+
+
+class TestPathProvision(unittest.TestCase):
+    def setUp(self):
+        self._exit_stack = contextlib.ExitStack()
+        environment = self._exit_stack.enter_context(
+            zonys.core.testing.environment(),
+        )
+
+        self._source = environment.root.joinpath("source")
+        self._source.mkdir()
+        self._source.joinpath("index.html").write_text("first")
+
+        self._namespace = self._exit_stack.enter_context(
+            zonys.core.testing.namespace(environment),
+        )
+        self._zones = self._namespace.zone_manager.zones
+
+    def tearDown(self):
+        self._exit_stack.close()
+
+    def test_changed_source(self):
+        provision = [
+            {
+                "path": {
+                    "source": str(self._source),
+                    "destination": "/srv/www",
+                },
+            },
+        ]
+
+        first = self._zones.create(provision=provision)
+
+        self._source.joinpath("index.html").write_text("second")
+        second = self._zones.create(provision=provision)
+
+        self.assertEqual(0, self._namespace.cache_manager.hits)
+        self.assertEqual(
+            "first", first.path.joinpath("srv", "www", "index.html").read_text()
+        )
+        self.assertEqual(
+            "second", second.path.joinpath("srv", "www", "index.html").read_text()
+        )
+
+
+if __name__ == "main":  # pragma: no cover
+    unittest.main()
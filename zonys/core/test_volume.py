@@ -0,0 +1,127 @@
+import contextlib
+import unittest
+
+import zonys
+import zonys.core
+import zonys.core.testing
+import zonys.core.volume
+import zonys.core.zfs.property
+
+
+class TestVolume(unittest.TestCase):
+    def setUp(self):
+        self._exit_stack = contextlib.ExitStack()
+        self._environment = self._exit_stack.enter_context(
+            zonys.core.testing.environment(),
+        )
+
+        self._namespace = self._exit_stack.enter_context(
+            zonys.core.testing.namespace(self._environment),
+        )
+        self._zones = self._namespace.zone_manager.zones
+        self._volumes = self._namespace.volume_manager.volumes
+
+    def tearDown(self):
+        self._exit_stack.close()
+
+    def _configuration(self):
+        return {
+            "mount": [
+                {
+                    "volume": {
+                        "name": "database",
+                        "destination": "/var/db/postgres",
+                    },
+                },
+            ],
+        }
+
+    def test_create(self):
+        volume = self._volumes.create(
+            "database",
+            recordsize="16K",
+            compression="lz4",
+            logbias="throughput",
+        )
+
+        self.assertIn("database", self._volumes)
+        self.assertEqual(["database"], [x.name for x in self._volumes])
+        self.assertEqual("16K", volume.properties["recordsize"])
+        self.assertEqual("lz4", volume.properties["compression"])
+        self.assertEqual("throughput", volume.properties["logbias"])
+        self.assertEqual("all", volume.properties["primarycache"])
+
+        with self.assertRaises(zonys.core.volume.AlreadyExistsError):
+            self._volumes.create("database")
+
+    def test_configure(self):
+        volume = self._volumes.create("database")
+        volume.configure(primarycache="metadata", quota="10G")
+
+        self.assertEqual("metadata", volume.properties["primarycache"])
+        self.assertEqual("10G", volume.properties["quota"])
+
+        with self.assertRaises(zonys.core.volume.InvalidPropertyError):
+            volume.configure(mountpoint="/tmp")
+
+    def test_property_compression(self):
+        volume = self._volumes.create("database")
+        compression = volume.file_system.properties["compression"]
+
+        for value in ["gzip-9", "zstd-19", "lz4"]:
+            compression.value = value
+
+        for value in ["gzip-10", "zstd-20", "brotli"]:
+            with self.assertRaises(zonys.core.zfs.property.InvalidValueError):
+                compression.value = value
+
+        self.assertEqual("lz4", volume.properties["compression"])
+
+    def test_snapshot(self):
+        volume = self._volumes.create("database")
+        volume.snapshot("backup")
+
+        self.assertEqual(
+            ["backup"],
+            [x.identifier.name for x in volume.snapshots],
+        )
+
+    def test_redeploy(self):
+        volume = self._volumes.create("database", recordsize="16K")
+        zone = self._zones.deploy(**self._configuration())
+        destination = zone.path.joinpath("var", "db", "postgres")
+
+        if self._environment.is_fake():
+            self.assertEqual(
+                [
+                    {
+                        "type": "nullfs",
+                        "source": str(volume.path),
+                        "destination": str(destination),
+                        "read_only": False,
+                    }
+                ],
+                self._environment.commands.mounts(),
+            )
+
+        volume.path.joinpath("data").write_text("rows")
+        zone = zone.redeploy(**self._configuration())
+
+        self.assertEqual("rows", volume.path.joinpath("data").read_text())
+        self.assertEqual([zone.uuid], [x.uuid for x in volume.zones])
+
+        with self.assertRaises(zonys.core.volume.InUseError):
+            volume.destroy()
+
+        zone.undeploy()
+        volume.destroy()
+
+        self.assertNotIn("database", self._volumes)
+
+    def test_unknown(self):
+        with self.assertRaises(zonys.core.volume.NotFoundError):
+            self._volumes["unknown"].destroy()
+
+
+if __name__ == "main":  # pragma: no cover
+    unittest.main()
@@ -1,3 +1,4 @@
+import contextlib
 import pathlib
 import tempfile
 import unittest
@@ -5,6 +6,7 @@ import uuid
 
 import zonys
 import zonys.core
+import zonys.core.testing
 import zonys.core.namespace
 import zonys.core.zone
 import zonys.core.zfs
@@ -27,9 +29,14 @@ class _TestZone(unittest.TestCase):
 
     @classmethod
     def setUpClass(cls):
+        cls._exit_stack = contextlib.ExitStack()
+        environment = cls._exit_stack.enter_context(
+            zonys.core.testing.environment(),
+        )
+
         cls._file_system = zonys.core.zfs.file_system.Identifier(
             [
-                "zroot",
+                environment.pool,
                 "zonys",
                 "test",
                 str(uuid.uuid4()),
@@ -89,6 +96,7 @@ class _TestZone(unittest.TestCase):
         cls._snapshot_child.undeploy()
         cls._base.undeploy()
         cls._file_system.destroy()
+        cls._exit_stack.close()
 
     def test_base_is_running(self):
         self.assertTrue(self._base.is_running())
@@ -124,5 +132,102 @@ class _TestZone(unittest.TestCase):
         self._test_file_system_structure(self._redeploy_child.path)
 
 
+class _TestZoneReset(unittest.TestCase):
+    def setUp(self):
+        self._exit_stack = contextlib.ExitStack()
+        environment = self._exit_stack.enter_context(
+            zonys.core.testing.environment(),
+        )
+
+        self._namespace = self._exit_stack.enter_context(
+            zonys.core.testing.namespace(environment),
+        )
+        self._zone = self._namespace.zone_manager.zones.deploy(
+            name="reset",
+            provision=[
+                {
+                    "file": {
+                        "path": "/file",
+                        "content": "initial",
+                    },
+                },
+            ],
+        )
+
+    def tearDown(self):
+        self._exit_stack.close()
+
+    def test_reset_initial(self):
+        self._zone.path.joinpath("file").write_text("changed")
+        self._zone.path.joinpath("other").write_text("other")
+        self._zone.snapshots.create("second")
+
+        with self.assertRaises(zonys.core.zone.NewerSnapshotsError):
+            self._namespace.zone_manager.zones.reset("reset")
+
+        self.assertEqual("changed", self._zone.path.joinpath("file").read_text())
+        self.assertTrue(self._zone.is_running())
+
+        self._namespace.zone_manager.zones.reset("reset", force=True)
+
+        self.assertEqual("initial", self._zone.path.joinpath("file").read_text())
+        self.assertFalse(self._zone.path.joinpath("other").exists())
+        self.assertFalse(self._zone.path.joinpath(".zonys.yaml").exists())
+        self.assertNotIn("second", self._zone.snapshots)
+        self.assertTrue(self._zone.is_running())
+
+    def test_reset_named(self):
+        self._zone.path.joinpath("file").write_text("second")
+        self._zone.snapshots.create("second")
+        self._zone.path.joinpath("file").write_text("changed")
+
+        self._zone.reset("second")
+
+        self.assertEqual("second", self._zone.path.joinpath("file").read_text())
+        self.assertIn("second", self._zone.snapshots)
+
+    def test_snapshot_catalog(self):
+        self._zone.snapshots.create("second")
+        self._zone.snapshots.create("third")
+
+        catalog = self._zone.snapshots.catalog
+        self.assertEqual(["initial", "second", "third"], catalog.names)
+        self.assertLess(catalog["initial"].createtxg, catalog["third"].createtxg)
+        self.assertIs(catalog["second"].open(), catalog["second"].open())
+
+        self._zone.snapshots["third"].destroy()
+        self.assertEqual(["initial", "second"], self._zone.snapshots.catalog.names)
+
+    def test_compiled_configuration(self):
+        compiled = self._zone.configuration.compiled
+
+        self._zone.restart()
+        self._zone.snapshots.create("second")
+
+        self.assertIs(compiled, self._zone.configuration.compiled)
+        self.assertIsNot(compiled, compiled.transaction())
+        self.assertIn("name", compiled.configuration)
+
+        self._zone.configuration.local["autostart"] = True
+        self.assertIsNot(compiled, self._zone.configuration.compiled)
+
+    def test_reset_policy_snapshots(self):
+        manager = self._namespace.snapshot_manager
+        manager.policies.set(str(self._zone.uuid), hourly=2)
+        result = manager.tick()
+
+        self.assertEqual([result.name], manager.names(str(self._zone.uuid)))
+
+        self._zone.reset(force=True)
+
+        self.assertNotIn(result.name, self._zone.snapshots)
+        self.assertEqual([], manager.names(str(self._zone.uuid)))
+        self.assertNotIn(result.name, manager.snapshots)
+
+    def test_reset_unknown(self):
+        with self.assertRaises(zonys.core.zone.NotFoundError):
+            self._zone.reset("unknown")
+
+
 if __name__ == "main":  # pragma: no cover
     unittest.main()
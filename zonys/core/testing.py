@@ -0,0 +1,113 @@
+import contextlib
+import importlib
+import pathlib
+import tempfile
+import typing
+import uuid
+
+import zonys
+import zonys.core
+import zonys.core.freebsd
+import zonys.core.freebsd.fake
+import zonys.core.zfs
+import zonys.core.zfs.fake
+
+
+def is_native() -> bool:
+    try:
+        return importlib.import_module("libzfs") is not zonys.core.zfs.fake
+    except ImportError:
+        return False
+
+
+if not is_native():
+    zonys.core.zfs.fake.install()
+
+# Imported once the fake backend is installed so that libzfs resolves to it.
+import zonys.core.namespace
+import zonys.core.zfs.file_system
+
+
+class Environment:
+    def __init__(
+        self,
+        root: pathlib.Path,
+        pool: str,
+        commands: typing.Optional["zonys.core.freebsd.fake.Commands"],
+    ):
+        self.__root = root
+        self.__pool = pool
+        self.__commands = commands
+
+    @property
+    def root(self) -> pathlib.Path:
+        return self.__root
+
+    @property
+    def pool(self) -> str:
+        return self.__pool
+
+    @property
+    def commands(self) -> typing.Optional["zonys.core.freebsd.fake.Commands"]:
+        return self.__commands
+
+    def is_fake(self) -> bool:
+        return self.__commands is not None
+
+
+@contextlib.contextmanager
+def environment(
+    pool: str = "zroot",
+    fake: typing.Optional[bool] = None,
+    latency: typing.Optional[typing.Mapping[str, float]] = None,
+) -> typing.Iterator["Environment"]:
+    if fake is None:
+        fake = not is_native()
+
+    if not fake:
+        yield Environment(pathlib.Path("/"), pool, None)
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        root = pathlib.Path(directory)
+
+        zonys.core.zfs.fake.reset()
+        zonys.core.zfs.fake.install()
+        zonys.core.zfs.fake.configure(latency=latency or {}, default_latency=0.0)
+        zonys.core.zfs.fake.create_pool(pool, root.joinpath("pool"))
+
+        with zonys.core.freebsd.fake.commands(root.joinpath("bin")) as commands:
+            yield Environment(root, pool, commands)
+
+        zonys.core.zfs.fake.reset()
+
+
+@contextlib.contextmanager
+def file_system(
+    environment: "Environment",
+) -> typing.Iterator["zonys.core.zfs.file_system.Handle"]:
+    handle = zonys.core.zfs.file_system.Identifier(
+        [
+            environment.pool,
+            "zonys",
+            "test",
+            str(uuid.uuid4()),
+        ]
+    ).use()
+
+    yield handle
+
+    handle.destroy()
+
+
+@contextlib.contextmanager
+def namespace(
+    environment: "Environment",
+) -> typing.Iterator["zonys.core.namespace.Handle"]:
+    with file_system(environment) as handle:
+        result = zonys.core.namespace.Handle(handle)
+
+        yield result
+
+        for zone in list(result.zone_manager.zones):
+            zone.undeploy()
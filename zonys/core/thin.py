@@ -0,0 +1,279 @@
+import datetime
+import os
+import pathlib
+import shutil
+import typing
+
+import zonys
+import zonys.core
+import zonys.core.freebsd
+import zonys.core.freebsd.mount
+import zonys.core.freebsd.mount.nullfs
+import zonys.core.transfer
+import zonys.core.zfs
+import zonys.core.zfs.file_system
+
+MOUNTPOINT = pathlib.Path(".base")
+
+SHARED = [
+    "bin",
+    "boot",
+    "lib",
+    "libexec",
+    "rescue",
+    "sbin",
+]
+
+SHARED_PARENT = "usr"
+
+PRIVATE = [
+    "local",
+]
+
+UPDATE_PREFIX = "update-"
+
+SNAPSHOT_DIRECTORY = ".zfs"
+
+
+class Error(RuntimeError):
+    pass
+
+
+class NotFoundError(Error):
+    pass
+
+
+class AlreadyExistsError(Error):
+    pass
+
+
+class InUseError(Error):
+    pass
+
+
+class NoUpdateError(Error):
+    pass
+
+
+def _prune(source: pathlib.Path, destination: pathlib.Path) -> int:
+    result = 0
+
+    for root, directories, files in os.walk(destination, topdown=True):
+        relative = pathlib.Path(root).relative_to(destination)
+
+        if relative == pathlib.Path() and SNAPSHOT_DIRECTORY in directories:
+            directories.remove(SNAPSHOT_DIRECTORY)
+
+        for name in list(directories):
+            if not os.path.lexists(source.joinpath(relative, name)):
+                shutil.rmtree(pathlib.Path(root, name))
+                directories.remove(name)
+                result = result + 1
+
+        for name in files:
+            if not os.path.lexists(source.joinpath(relative, name)):
+                pathlib.Path(root, name).unlink()
+                result = result + 1
+
+    return result
+
+
+class Manager:
+    def __init__(self, _namespace: "zonys.core.namespace.Handle"):
+        self.__namespace = _namespace
+        self.__file_system = None
+
+    @property
+    def namespace(self) -> "zonys.core.namespace.Handle":
+        return self.__namespace
+
+    @property
+    def file_system(self) -> "zonys.core.zfs.file_system.Handle":
+        if self.__file_system is None:
+            children = self.__namespace.file_system.children
+
+            if "thin" not in children:
+                self.__file_system = children.create("thin")
+            else:
+                self.__file_system = children.open("thin")
+
+        return self.__file_system
+
+    @property
+    def bases(self) -> typing.List["Base"]:
+        return list(
+            map(
+                lambda x: Base(self, x),
+                sorted(
+                    self.file_system.children,
+                    key=lambda x: x.identifier.last,
+                ),
+            )
+        )
+
+    def __contains__(self, name: str) -> bool:
+        return self.file_system.identifier.child(name).exists()
+
+    def __getitem__(self, name: str) -> "Base":
+        if name not in self:
+            raise NotFoundError(name)
+
+        return Base(self, self.file_system.identifier.child(name).open())
+
+    def create(
+        self,
+        name: str,
+        source: typing.Union[str, pathlib.Path],
+    ) -> "Base":
+        with self.__namespace.lock_manager.lock("thin").acquire():
+            if name in self:
+                raise AlreadyExistsError(name)
+
+            file_system = self.file_system.children.create(name)
+
+            try:
+                zonys.core.transfer.copy(source, file_system.path)
+            except:
+                file_system.destroy()
+                raise
+
+            return Base(self, file_system)
+
+
+class Base:
+    def __init__(
+        self,
+        manager: "Manager",
+        file_system: "zonys.core.zfs.file_system.Handle",
+    ):
+        self.__manager = manager
+        self.__file_system = file_system
+
+    @property
+    def manager(self) -> "Manager":
+        return self.__manager
+
+    @property
+    def file_system(self) -> "zonys.core.zfs.file_system.Handle":
+        return self.__file_system
+
+    @property
+    def name(self) -> str:
+        return self.__file_system.identifier.last
+
+    @property
+    def path(self) -> pathlib.Path:
+        return self.__file_system.path
+
+    @property
+    def zones(self) -> typing.List["zonys.core.zone._Handle"]:
+        return list(
+            filter(
+                lambda x: x.thin_name == self.name,
+                self.__manager.namespace.zone_manager.zones,
+            )
+        )
+
+    @property
+    def updates(self) -> typing.List["zonys.core.zfs.snapshot.Handle"]:
+        return list(
+            filter(
+                lambda x: x.identifier.name.startswith(UPDATE_PREFIX),
+                self.__file_system.snapshots,
+            )
+        )
+
+    def mountpoint(
+        self,
+        root: pathlib.Path,
+    ) -> "zonys.core.freebsd.mount.nullfs.Mountpoint":
+        return zonys.core.freebsd.mount.nullfs.Mountpoint(
+            self.path,
+            root.joinpath(MOUNTPOINT),
+            True,
+        )
+
+    def link(self, root: pathlib.Path):
+        root.joinpath(MOUNTPOINT).mkdir(parents=True, exist_ok=True)
+
+        for entry in sorted(self.path.iterdir()):
+            target = root.joinpath(entry.name)
+
+            if entry.name == SNAPSHOT_DIRECTORY:
+                continue
+
+            if entry.name in SHARED:
+                target.symlink_to(MOUNTPOINT.joinpath(entry.name))
+            elif entry.name == SHARED_PARENT and entry.is_dir():
+                target.mkdir(exist_ok=True)
+
+                for child in sorted(entry.iterdir()):
+                    if child.name in PRIVATE:
+                        zonys.core.transfer.copy(child, target.joinpath(child.name))
+                    else:
+                        target.joinpath(child.name).symlink_to(
+                            pathlib.Path("..").joinpath(
+                                MOUNTPOINT,
+                                SHARED_PARENT,
+                                child.name,
+                            )
+                        )
+            else:
+                zonys.core.transfer.copy(entry, target)
+
+    def mount(self, root: pathlib.Path):
+        mountpoint = self.mountpoint(root)
+
+        if not mountpoint.exists():
+            mountpoint.mount()
+
+    def unmount(self, root: pathlib.Path):
+        mountpoint = self.mountpoint(root)
+
+        if mountpoint.exists():
+            mountpoint.open().unmount()
+
+    def update(
+        self,
+        source: typing.Union[str, pathlib.Path],
+    ) -> "zonys.core.transfer.Result":
+        source = pathlib.Path(source)
+
+        with self.__manager.namespace.lock_manager.lock("thin").acquire():
+            snapshot = self.__file_system.snapshots.create(
+                "{}{}".format(
+                    UPDATE_PREFIX,
+                    datetime.datetime.now().strftime("%Y%m%d%H%M%S%f"),
+                )
+            )
+
+            try:
+                result = zonys.core.transfer.copy(
+                    source,
+                    self.path,
+                    incremental=zonys.core.transfer.MTIME,
+                )
+                _prune(source, self.path)
+            except:
+                snapshot.rollback()
+                self.__file_system.snapshots.destroy(snapshot.identifier.name)
+
+                raise
+
+            return result
+
+    def rollback(self):
+        with self.__manager.namespace.lock_manager.lock("thin").acquire():
+            updates = self.updates
+            if len(updates) == 0:
+                raise NoUpdateError(self.name)
+
+            updates[-1].rollback()
+            self.__file_system.snapshots.destroy(updates[-1].identifier.name)
+
+    def destroy(self):
+        with self.__manager.namespace.lock_manager.lock("thin").acquire():
+            if len(self.zones) > 0:
+                raise InUseError(self.name)
+
+            self.__file_system.destroy()
@@ -0,0 +1,385 @@
+import concurrent.futures
+import errno
+import hashlib
+import os
+import pathlib
+import queue
+import shutil
+import stat
+import tempfile
+import threading
+import typing
+
+MTIME = "mtime"
+
+HASH = "hash"
+
+MODES = [MTIME, HASH]
+
+WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+CHUNK_SIZE = 1 << 30
+
+BUFFER_SIZE = 1 << 20
+
+BATCH_SIZE = 64
+
+_UNSUPPORTED = {
+    errno.EBADF,
+    errno.EINVAL,
+    errno.ENOSYS,
+    errno.EOPNOTSUPP,
+    errno.EXDEV,
+}
+
+
+class Error(RuntimeError):
+    pass
+
+
+class InvalidModeError(Error):
+    pass
+
+
+class Result:
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__copied = 0
+        self.__skipped = 0
+        self.__bytes = 0
+
+    @property
+    def copied(self) -> int:
+        return self.__copied
+
+    @property
+    def skipped(self) -> int:
+        return self.__skipped
+
+    @property
+    def bytes(self) -> int:
+        return self.__bytes
+
+    def add(self, size: typing.Optional[int]):
+        with self.__lock:
+            if size is None:
+                self.__skipped = self.__skipped + 1
+            else:
+                self.__copied = self.__copied + 1
+                self.__bytes = self.__bytes + size
+
+
+def _copy_range(source: int, destination: int, size: int) -> bool:
+    if not hasattr(os, "copy_file_range"):
+        return False
+
+    remaining = size
+
+    while remaining > 0:
+        try:
+            count = os.copy_file_range(
+                source,
+                destination,
+                min(remaining, CHUNK_SIZE),
+            )
+        except OSError as error:
+            if error.errno in _UNSUPPORTED and remaining == size:
+                return False
+
+            raise
+
+        if count == 0:
+            break
+
+        remaining = remaining - count
+
+    return True
+
+
+def _digest(path: pathlib.Path) -> str:
+    digest = hashlib.sha256()
+
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(BUFFER_SIZE), b""):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def _is_unchanged(
+    source: pathlib.Path,
+    source_stat: os.stat_result,
+    destination: pathlib.Path,
+    incremental: typing.Optional[str],
+) -> bool:
+    if incremental is None:
+        return False
+
+    try:
+        destination_stat = destination.lstat()
+    except FileNotFoundError:
+        return False
+
+    if not stat.S_ISREG(destination_stat.st_mode):
+        return False
+
+    if destination_stat.st_size != source_stat.st_size:
+        return False
+
+    if incremental == MTIME:
+        return destination_stat.st_mtime_ns == source_stat.st_mtime_ns
+
+    return _digest(source) == _digest(destination)
+
+
+def _copy_metadata(
+    source: pathlib.Path,
+    destination: pathlib.Path,
+    source_stat: typing.Optional[os.stat_result] = None,
+    flags: bool = True,
+):
+    if source_stat is None:
+        source_stat = source.lstat()
+
+    link = stat.S_ISLNK(source_stat.st_mode)
+
+    if os.geteuid() == 0:
+        os.lchown(destination, source_stat.st_uid, source_stat.st_gid)
+
+    if not link or os.chmod in os.supports_follow_symlinks:
+        os.chmod(
+            destination,
+            stat.S_IMODE(source_stat.st_mode),
+            follow_symlinks=False,
+        )
+
+    if not link or os.utime in os.supports_follow_symlinks:
+        os.utime(
+            destination,
+            ns=(source_stat.st_atime_ns, source_stat.st_mtime_ns),
+            follow_symlinks=False,
+        )
+
+    if flags:
+        _copy_flags(destination, source_stat)
+
+
+def _copy_flags(destination: pathlib.Path, source_stat: os.stat_result):
+    if getattr(source_stat, "st_flags", 0) != 0 and hasattr(os, "chflags"):
+        os.chflags(destination, source_stat.st_flags, follow_symlinks=False)
+
+
+def copy_file(source: pathlib.Path, destination: pathlib.Path) -> int:
+    with source.open("rb") as reader, destination.open("wb") as writer:
+        size = os.fstat(reader.fileno()).st_size
+
+        if not _copy_range(reader.fileno(), writer.fileno(), size):
+            shutil.copyfileobj(reader, writer, BUFFER_SIZE)
+
+    return size
+
+
+def _temporary(destination: pathlib.Path) -> pathlib.Path:
+    descriptor, name = tempfile.mkstemp(
+        prefix=".{}.".format(destination.name),
+        dir=destination.parent,
+    )
+    os.close(descriptor)
+
+    return pathlib.Path(name)
+
+
+def _replace(
+    destination: pathlib.Path,
+    source_stat: os.stat_result,
+    write: typing.Callable[[pathlib.Path], None],
+):
+    if not os.path.lexists(destination):
+        write(destination)
+        _copy_flags(destination, source_stat)
+        return
+
+    temporary = _temporary(destination)
+
+    try:
+        write(temporary)
+
+        if getattr(destination.lstat(), "st_flags", 0) != 0:
+            os.chflags(destination, 0, follow_symlinks=False)
+
+        os.replace(temporary, destination)
+    except:
+        if os.path.lexists(temporary):
+            temporary.unlink()
+
+        raise
+
+    _copy_flags(destination, source_stat)
+
+
+def _remove(path: pathlib.Path):
+    if path.is_dir() and not path.is_symlink():
+        shutil.rmtree(path)
+    elif path.is_symlink() or path.exists():
+        path.unlink()
+
+
+def _copy_entry(
+    source: pathlib.Path,
+    destination: pathlib.Path,
+    incremental: typing.Optional[str],
+) -> typing.Optional[int]:
+    source_stat = source.lstat()
+
+    if stat.S_ISLNK(source_stat.st_mode):
+        target = os.readlink(source)
+
+        if destination.is_symlink() and os.readlink(destination) == target:
+            return None
+
+        if destination.is_dir() and not destination.is_symlink():
+            _remove(destination)
+
+        def link(path: pathlib.Path):
+            if os.path.lexists(path):
+                path.unlink()
+
+            os.symlink(target, path)
+            _copy_metadata(source, path, source_stat, False)
+
+        _replace(destination, source_stat, link)
+
+        return 0
+
+    if not stat.S_ISREG(source_stat.st_mode):
+        return None
+
+    if _is_unchanged(source, source_stat, destination, incremental):
+        return None
+
+    if destination.is_dir() and not destination.is_symlink():
+        _remove(destination)
+
+    def write(path: pathlib.Path):
+        copy_file(source, path)
+        _copy_metadata(source, path, source_stat, False)
+
+    _replace(destination, source_stat, write)
+
+    return source_stat.st_size
+
+
+def _scan(
+    source: pathlib.Path,
+) -> typing.Tuple[typing.List[str], typing.List[str]]:
+    directories = []
+    files = []
+
+    with os.scandir(source) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                directories.append(entry.name)
+            else:
+                files.append(entry.name)
+
+    return (directories, files)
+
+
+def fingerprint(source: typing.Union[str, pathlib.Path]) -> str:
+    source = pathlib.Path(source)
+    digest = hashlib.sha256()
+
+    for root, directories, files in os.walk(source):
+        directories.sort()
+
+        for name in sorted(files):
+            path = pathlib.Path(root, name)
+            value = path.lstat()
+
+            digest.update(
+                "{}\0{}\0{}\0{}\n".format(
+                    str(path.relative_to(source)),
+                    value.st_mode,
+                    value.st_size,
+                    value.st_mtime_ns,
+                ).encode()
+            )
+
+    if not source.is_dir():
+        value = source.stat()
+        digest.update("{}\0{}".format(value.st_size, value.st_mtime_ns).encode())
+
+    return digest.hexdigest()
+
+
+def copy(
+    source: typing.Union[str, pathlib.Path],
+    destination: typing.Union[str, pathlib.Path],
+    incremental: typing.Optional[str] = None,
+    workers: int = WORKERS,
+) -> "Result":
+    source = pathlib.Path(source)
+    destination = pathlib.Path(destination)
+    result = Result()
+
+    if incremental is not None and incremental not in MODES:
+        raise InvalidModeError(incremental)
+
+    if not source.is_dir():
+        result.add(_copy_entry(source, destination, incremental))
+        return result
+
+    directories = []
+
+    def copy_entries(relative: pathlib.Path, names: typing.List[str]):
+        for name in names:
+            result.add(
+                _copy_entry(
+                    source.joinpath(relative, name),
+                    destination.joinpath(relative, name),
+                    incremental,
+                )
+            )
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        scanned: "queue.Queue[typing.Tuple[pathlib.Path, typing.Any]]" = queue.Queue()
+        copies = []
+
+        def walk(relative: pathlib.Path):
+            path = destination.joinpath(relative)
+            if path.is_symlink() or (path.exists() and not path.is_dir()):
+                path.unlink()
+
+            path.mkdir(parents=True, exist_ok=True)
+            directories.append(relative)
+            executor.submit(_scan, source.joinpath(relative)).add_done_callback(
+                lambda x: scanned.put((relative, x))
+            )
+
+        walk(pathlib.Path())
+        pending = 1
+
+        while pending > 0:
+            relative, future = scanned.get()
+            children, files = future.result()
+            pending = pending - 1 + len(children)
+
+            for name in children:
+                walk(relative.joinpath(name))
+
+            for index in range(0, len(files), BATCH_SIZE):
+                copies.append(
+                    executor.submit(
+                        copy_entries,
+                        relative,
+                        files[index : index + BATCH_SIZE],
+                    )
+                )
+
+        for future in copies:
+            future.result()
+
+    for relative in reversed(directories):
+        _copy_metadata(source.joinpath(relative), destination.joinpath(relative))
+
+    return result
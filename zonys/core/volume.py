@@ -1,7 +1,50 @@
+import pathlib
 import typing
 
 import zonys
 import zonys.core
+import zonys.core.profile
+import zonys.core.zfs
+import zonys.core.zfs.file_system
+
+PROPERTIES = [
+    "recordsize",
+    "compression",
+    "logbias",
+    "primarycache",
+    "quota",
+]
+
+
+class Error(RuntimeError):
+    pass
+
+
+class NotFoundError(Error):
+    pass
+
+
+class AlreadyExistsError(Error):
+    pass
+
+
+class InUseError(Error):
+    pass
+
+
+class InvalidPropertyError(Error):
+    def __init__(self, name: str):
+        super().__init__(
+            "Property {} is not one of {}".format(name, ", ".join(PROPERTIES))
+        )
+
+
+def _validate(properties: typing.Mapping[str, typing.Any]) -> typing.Dict[str, str]:
+    for name in properties:
+        if name not in PROPERTIES:
+            raise InvalidPropertyError(name)
+
+    return zonys.core.profile.validate(properties)
 
 
 class Manager:
@@ -21,6 +64,10 @@ class Manager:
     def namespace(self) -> "zonys.core.namespace.Handle":
         return self.__namespace
 
+    @property
+    def file_system(self) -> "zonys.core.zfs.file_system.Handle":
+        return self.__file_system
+
     @property
     def volumes(self) -> "_Volumes":
         return self.__volumes
@@ -36,7 +83,108 @@ class _Volumes:
         self.__file_system = file_system
 
     def __iter__(self) -> typing.Iterator["_Handle"]:
-        return iter([])
+        return iter(
+            map(
+                lambda x: _Handle(self.__manager, x.identifier),
+                sorted(
+                    self.__file_system.children,
+                    key=lambda x: x.identifier.last,
+                ),
+            )
+        )
+
+    def __len__(self) -> int:
+        return len(list(self.__file_system.children))
 
     def __contains__(self, key: str) -> bool:
-        return False
+        return self.__file_system.identifier.child(key).exists()
+
+    def __getitem__(self, key: str) -> "_Handle":
+        if key not in self:
+            raise NotFoundError(key)
+
+        return _Handle(self.__manager, self.__file_system.identifier.child(key))
+
+    def create(self, name: str, **kwargs) -> "_Handle":
+        properties = _validate(kwargs)
+
+        with self.__manager.namespace.lock_manager.lock("volume").acquire():
+            if name in self:
+                raise AlreadyExistsError(name)
+
+            identifier = self.__file_system.identifier.child(name)
+            identifier.create(properties=properties)
+
+            return _Handle(self.__manager, identifier)
+
+
+class _Handle:
+    def __init__(
+        self,
+        manager: "Manager",
+        identifier: "zonys.core.zfs.file_system.Identifier",
+    ):
+        self.__manager = manager
+        self.__identifier = identifier
+
+    @property
+    def manager(self) -> "Manager":
+        return self.__manager
+
+    @property
+    def identifier(self) -> "zonys.core.zfs.file_system.Identifier":
+        return self.__identifier
+
+    @property
+    def name(self) -> str:
+        return self.__identifier.last
+
+    @property
+    def file_system(self) -> "zonys.core.zfs.file_system.Handle":
+        return self.__identifier.open()
+
+    @property
+    def path(self) -> pathlib.Path:
+        return self.__identifier.path
+
+    @property
+    def properties(self) -> typing.Dict[str, str]:
+        properties = self.file_system.properties
+
+        return {
+            name: str(properties[name].value)
+            for name in PROPERTIES
+            if name in properties
+        }
+
+    @property
+    def snapshots(self) -> typing.List["zonys.core.zfs.snapshot.Handle"]:
+        return list(self.file_system.snapshots)
+
+    @property
+    def zones(self) -> typing.List["zonys.core.zone._Handle"]:
+        def uses(zone: "zonys.core.zone._Handle") -> bool:
+            return any(
+                isinstance(x, dict)
+                and isinstance(x.get("volume", None), dict)
+                and x["volume"].get("name", None) == self.name
+                for x in zone.configuration.merged.get("mount", [])
+            )
+
+        return list(filter(uses, self.__manager.namespace.zone_manager.zones))
+
+    def configure(self, **kwargs):
+        properties = self.file_system.properties
+
+        for name, value in _validate(kwargs).items():
+            properties[name].value = value
+
+    def snapshot(self, name: str) -> "zonys.core.zfs.snapshot.Handle":
+        return self.file_system.snapshots.create(name)
+
+    def destroy(self):
+        with self.__manager.namespace.lock_manager.lock("volume").acquire():
+            if len(self.zones) > 0:
+                raise InUseError(self.name)
+
+            self.file_system.destroy()
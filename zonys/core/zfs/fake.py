@@ -0,0 +1,1467 @@
+import enum
+import io
+import json
+import os
+import pathlib
+import shutil
+import struct
+import sys
+import tarfile
+import threading
+import time
+import typing
+import uuid
+
+_STREAM_MAGIC = b"ZONYSFAKEZFS1\n"
+
+_INHERITABLE_PROPERTIES = {
+    "atime",
+    "checksum",
+    "compression",
+    "copies",
+    "dedup",
+    "exec",
+    "logbias",
+    "primarycache",
+    "readonly",
+    "recordsize",
+    "secondarycache",
+    "setuid",
+    "snapdir",
+    "sync",
+}
+
+_DEFAULT_PROPERTIES = {
+    "atime": "on",
+    "canmount": "on",
+    "checksum": "on",
+    "compression": "on",
+    "copies": "1",
+    "dedup": "off",
+    "exec": "on",
+    "jailed": "off",
+    "logbias": "latency",
+    "primarycache": "all",
+    "quota": "none",
+    "readonly": "off",
+    "recordsize": "128K",
+    "refquota": "none",
+    "refreservation": "none",
+    "reservation": "none",
+    "secondarycache": "all",
+    "setuid": "on",
+    "snapdir": "hidden",
+    "sync": "standard",
+}
+
+_ALLOWED_VALUES = {
+    "atime": "on | off",
+    "canmount": "on | off | noauto",
+    "checksum": "on | off | fletcher2 | fletcher4 | sha256 | sha512 | skein | edonr",
+    "compression": "on | off | lzjb | gzip | gzip-[1-9] | zle | lz4 | zstd | zstd-[1-19]",
+    "dedup": "on | off | verify | sha256[,verify] | sha512[,verify]",
+    "exec": "on | off",
+    "jailed": "on | off",
+    "logbias": "latency | throughput",
+    "primarycache": "all | none | metadata",
+    "readonly": "on | off",
+    "secondarycache": "all | none | metadata",
+    "setuid": "on | off",
+    "snapdir": "hidden | visible",
+    "sync": "standard | always | disabled",
+}
+
+
+class Error(enum.IntEnum):
+    SUCCESS = 0
+    NOMEM = 2000
+    BADPROP = 2001
+    PROPREADONLY = 2002
+    PROPTYPE = 2003
+    PROPNONINHERIT = 2004
+    PROPSPACE = 2005
+    BADTYPE = 2006
+    BUSY = 2007
+    EXISTS = 2008
+    NOENT = 2009
+    BADSTREAM = 2010
+    DSREADONLY = 2011
+    VOLTOOBIG = 2012
+    INVALIDNAME = 2013
+    BADRESTORE = 2014
+    BADBACKUP = 2015
+    BADTARGET = 2016
+    NODEVICE = 2017
+    BADDEV = 2018
+    NOREPLICAS = 2019
+    RESILVERING = 2020
+    BADVERSION = 2021
+    POOLUNAVAIL = 2022
+    DEVOVERFLOW = 2023
+    BADPATH = 2024
+    CROSSTARGET = 2025
+    ZONED = 2026
+    MOUNTFAILED = 2027
+    UMOUNTFAILED = 2028
+    NOTSUP = 2056
+
+
+class ZFSException(RuntimeError):
+    def __init__(self, code: Error, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+class DatasetType(enum.IntEnum):
+    FILESYSTEM = 1
+    SNAPSHOT = 2
+    VOLUME = 4
+    POOL = 8
+    BOOKMARK = 16
+
+
+class SendFlag(enum.Enum):
+    VERBOSE = 0
+    REPLICATE = 1
+    DOALL = 2
+    FROMORIGIN = 3
+    DEDUP = 4
+    PROPS = 5
+    DRYRUN = 6
+    PARSABLE = 7
+    PROGRESS = 8
+    LARGEBLOCK = 9
+    EMBED_DATA = 10
+    COMPRESS = 11
+    RAW = 12
+    BACKUP = 13
+    HOLDS = 14
+
+
+class PropertySource(enum.IntEnum):
+    NONE = 1
+    DEFAULT = 2
+    TEMPORARY = 4
+    LOCAL = 8
+    INHERITED = 16
+    RECEIVED = 32
+
+
+class _Pool:
+    def __init__(self, name: str, altroot: pathlib.Path):
+        self.name = name
+        self.altroot = altroot
+
+
+class _Dataset:
+    def __init__(self, name: str, kind: DatasetType, properties: typing.Dict[str, str]):
+        self.name = name
+        self.kind = kind
+        self.properties = dict(properties)
+        self.snapshots: typing.Dict[str, "_Snapshot"] = {}
+        self.mounted = False
+        self.origin: typing.Optional[str] = None
+        self.guid = _guid()
+        self.createtxg = _STATE.next_txg()
+        self.creation = int(time.time())
+
+    @property
+    def pool(self) -> str:
+        return self.name.split("/")[0]
+
+    @property
+    def parent(self) -> typing.Optional[str]:
+        if "/" not in self.name:
+            return None
+
+        return self.name.rsplit("/", 1)[0]
+
+
+class _Snapshot:
+    def __init__(self, dataset: "_Dataset", name: str, properties=None, guid=None):
+        self.dataset = dataset
+        self.name = name
+        self.properties = dict(properties or {})
+        self.guid = guid if guid is not None else _guid()
+        self.createtxg = _STATE.next_txg()
+        self.creation = int(time.time())
+        self.holds: typing.Set[str] = set()
+        self.deferred = False
+
+    @property
+    def full_name(self) -> str:
+        return "{}@{}".format(self.dataset.name, self.name)
+
+
+class _State:
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.pools: typing.Dict[str, _Pool] = {}
+        self.datasets: typing.Dict[str, _Dataset] = {}
+        self.txg = 0
+        self.latency: typing.Dict[str, float] = {}
+        self.default_latency = 0.0
+        self.calls: typing.Dict[str, int] = {}
+
+    def next_txg(self) -> int:
+        with self.lock:
+            self.txg += 1
+            return self.txg
+
+
+_STATE = _State()
+
+
+def _guid() -> int:
+    return uuid.uuid4().int >> 64
+
+
+def _delay(operation: str):
+    with _STATE.lock:
+        _STATE.calls[operation] = _STATE.calls.get(operation, 0) + 1
+        latency = _STATE.latency.get(operation, _STATE.default_latency)
+
+    if latency > 0:
+        time.sleep(latency)
+
+
+def configure(
+    latency: typing.Optional[typing.Mapping[str, float]] = None,
+    default_latency: typing.Optional[float] = None,
+):
+    with _STATE.lock:
+        if latency is not None:
+            _STATE.latency = dict(latency)
+
+        if default_latency is not None:
+            _STATE.default_latency = default_latency
+
+
+def calls() -> typing.Dict[str, int]:
+    with _STATE.lock:
+        return dict(_STATE.calls)
+
+
+def reset():
+    global _STATE
+
+    _STATE = _State()
+
+
+def install():
+    module = sys.modules[__name__]
+    sys.modules["libzfs"] = module
+
+    for name, imported in list(sys.modules.items()):
+        if name.startswith("zonys.") and getattr(imported, "libzfs", None) is not None:
+            setattr(imported, "libzfs", module)
+
+
+def create_pool(name: str, altroot: typing.Union[str, pathlib.Path]) -> "ZFSPool":
+    with _STATE.lock:
+        if name in _STATE.pools:
+            raise ZFSException(Error.EXISTS, "pool {} already exists".format(name))
+
+        pool = _Pool(name, pathlib.Path(altroot))
+        _STATE.pools[name] = pool
+
+        dataset = _Dataset(name, DatasetType.FILESYSTEM, {})
+        dataset.mounted = True
+        _STATE.datasets[name] = dataset
+        _path(name).mkdir(parents=True, exist_ok=True)
+
+        return ZFSPool(name)
+
+
+def _path(name: str) -> pathlib.Path:
+    segments = name.split("/")
+    return _STATE.pools[segments[0]].altroot.joinpath(*segments)
+
+
+def _snapshot_path(dataset: str, name: str) -> pathlib.Path:
+    return _path(dataset).joinpath(".zfs", "snapshot", name)
+
+
+def _split(name: str) -> typing.Tuple[str, typing.Optional[str]]:
+    if "@" in name:
+        dataset, snapshot = name.split("@", 1)
+        return (dataset, snapshot)
+
+    return (name, None)
+
+
+def _lookup_dataset(name: str) -> "_Dataset":
+    dataset = _STATE.datasets.get(name)
+    if dataset is None:
+        raise ZFSException(Error.NOENT, "dataset does not exist: {}".format(name))
+
+    return dataset
+
+
+def _lookup_snapshot(name: str) -> "_Snapshot":
+    dataset_name, snapshot_name = _split(name)
+    if snapshot_name is None:
+        raise ZFSException(Error.INVALIDNAME, "invalid snapshot name: {}".format(name))
+
+    snapshot = _lookup_dataset(dataset_name).snapshots.get(snapshot_name)
+    if snapshot is None:
+        raise ZFSException(Error.NOENT, "snapshot does not exist: {}".format(name))
+
+    return snapshot
+
+
+def _children(name: str, recursive: bool = False) -> typing.List["_Dataset"]:
+    prefix = "{}/".format(name)
+    result = []
+
+    for key, value in sorted(_STATE.datasets.items()):
+        if not key.startswith(prefix):
+            continue
+
+        if recursive or "/" not in key[len(prefix) :]:
+            result.append(value)
+
+    return result
+
+
+def _dependents(dataset: "_Dataset") -> typing.List["_Dataset"]:
+    prefixes = {snapshot.full_name for snapshot in dataset.snapshots.values()}
+    return [x for x in _STATE.datasets.values() if x.origin in prefixes]
+
+
+def _own_entries(name: str) -> typing.Set[str]:
+    excluded = {".zfs"}
+
+    for child in _children(name):
+        excluded.add(child.name.rsplit("/", 1)[1])
+
+    return excluded
+
+
+def _copy_contents(
+    source: pathlib.Path,
+    destination: pathlib.Path,
+    excluded: typing.Set[str] = frozenset(),
+):
+    destination.mkdir(parents=True, exist_ok=True)
+
+    if not source.exists():
+        return
+
+    for entry in os.scandir(source):
+        if entry.name in excluded:
+            continue
+
+        target = destination.joinpath(entry.name)
+
+        if entry.is_symlink():
+            os.symlink(os.readlink(entry.path), target)
+        elif entry.is_dir():
+            shutil.copytree(entry.path, target, symlinks=True)
+        else:
+            shutil.copy2(entry.path, target)
+
+
+def _clear_contents(path: pathlib.Path, excluded: typing.Set[str] = frozenset()):
+    if not path.exists():
+        return
+
+    for entry in os.scandir(path):
+        if entry.name in excluded:
+            continue
+
+        if entry.is_dir() and not entry.is_symlink():
+            shutil.rmtree(entry.path)
+        else:
+            os.unlink(entry.path)
+
+
+def _size(path: pathlib.Path, excluded: typing.Set[str] = frozenset()) -> int:
+    if not path.exists():
+        return 0
+
+    result = 0
+
+    for entry in os.scandir(path):
+        if entry.name in excluded:
+            continue
+
+        if entry.is_symlink():
+            continue
+
+        if entry.is_dir():
+            result += _size(pathlib.Path(entry.path))
+        else:
+            result += entry.stat().st_size
+
+    return result
+
+
+def _humanize(value: int) -> str:
+    for unit in ["B", "K", "M", "G", "T"]:
+        if value < 1024 or unit == "T":
+            if unit == "B":
+                return "{}{}".format(value, unit)
+
+            return "{:.3g}{}".format(value, unit)
+
+        value = value / 1024
+
+    return str(value)
+
+
+def _resolve_property(
+    dataset: "_Dataset", name: str
+) -> typing.Tuple[str, PropertySource]:
+    if name in dataset.properties:
+        return (dataset.properties[name], PropertySource.LOCAL)
+
+    if name in _INHERITABLE_PROPERTIES or ":" in name:
+        parent = dataset.parent
+        while parent is not None:
+            ancestor = _STATE.datasets.get(parent)
+            if ancestor is None:
+                break
+
+            if name in ancestor.properties:
+                return (ancestor.properties[name], PropertySource.INHERITED)
+
+            parent = ancestor.parent
+
+    if name in _DEFAULT_PROPERTIES:
+        return (_DEFAULT_PROPERTIES[name], PropertySource.DEFAULT)
+
+    return ("-", PropertySource.NONE)
+
+
+def _dataset_properties(dataset: "_Dataset") -> typing.Dict[str, "ZFSProperty"]:
+    path = _path(dataset.name)
+    excluded = _own_entries(dataset.name)
+    used = lambda: str(_size(path))
+    referenced = lambda: str(_size(path, excluded))
+
+    values = {
+        "type": ("filesystem", PropertySource.NONE),
+        "creation": (str(dataset.creation), PropertySource.NONE),
+        "createtxg": (str(dataset.createtxg), PropertySource.NONE),
+        "guid": (str(dataset.guid), PropertySource.NONE),
+        "used": (used, PropertySource.NONE),
+        "referenced": (referenced, PropertySource.NONE),
+        "mounted": ("yes" if dataset.mounted else "no", PropertySource.NONE),
+        "mountpoint": ("/{}".format(dataset.name), PropertySource.DEFAULT),
+        "origin": (dataset.origin or "-", PropertySource.NONE),
+    }
+
+    for name in set(_DEFAULT_PROPERTIES).union(dataset.properties):
+        values[name] = _resolve_property(dataset, name)
+
+    return {
+        key: ZFSProperty(dataset.name, key, value, source)
+        for (key, (value, source)) in values.items()
+    }
+
+
+def _snapshot_properties(snapshot: "_Snapshot") -> typing.Dict[str, "ZFSProperty"]:
+    path = _snapshot_path(snapshot.dataset.name, snapshot.name)
+    referenced = lambda: str(_size(path))
+
+    values = {
+        "type": "snapshot",
+        "creation": str(snapshot.creation),
+        "createtxg": str(snapshot.createtxg),
+        "guid": str(snapshot.guid),
+        "used": referenced,
+        "referenced": referenced,
+        "defer_destroy": "on" if snapshot.deferred else "off",
+        "userrefs": str(len(snapshot.holds)),
+        **snapshot.properties,
+    }
+
+    return {
+        key: ZFSProperty(snapshot.full_name, key, value, PropertySource.NONE)
+        for (key, value) in values.items()
+    }
+
+
+class ZFSProperty:
+    def __init__(
+        self,
+        owner: str,
+        name: str,
+        value: typing.Union[str, typing.Callable[[], str]],
+        source: PropertySource,
+    ):
+        self.__owner = owner
+        self.__name = name
+        self.__value = value
+        self.__source = source
+
+    @property
+    def name(self) -> str:
+        return self.__name
+
+    @property
+    def value(self) -> str:
+        if self.__name in ("used", "referenced") and self.rawvalue.isdigit():
+            return _humanize(int(self.rawvalue))
+
+        return self.rawvalue
+
+    @value.setter
+    def value(self, value: str):
+        _delay("set")
+
+        with _STATE.lock:
+            dataset_name, snapshot_name = _split(self.__owner)
+            if snapshot_name is not None and ":" not in self.__name:
+                raise ZFSException(Error.PROPREADONLY, "property is read-only")
+
+            if snapshot_name is not None:
+                _lookup_snapshot(self.__owner).properties[self.__name] = str(value)
+            else:
+                _lookup_dataset(dataset_name).properties[self.__name] = str(value)
+
+            self.__value = str(value)
+            self.__source = PropertySource.LOCAL
+
+    @property
+    def rawvalue(self) -> str:
+        if callable(self.__value):
+            with _STATE.lock:
+                self.__value = self.__value()
+
+        return self.__value
+
+    @property
+    def parsed(self) -> typing.Any:
+        value = self.rawvalue
+
+        if value.isdigit():
+            return int(value)
+
+        if value in ("on", "yes"):
+            return True
+
+        if value in ("off", "no"):
+            return False
+
+        if value in ("none", "-"):
+            return None
+
+        return value
+
+    @property
+    def source(self) -> PropertySource:
+        return self.__source
+
+    @property
+    def allowed_values(self) -> str:
+        return _ALLOWED_VALUES.get(self.__name, "")
+
+    def inherit(self, recursive: bool = False, received: bool = False):
+        _delay("set")
+
+        with _STATE.lock:
+            dataset = _lookup_dataset(_split(self.__owner)[0])
+            dataset.properties.pop(self.__name, None)
+
+            if recursive:
+                for child in _children(dataset.name, True):
+                    child.properties.pop(self.__name, None)
+
+            self.__value, self.__source = _resolve_property(dataset, self.__name)
+
+
+class ZFSPoolProperty:
+    def __init__(self, name: str, value: str):
+        self.name = name
+        self.value = value
+        self.rawvalue = value
+        self.parsed = value
+
+
+class ZFSPool:
+    def __init__(self, name: str):
+        self.__name = name
+
+    @property
+    def name(self) -> str:
+        return self.__name
+
+    @property
+    def properties(self) -> typing.Dict[str, "ZFSPoolProperty"]:
+        pool = _STATE.pools[self.__name]
+
+        return {
+            "name": ZFSPoolProperty("name", pool.name),
+            "altroot": ZFSPoolProperty("altroot", str(pool.altroot)),
+            "health": ZFSPoolProperty("health", "ONLINE"),
+        }
+
+    @property
+    def root_dataset(self) -> "ZFSDataset":
+        return ZFSDataset(self.__name)
+
+    # pylint: disable=too-many-arguments
+    def create(
+        self,
+        name: str,
+        fsopts: typing.Mapping[str, typing.Any],
+        fstype: DatasetType = DatasetType.FILESYSTEM,
+        sparse_vol: bool = False,
+        create_ancestors: bool = False,
+    ):
+        _delay("create")
+
+        with _STATE.lock:
+            if name in _STATE.datasets:
+                raise ZFSException(
+                    Error.EXISTS, "dataset already exists: {}".format(name)
+                )
+
+            if name.split("/")[0] != self.__name:
+                raise ZFSException(
+                    Error.INVALIDNAME, "invalid dataset name: {}".format(name)
+                )
+
+            segments = name.split("/")
+            for index in range(1, len(segments) - 1):
+                ancestor = "/".join(segments[0 : index + 1])
+                if ancestor not in _STATE.datasets:
+                    if not create_ancestors:
+                        raise ZFSException(
+                            Error.NOENT, "parent does not exist: {}".format(ancestor)
+                        )
+
+                    _STATE.datasets[ancestor] = _Dataset(ancestor, fstype, {})
+                    _path(ancestor).mkdir(parents=True, exist_ok=True)
+
+            dataset = _Dataset(
+                name,
+                fstype,
+                {key: str(value) for (key, value) in (fsopts or {}).items()},
+            )
+            _STATE.datasets[name] = dataset
+            _path(name).mkdir(parents=True, exist_ok=True)
+
+
+class ZFSDataset:
+    def __init__(self, name: str):
+        self.__name = name
+
+    def __repr__(self) -> str:
+        return "<fake.ZFSDataset name '{}'>".format(self.__name)
+
+    @property
+    def _record(self) -> "_Dataset":
+        return _lookup_dataset(self.__name)
+
+    @property
+    def name(self) -> str:
+        return self.__name
+
+    @property
+    def type(self) -> DatasetType:
+        return self._record.kind
+
+    @property
+    def pool(self) -> "ZFSPool":
+        return ZFSPool(self._record.pool)
+
+    @property
+    def properties(self) -> typing.Dict[str, "ZFSProperty"]:
+        _delay("properties")
+
+        with _STATE.lock:
+            return _dataset_properties(self._record)
+
+    @property
+    def mountpoint(self) -> typing.Optional[str]:
+        with _STATE.lock:
+            if not self._record.mounted:
+                return None
+
+            return str(_path(self.__name))
+
+    @property
+    def children(self) -> typing.List["ZFSDataset"]:
+        _delay("list")
+
+        with _STATE.lock:
+            return [ZFSDataset(x.name) for x in _children(self.__name)]
+
+    @property
+    def children_recursive(self) -> typing.List["ZFSDataset"]:
+        _delay("list")
+
+        with _STATE.lock:
+            return [ZFSDataset(x.name) for x in _children(self.__name, True)]
+
+    @property
+    def snapshots(self) -> typing.List["ZFSSnapshot"]:
+        _delay("list")
+
+        with _STATE.lock:
+            return [
+                ZFSSnapshot(x.full_name)
+                for x in sorted(
+                    self._record.snapshots.values(), key=lambda x: x.createtxg
+                )
+            ]
+
+    @property
+    def snapshots_recursive(self) -> typing.List["ZFSSnapshot"]:
+        _delay("list")
+
+        with _STATE.lock:
+            result = []
+
+            for dataset in [self._record, *_children(self.__name, True)]:
+                result.extend(
+                    ZFSSnapshot(x.full_name)
+                    for x in sorted(
+                        dataset.snapshots.values(), key=lambda x: x.createtxg
+                    )
+                )
+
+            return result
+
+    @property
+    def dependents(self) -> typing.List["ZFSDataset"]:
+        with _STATE.lock:
+            return [ZFSDataset(x.name) for x in _dependents(self._record)]
+
+    def mount(self):
+        _delay("mount")
+
+        with _STATE.lock:
+            self._record.mounted = True
+            _path(self.__name).mkdir(parents=True, exist_ok=True)
+
+    def mount_recursive(self, ignore_errors: bool = False):
+        self.mount()
+
+        for child in self.children_recursive:
+            child.mount()
+
+    def umount(self, force: bool = False):
+        _delay("umount")
+
+        with _STATE.lock:
+            self._record.mounted = False
+
+    def umount_recursive(self, force: bool = False):
+        for child in reversed(self.children_recursive):
+            child.umount(force)
+
+        self.umount(force)
+
+    def rename(
+        self,
+        new_name: str,
+        nounmount: bool = False,
+        forceunmount: bool = False,
+    ):
+        _delay("rename")
+
+        with _STATE.lock:
+            record = self._record
+
+            if new_name in _STATE.datasets:
+                raise ZFSException(
+                    Error.EXISTS, "dataset already exists: {}".format(new_name)
+                )
+
+            if new_name.split("/")[0] != record.pool:
+                raise ZFSException(Error.CROSSTARGET, "cannot rename across pools")
+
+            parent = new_name.rsplit("/", 1)[0] if "/" in new_name else None
+            if parent is None or parent not in _STATE.datasets:
+                raise ZFSException(
+                    Error.NOENT, "parent does not exist: {}".format(parent)
+                )
+
+            if new_name.startswith("{}/".format(self.__name)):
+                raise ZFSException(Error.BADTARGET, "cannot rename into itself")
+
+            old_prefix = self.__name
+            source = _path(old_prefix)
+            destination = _path(new_name)
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            shutil.move(str(source), str(destination))
+
+            renamed = {}
+            for key, value in list(_STATE.datasets.items()):
+                if key == old_prefix or key.startswith("{}/".format(old_prefix)):
+                    del _STATE.datasets[key]
+                    value.name = new_name + key[len(old_prefix) :]
+                    renamed[key] = value.name
+                    _STATE.datasets[value.name] = value
+
+            for dataset in _STATE.datasets.values():
+                if dataset.origin is None:
+                    continue
+
+                origin_dataset, origin_snapshot = _split(dataset.origin)
+                if origin_dataset in renamed:
+                    dataset.origin = "{}@{}".format(
+                        renamed[origin_dataset], origin_snapshot
+                    )
+
+            self.__name = new_name
+
+    def delete(self):
+        _delay("delete")
+
+        with _STATE.lock:
+            record = self._record
+
+            if len(_children(self.__name)) > 0:
+                raise ZFSException(Error.EXISTS, "filesystem has children")
+
+            if len(record.snapshots) > 0:
+                raise ZFSException(Error.EXISTS, "filesystem has snapshots")
+
+            if record.parent is None:
+                raise ZFSException(Error.BADTYPE, "cannot destroy pool root dataset")
+
+            del _STATE.datasets[self.__name]
+            shutil.rmtree(_path(self.__name), ignore_errors=True)
+
+            if record.origin is not None:
+                origin_dataset, origin_snapshot = _split(record.origin)
+                origin = _STATE.datasets.get(origin_dataset)
+                if origin is not None and origin_snapshot in origin.snapshots:
+                    snapshot = origin.snapshots[origin_snapshot]
+                    if snapshot.deferred:
+                        _release_deferred(snapshot)
+
+    def snapshot(
+        self,
+        name: str,
+        fsopts: typing.Optional[typing.Mapping[str, typing.Any]] = None,
+        recursive: bool = False,
+    ):
+        _delay("snapshot")
+
+        with _STATE.lock:
+            dataset_name, snapshot_name = _split(name)
+            if snapshot_name is None or dataset_name != self.__name:
+                raise ZFSException(
+                    Error.INVALIDNAME, "invalid snapshot name: {}".format(name)
+                )
+
+            datasets = [self._record]
+            if recursive:
+                datasets.extend(_children(self.__name, True))
+
+            for dataset in datasets:
+                if snapshot_name in dataset.snapshots:
+                    raise ZFSException(
+                        Error.EXISTS,
+                        "snapshot already exists: {}@{}".format(
+                            dataset.name, snapshot_name
+                        ),
+                    )
+
+            createtxg = _STATE.next_txg()
+
+            for dataset in datasets:
+                snapshot = _Snapshot(
+                    dataset,
+                    snapshot_name,
+                    {key: str(value) for (key, value) in (fsopts or {}).items()},
+                )
+                snapshot.createtxg = createtxg
+                _copy_contents(
+                    _path(dataset.name),
+                    _snapshot_path(dataset.name, snapshot_name),
+                    _own_entries(dataset.name),
+                )
+                dataset.snapshots[snapshot_name] = snapshot
+
+    def destroy_snapshot(self, name: str):
+        _delay("destroy_snapshot")
+
+        with _STATE.lock:
+            for dataset in [self._record, *_children(self.__name, True)]:
+                snapshot = dataset.snapshots.get(name)
+                if snapshot is not None:
+                    _delete_snapshot(snapshot, defer=True)
+
+    def promote(self):
+        _delay("promote")
+
+        with _STATE.lock:
+            record = self._record
+            if record.origin is None:
+                raise ZFSException(Error.BADTYPE, "not a cloned filesystem")
+
+            origin_name, origin_snapshot = _split(record.origin)
+            origin = _lookup_dataset(origin_name)
+            boundary = origin.snapshots[origin_snapshot].createtxg
+
+            moved = [
+                x
+                for x in sorted(origin.snapshots.values(), key=lambda x: x.createtxg)
+                if x.createtxg <= boundary
+            ]
+
+            for snapshot in moved:
+                if snapshot.name in record.snapshots:
+                    raise ZFSException(
+                        Error.EXISTS,
+                        "snapshot name conflict: {}".format(snapshot.name),
+                    )
+
+            for snapshot in moved:
+                old_name = snapshot.full_name
+                del origin.snapshots[snapshot.name]
+                shutil.move(
+                    str(_snapshot_path(origin.name, snapshot.name)),
+                    str(_snapshot_path(record.name, snapshot.name)),
+                )
+                snapshot.dataset = record
+                record.snapshots[snapshot.name] = snapshot
+
+                for dataset in _STATE.datasets.values():
+                    if dataset.origin == old_name:
+                        dataset.origin = snapshot.full_name
+
+            record.origin = origin.origin
+            origin.origin = "{}@{}".format(record.name, origin_snapshot)
+
+
+class ZFSSnapshot:
+    def __init__(self, name: str):
+        self.__name = name
+
+    def __repr__(self) -> str:
+        return "<fake.ZFSSnapshot name '{}'>".format(self.__name)
+
+    @property
+    def _record(self) -> "_Snapshot":
+        return _lookup_snapshot(self.__name)
+
+    @property
+    def name(self) -> str:
+        return self.__name
+
+    @property
+    def snapshot_name(self) -> str:
+        return _split(self.__name)[1]
+
+    @property
+    def type(self) -> DatasetType:
+        return DatasetType.SNAPSHOT
+
+    @property
+    def pool(self) -> "ZFSPool":
+        return ZFSPool(self.__name.split("/")[0])
+
+    @property
+    def parent(self) -> "ZFSDataset":
+        return ZFSDataset(_split(self.__name)[0])
+
+    @property
+    def properties(self) -> typing.Dict[str, "ZFSProperty"]:
+        _delay("properties")
+
+        with _STATE.lock:
+            return _snapshot_properties(self._record)
+
+    @property
+    def holds(self) -> typing.Set[str]:
+        with _STATE.lock:
+            return set(self._record.holds)
+
+    @property
+    def mountpoint(self) -> str:
+        dataset, snapshot = _split(self.__name)
+        return str(_snapshot_path(dataset, snapshot))
+
+    def hold(self, tag: str, recursive: bool = False):
+        with _STATE.lock:
+            self._record.holds.add(tag)
+
+    def release(self, tag: str, recursive: bool = False):
+        with _STATE.lock:
+            record = self._record
+            record.holds.discard(tag)
+
+            if record.deferred:
+                _release_deferred(record)
+
+    def delete(self, recursive: bool = False, defer: bool = False):
+        _delay("delete")
+
+        with _STATE.lock:
+            record = self._record
+            datasets = [record.dataset]
+
+            if recursive:
+                datasets.extend(_children(record.dataset.name, True))
+
+            for dataset in datasets:
+                snapshot = dataset.snapshots.get(record.name)
+                if snapshot is not None:
+                    _delete_snapshot(snapshot, defer)
+
+    def rename(self, new_name: str):
+        _delay("rename")
+
+        with _STATE.lock:
+            record = self._record
+            dataset_name, snapshot_name = _split(new_name)
+
+            if snapshot_name is None:
+                snapshot_name = dataset_name
+            elif dataset_name != record.dataset.name:
+                raise ZFSException(Error.CROSSTARGET, "cannot move snapshots")
+
+            if snapshot_name in record.dataset.snapshots:
+                raise ZFSException(
+                    Error.EXISTS, "snapshot already exists: {}".format(new_name)
+                )
+
+            old_name = record.full_name
+            shutil.move(
+                str(_snapshot_path(record.dataset.name, record.name)),
+                str(_snapshot_path(record.dataset.name, snapshot_name)),
+            )
+            del record.dataset.snapshots[record.name]
+            record.name = snapshot_name
+            record.dataset.snapshots[snapshot_name] = record
+
+            for dataset in _STATE.datasets.values():
+                if dataset.origin == old_name:
+                    dataset.origin = record.full_name
+
+            self.__name = record.full_name
+
+    def clone(self, name: str, opts: typing.Optional[typing.Mapping[str, str]] = None):
+        _delay("clone")
+
+        with _STATE.lock:
+            record = self._record
+
+            if name in _STATE.datasets:
+                raise ZFSException(
+                    Error.EXISTS, "dataset already exists: {}".format(name)
+                )
+
+            parent = name.rsplit("/", 1)[0] if "/" in name else None
+            if parent is None or parent not in _STATE.datasets:
+                raise ZFSException(
+                    Error.NOENT, "parent does not exist: {}".format(parent)
+                )
+
+            dataset = _Dataset(
+                name,
+                DatasetType.FILESYSTEM,
+                {key: str(value) for (key, value) in (opts or {}).items()},
+            )
+            dataset.origin = record.full_name
+            _STATE.datasets[name] = dataset
+
+            _copy_contents(
+                _snapshot_path(record.dataset.name, record.name), _path(name)
+            )
+
+    def rollback(self, force: bool = False):
+        _delay("rollback")
+
+        with _STATE.lock:
+            record = self._record
+            dataset = record.dataset
+
+            later = [
+                x for x in dataset.snapshots.values() if x.createtxg > record.createtxg
+            ]
+
+            if len(later) > 0 and not force:
+                raise ZFSException(
+                    Error.EXISTS,
+                    "more recent snapshots exist: {}".format(
+                        ", ".join(x.name for x in later)
+                    ),
+                )
+
+            for snapshot in later:
+                _delete_snapshot(snapshot, False)
+
+            path = _path(dataset.name)
+            excluded = _own_entries(dataset.name)
+            _clear_contents(path, excluded)
+            _copy_contents(_snapshot_path(dataset.name, record.name), path)
+
+    def send(
+        self,
+        fd: int,
+        fromname: typing.Optional[str] = None,
+        flags: typing.Optional[typing.Set[SendFlag]] = None,
+    ):
+        _delay("send")
+
+        flags = flags or set()
+
+        with _STATE.lock:
+            record = self._record
+            base = None
+
+            if fromname is not None:
+                if "@" not in fromname:
+                    fromname = "{}@{}".format(record.dataset.name, fromname)
+
+                base = _lookup_snapshot(fromname)
+
+            records = [(record, base)]
+
+            if SendFlag.REPLICATE in flags:
+                for child in _children(record.dataset.name, True):
+                    snapshot = child.snapshots.get(record.name)
+                    if snapshot is None:
+                        continue
+
+                    child_base = None
+                    if base is not None:
+                        child_base = child.snapshots.get(base.name)
+
+                    records.append((snapshot, child_base))
+
+            payloads = [
+                _serialize(x, y, record.dataset.name, SendFlag.PROPS in flags)
+                for (x, y) in records
+            ]
+
+        _write(fd, _STREAM_MAGIC)
+
+        for header, payload in payloads:
+            _write(fd, struct.pack(">I", len(header)))
+            _write(fd, header)
+            _write(fd, struct.pack(">Q", len(payload)))
+            _write(fd, payload)
+
+        end = json.dumps({"end": True}).encode()
+        _write(fd, struct.pack(">I", len(end)))
+        _write(fd, end)
+        _write(fd, struct.pack(">Q", 0))
+
+
+def _release_deferred(snapshot: "_Snapshot"):
+    if len(snapshot.holds) > 0:
+        return
+
+    if any(x.origin == snapshot.full_name for x in _STATE.datasets.values()):
+        return
+
+    _delete_snapshot(snapshot, False)
+
+
+def _delete_snapshot(snapshot: "_Snapshot", defer: bool):
+    busy = len(snapshot.holds) > 0 or any(
+        x.origin == snapshot.full_name for x in _STATE.datasets.values()
+    )
+
+    if busy:
+        if defer:
+            snapshot.deferred = True
+            return
+
+        raise ZFSException(
+            Error.BUSY,
+            "snapshot has dependent clones or holds: {}".format(snapshot.full_name),
+        )
+
+    del snapshot.dataset.snapshots[snapshot.name]
+    shutil.rmtree(
+        _snapshot_path(snapshot.dataset.name, snapshot.name), ignore_errors=True
+    )
+
+
+def _serialize(
+    snapshot: "_Snapshot",
+    base: typing.Optional["_Snapshot"],
+    root: str,
+    properties: bool,
+) -> typing.Tuple[bytes, bytes]:
+    buffer = io.BytesIO()
+
+    with tarfile.open(fileobj=buffer, mode="w") as archive:
+        path = _snapshot_path(snapshot.dataset.name, snapshot.name)
+        for entry in sorted(os.listdir(path)) if path.exists() else []:
+            archive.add(str(path.joinpath(entry)), arcname=entry)
+
+    header = {
+        "relative": snapshot.dataset.name[len(root) :].lstrip("/"),
+        "snapshot": snapshot.name,
+        "guid": snapshot.guid,
+        "from": base.guid if base is not None else None,
+        "properties": dict(snapshot.dataset.properties) if properties else {},
+    }
+
+    return (json.dumps(header).encode(), buffer.getvalue())
+
+
+def _write(fd: int, data: bytes):
+    view = memoryview(data)
+
+    while len(view) > 0:
+        written = os.write(fd, view)
+        view = view[written:]
+
+
+def _read(fd: int, size: int) -> bytes:
+    chunks = []
+
+    while size > 0:
+        chunk = os.read(fd, min(size, 1 << 20))
+        if len(chunk) == 0:
+            raise ZFSException(Error.BADSTREAM, "unexpected end of stream")
+
+        chunks.append(chunk)
+        size -= len(chunk)
+
+    return b"".join(chunks)
+
+
+def _extract(payload: bytes, destination: pathlib.Path):
+    with tarfile.open(fileobj=io.BytesIO(payload), mode="r") as archive:
+        if hasattr(tarfile, "fully_trusted_filter"):
+            archive.extractall(str(destination), filter="fully_trusted")
+        else:
+            archive.extractall(str(destination))
+
+
+def _receive(
+    name: str,
+    header: typing.Dict[str, typing.Any],
+    payload: bytes,
+    force: bool,
+    nomount: bool,
+    props: typing.Optional[typing.Mapping[str, str]],
+):
+    dataset_name, snapshot_name = _split(name)
+    if header["relative"]:
+        dataset_name = "{}/{}".format(dataset_name, header["relative"])
+
+    if snapshot_name is None or header["relative"]:
+        snapshot_name = header["snapshot"]
+
+    dataset = _STATE.datasets.get(dataset_name)
+
+    if header["from"] is None:
+        if dataset is not None:
+            if not force or len(dataset.snapshots) > 0:
+                raise ZFSException(
+                    Error.EXISTS, "destination exists: {}".format(dataset_name)
+                )
+
+            _clear_contents(_path(dataset_name), _own_entries(dataset_name))
+        else:
+            parent = dataset_name.rsplit("/", 1)[0] if "/" in dataset_name else None
+            if parent is None or parent not in _STATE.datasets:
+                raise ZFSException(
+                    Error.NOENT, "parent does not exist: {}".format(parent)
+                )
+
+            dataset = _Dataset(dataset_name, DatasetType.FILESYSTEM, {})
+            _STATE.datasets[dataset_name] = dataset
+    else:
+        if dataset is None:
+            raise ZFSException(
+                Error.NOENT, "destination does not exist: {}".format(dataset_name)
+            )
+
+        snapshots = sorted(dataset.snapshots.values(), key=lambda x: x.createtxg)
+        matches = [x for x in snapshots if x.guid == header["from"]]
+
+        if len(matches) == 0:
+            raise ZFSException(
+                Error.BADSTREAM,
+                "incremental source does not exist on {}".format(dataset_name),
+            )
+
+        if snapshots[-1] is not matches[0]:
+            if not force:
+                raise ZFSException(
+                    Error.EXISTS,
+                    "destination {} has been modified since the most recent snapshot".format(
+                        dataset_name
+                    ),
+                )
+
+            for snapshot in snapshots:
+                if snapshot.createtxg > matches[0].createtxg:
+                    _delete_snapshot(snapshot, False)
+
+        _clear_contents(_path(dataset_name), _own_entries(dataset_name))
+
+    if snapshot_name in dataset.snapshots:
+        raise ZFSException(
+            Error.EXISTS,
+            "snapshot already exists: {}@{}".format(dataset_name, snapshot_name),
+        )
+
+    dataset.properties.update(header["properties"])
+    dataset.properties.update(props or {})
+
+    path = _path(dataset_name)
+    path.mkdir(parents=True, exist_ok=True)
+    _extract(payload, path)
+
+    snapshot = _Snapshot(dataset, snapshot_name, guid=header["guid"])
+    _copy_contents(
+        path, _snapshot_path(dataset_name, snapshot_name), _own_entries(dataset_name)
+    )
+    dataset.snapshots[snapshot_name] = snapshot
+    dataset.mounted = not nomount
+
+
+class ZFS:
+    def __enter__(self) -> "ZFS":
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    @property
+    def pools(self) -> typing.List["ZFSPool"]:
+        with _STATE.lock:
+            return [ZFSPool(x) for x in sorted(_STATE.pools)]
+
+    @property
+    def datasets(self) -> typing.List["ZFSDataset"]:
+        with _STATE.lock:
+            return [ZFSDataset(x) for x in sorted(_STATE.datasets)]
+
+    @property
+    def snapshots(self) -> typing.List["ZFSSnapshot"]:
+        with _STATE.lock:
+            return [
+                ZFSSnapshot(y.full_name)
+                for x in sorted(_STATE.datasets)
+                for y in _STATE.datasets[x].snapshots.values()
+            ]
+
+    # pylint: disable=no-self-use
+    def get(self, name: str) -> "ZFSPool":
+        _delay("open")
+
+        with _STATE.lock:
+            if name not in _STATE.pools:
+                raise ZFSException(Error.NOENT, "pool does not exist: {}".format(name))
+
+            return ZFSPool(name)
+
+    def get_dataset(self, name: str) -> "ZFSDataset":
+        _delay("open")
+
+        with _STATE.lock:
+            _lookup_dataset(name)
+            return ZFSDataset(name)
+
+    def get_snapshot(self, name: str) -> "ZFSSnapshot":
+        _delay("open")
+
+        with _STATE.lock:
+            _lookup_snapshot(name)
+            return ZFSSnapshot(name)
+
+    def get_object(self, name: str) -> typing.Union["ZFSDataset", "ZFSSnapshot"]:
+        if "@" in name:
+            return self.get_snapshot(name)
+
+        return self.get_dataset(name)
+
+    def snapshots_serialized(
+        self,
+        props: typing.Optional[typing.List[str]] = None,
+        holds: bool = False,
+        mine: bool = False,
+        datasets: typing.Optional[typing.List[str]] = None,
+        recursive: bool = True,
+    ) -> typing.Iterator[typing.Dict[str, typing.Any]]:
+        _delay("list")
+
+        with _STATE.lock:
+            selected = []
+
+            for name in sorted(_STATE.datasets):
+                if datasets is not None and not any(
+                    name == x or (recursive and name.startswith("{}/".format(x)))
+                    for x in datasets
+                ):
+                    continue
+
+                selected.extend(
+                    sorted(
+                        _STATE.datasets[name].snapshots.values(),
+                        key=lambda x: x.createtxg,
+                    )
+                )
+
+            result = []
+
+            for snapshot in selected:
+                properties = _snapshot_properties(snapshot)
+                if props is not None:
+                    properties = {
+                        key: value
+                        for (key, value) in properties.items()
+                        if key in props
+                    }
+
+                entry = {
+                    "name": snapshot.full_name,
+                    "pool": snapshot.dataset.pool,
+                    "dataset": snapshot.dataset.name,
+                    "snapshot_name": snapshot.name,
+                    "type": "SNAPSHOT",
+                    "id": snapshot.full_name,
+                    "createtxg": str(snapshot.createtxg),
+                    "properties": {
+                        key: {
+                            "value": value.value,
+                            "rawvalue": value.rawvalue,
+                            "parsed": value.parsed,
+                            "source": value.source.name,
+                        }
+                        for (key, value) in properties.items()
+                    },
+                }
+
+                if holds:
+                    entry["holds"] = {x: None for x in snapshot.holds}
+
+                result.append(entry)
+
+        return iter(result)
+
+    # pylint: disable=too-many-arguments
+    def receive(
+        self,
+        name: str,
+        fd: int,
+        force: bool = False,
+        resumable: bool = False,
+        nomount: bool = False,
+        props: typing.Optional[typing.Mapping[str, str]] = None,
+        limitds: typing.Optional[typing.List[str]] = None,
+    ):
+        _delay("receive")
+
+        if _read(fd, len(_STREAM_MAGIC)) != _STREAM_MAGIC:
+            raise ZFSException(Error.BADSTREAM, "invalid stream")
+
+        while True:
+            (header_size,) = struct.unpack(">I", _read(fd, 4))
+            header = json.loads(_read(fd, header_size))
+            (payload_size,) = struct.unpack(">Q", _read(fd, 8))
+            payload = _read(fd, payload_size) if payload_size > 0 else b""
+
+            if header.get("end", False):
+                break
+
+            with _STATE.lock:
+                _receive(name, header, payload, force, nomount, props)
@@ -1,5 +1,8 @@
 import pathlib
+import shutil
 import subprocess
+import tempfile
+import threading
 import typing
 
 import libzfs
@@ -39,6 +42,141 @@ class InvalidIdentifierError(RuntimeError):
     pass
 
 
+_DESTROY_PROGRAM = """
+EBUSY = 16
+EEXIST = 17
+
+function collect(dataset, datasets, snapshots)
+    local expected = 0
+
+    for child in zfs.list.children(dataset) do
+        collect(child, datasets, snapshots)
+        expected = EEXIST
+    end
+
+    for snapshot in zfs.list.snapshots(dataset) do
+        table.insert(snapshots, snapshot)
+        expected = EBUSY
+    end
+
+    table.insert(datasets, {name = dataset, expected = expected})
+end
+
+function fail(code, name)
+    error(string.format("destroying %s failed with %d", name, code))
+end
+
+local arguments = ...
+local datasets = {}
+local snapshots = {}
+collect(arguments["argv"][1], datasets, snapshots)
+
+for _, name in ipairs(snapshots) do
+    local code = zfs.check.destroy(name)
+    if code ~= 0 then
+        fail(code, name)
+    end
+end
+
+for _, dataset in ipairs(datasets) do
+    local code = zfs.check.destroy(dataset.name)
+    if code ~= 0 and code ~= dataset.expected then
+        fail(code, dataset.name)
+    end
+end
+
+for _, name in ipairs(snapshots) do
+    local code = zfs.sync.destroy(name)
+    if code ~= 0 then
+        fail(code, name)
+    end
+end
+
+for _, dataset in ipairs(datasets) do
+    local code = zfs.sync.destroy(dataset.name)
+    if code ~= 0 then
+        fail(code, dataset.name)
+    end
+end
+
+return #snapshots + #datasets
+"""
+
+
+_generation = 0
+
+_generation_lock = threading.Lock()
+
+
+def invalidate():
+    global _generation
+
+    with _generation_lock:
+        _generation = _generation + 1
+
+
+def is_programmable() -> bool:
+    return libzfs.__name__ == "libzfs" and shutil.which("zfs") is not None
+
+
+def _destroy_program(identifier: "Identifier") -> bool:
+    with tempfile.NamedTemporaryFile("w", suffix=".lua") as script:
+        script.write(_DESTROY_PROGRAM)
+        script.flush()
+
+        result = subprocess.run(
+            [
+                "zfs",
+                "program",
+                identifier.first,
+                script.name,
+                str(identifier),
+            ],
+            check=False,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+    return result.returncode == 0 and not identifier.exists()
+
+
+def altroot(pool: str) -> pathlib.Path:
+    value = libzfs.ZFS().get(pool).properties["altroot"].value
+
+    if value in (None, "", "-", "none"):
+        return pathlib.Path("/")
+
+    return pathlib.Path(value)
+
+
+def catalogs(
+    identifier: "Identifier",
+    recursive: bool = True,
+) -> typing.Dict[str, "Catalog"]:
+    entries: typing.Dict[str, typing.List["CatalogEntry"]] = {}
+
+    for entry in libzfs.ZFS().snapshots_serialized(
+        props=["createtxg", "guid", "used"],
+        datasets=[str(identifier)],
+        recursive=recursive,
+    ):
+        entries.setdefault(entry["dataset"], []).append(
+            CatalogEntry(
+                entry["dataset"],
+                entry["snapshot_name"],
+                int(entry["createtxg"]),
+                int(entry["properties"]["guid"]["rawvalue"]),
+                int(entry["properties"]["used"]["rawvalue"]),
+            ),
+        )
+
+    return {key: Catalog(value) for (key, value) in entries.items()}
+
+
+def snapshot_names(identifier: "Identifier") -> typing.Dict[str, typing.List[str]]:
+    return {key: value.names for (key, value) in catalogs(identifier).items()}
+
+
 class Identifier:
     def __init__(self, *args):
         segments = None
@@ -57,6 +195,7 @@ class Identifier:
             raise InvalidIdentifierError(args)
 
         self.__segments = segments
+        self.__altroot = None
 
     def __str__(self):
         return zonys.core.zfs.SEPARATOR.join(self.segments)
@@ -78,14 +217,27 @@ class Identifier:
 
     @property
     def parent(self):
-        return Identifier(self.segments[0:-1])
+        return self.__derive(self.segments[0:-1])
+
+    @property
+    def altroot(self) -> pathlib.Path:
+        if self.__altroot is None:
+            self.__altroot = altroot(self.first)
+
+        return self.__altroot
 
     @property
     def path(self):
-        return pathlib.Path("/", *self.segments)
+        return self.altroot.joinpath(*self.segments)
 
     def child(self, *args):
-        return Identifier([*self.segments, *args])
+        return self.__derive([*self.segments, *args])
+
+    def __derive(self, segments) -> "Identifier":
+        identifier = Identifier(segments)
+        identifier.__altroot = self.__altroot
+
+        return identifier
 
     def exists(self):
         try:
@@ -94,13 +246,13 @@ class Identifier:
         except:
             return False
 
-    def create(self, create_ancestors=True):
+    def create(self, create_ancestors=True, properties=None):
         if self.exists():
             raise AlreadyExistsError(self)
 
         libzfs.ZFS().get(self.first).create(
             str(self),
-            {},
+            dict(properties or {}),
             libzfs.DatasetType.FILESYSTEM,
             create_ancestors=create_ancestors,
         )
@@ -119,18 +271,26 @@ class Identifier:
 
         return self.create()
 
-    def receive(self, descriptor: int) -> "zonys.zfs.snapshot.Handle":
-        if self.exists():
+    def receive(
+        self,
+        descriptor: int,
+        force: bool = False,
+    ) -> "zonys.zfs.snapshot.Handle":
+        if not force and self.exists():
             raise AlreadyExistsError(self)
 
         name = str(self)
 
-        libzfs.ZFS().receive(
-            name,
-            descriptor,
-        )
+        try:
+            libzfs.ZFS().receive(
+                name,
+                descriptor,
+                force=force,
+            )
+        finally:
+            invalidate()
 
-        return list(self.open().snapshots)[0]
+        return list(self.open().snapshots)[-1]
 
 
 class Handle(zonys.core.zfs.dataset.Handle):
@@ -142,9 +302,9 @@ class Handle(zonys.core.zfs.dataset.Handle):
         elif self._descriptor.name != str(identifier):
             raise DescriptorIdentifierNotMatch(self)
 
-        self.__children = Children(self._descriptor)
         self.__identifier = identifier
-        self.__path = pathlib.Path("/", str(self.identifier))
+        self.__children = Children(self._descriptor, identifier)
+        self.__path = self.identifier.path
         self.__snapshots = Snapshots(self._descriptor)
 
     @property
@@ -178,15 +338,64 @@ class Handle(zonys.core.zfs.dataset.Handle):
 
     def rename(self, identifier: Identifier) -> "Handle":
         self._descriptor.rename(str(identifier))
+        invalidate()
+
         return identifier.open()
 
-    def destroy(self):
+    def promote(self):
+        self._descriptor.promote()
+        self.snapshots.refresh()
+
+    @property
+    def used(self) -> int:
+        return int(self._descriptor.properties["used"].rawvalue)
+
+    def destroy(self) -> int:
+        used = self.used
+
         if self.is_mounted():
-            self.unmount(True)
+            self._descriptor.umount_recursive(True)
+
+        try:
+            if not is_programmable() or not _destroy_program(self.identifier):
+                self.__destroy_recursive()
+        finally:
+            invalidate()
+
+        return used
+
+    def __destroy_recursive(self):
+        names = []
+
+        for snapshot in self._descriptor.snapshots_recursive:
+            if snapshot.snapshot_name not in names:
+                names.append(snapshot.snapshot_name)
+
+        for name in names:
+            self._descriptor.destroy_snapshot(name)
+
+        pending = sorted(
+            self._descriptor.children_recursive,
+            key=lambda x: int(x.properties["createtxg"].rawvalue),
+            reverse=True,
+        )
+
+        while len(pending) > 0:
+            failed = []
+
+            for child in pending:
+                try:
+                    child.delete()
+                except libzfs.ZFSException:
+                    failed.append(child)
+
+            if len(failed) == len(pending):
+                failed[0].delete()
+
+            pending = failed
 
-        self.snapshots.destroy_all()
-        self.children.destroy_all()
         self._descriptor.delete()
+        self.snapshots.refresh()
 
     def jail(self, jail):
         command = [
@@ -220,13 +429,16 @@ class Handle(zonys.core.zfs.dataset.Handle):
 
 
 class Children:
-    def __init__(self, descriptor):
+    def __init__(self, descriptor, identifier=None):
+        if identifier is None:
+            identifier = Identifier(descriptor.name)
+
         self.__descriptor = descriptor
-        self.__identifier = Identifier(self.__descriptor.name)
+        self.__identifier = identifier
 
     def __iter__(self):
         return map(
-            lambda x: Handle(x, Identifier(x.name)),
+            lambda x: Handle(x, self.__identifier.child(Identifier(x.name).last)),
             self.__descriptor.children,
         )
 
@@ -236,9 +448,25 @@ class Children:
     def __getitem__(self, name):
         return self.__identifier.child(name).open()
 
-    def destroy_all(self):
-        for child in self:
-            child.destroy()
+    def destroy_all(self) -> int:
+        pending = list(self)
+        result = 0
+
+        while len(pending) > 0:
+            failed = []
+
+            for child in pending:
+                try:
+                    result = result + child.destroy()
+                except libzfs.ZFSException:
+                    failed.append(child)
+
+            if len(failed) == len(pending):
+                failed[0].destroy()
+
+            pending = failed
+
+        return result
 
     def create(self, name):
         return self.__identifier.child(name).create()
@@ -247,34 +475,144 @@ class Children:
         return self.__identifier.child(name).open()
 
 
+class CatalogEntry:
+    def __init__(
+        self,
+        file_system: str,
+        name: str,
+        createtxg: int,
+        guid: int,
+        used: int,
+    ):
+        self.__file_system = file_system
+        self.__name = name
+        self.__createtxg = createtxg
+        self.__guid = guid
+        self.__used = used
+        self.__handle = None
+
+    @property
+    def file_system(self) -> str:
+        return self.__file_system
+
+    @property
+    def name(self) -> str:
+        return self.__name
+
+    @property
+    def createtxg(self) -> int:
+        return self.__createtxg
+
+    @property
+    def guid(self) -> int:
+        return self.__guid
+
+    @property
+    def used(self) -> int:
+        return self.__used
+
+    @property
+    def identifier(self) -> "zonys.core.zfs.snapshot.Identifier":
+        return zonys.core.zfs.snapshot.Identifier(self.__file_system, self.__name)
+
+    def open(self) -> "zonys.core.zfs.snapshot.Handle":
+        if self.__handle is None:
+            self.__handle = self.identifier.open()
+
+        return self.__handle
+
+
+class Catalog:
+    def __init__(self, entries: typing.Iterable["CatalogEntry"]):
+        self.__entries = {x.name: x for x in sorted(entries, key=lambda x: x.createtxg)}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.__entries
+
+    def __getitem__(self, name: str) -> "CatalogEntry":
+        return self.__entries[name]
+
+    def __iter__(self) -> typing.Iterator["CatalogEntry"]:
+        return iter(self.__entries.values())
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    @property
+    def names(self) -> typing.List[str]:
+        return list(self.__entries)
+
+    @property
+    def used(self) -> int:
+        return sum(map(lambda x: x.used, self))
+
+
 class Snapshots:
     def __init__(self, descriptor):
         self.__descriptor = descriptor
+        self.__catalog = None
+        self.__generation = None
+
+    @property
+    def catalog(self) -> "Catalog":
+        if self.__catalog is None or self.__generation != _generation:
+            self.__generation = _generation
+            self.__catalog = catalogs(
+                Identifier(self.__descriptor.name),
+                False,
+            ).get(
+                self.__descriptor.name,
+                Catalog([]),
+            )
+
+        return self.__catalog
+
+    def refresh(self):
+        self.__catalog = None
+        invalidate()
 
     def __iter__(self):
-        return map(
-            lambda x: zonys.core.zfs.snapshot.Handle(
-                x, zonys.core.zfs.snapshot.Identifier(x.name)
-            ),
-            self.__descriptor.snapshots,
-        )
+        return map(lambda x: x.open(), self.catalog)
+
+    def __len__(self):
+        return len(self.catalog)
 
     def __getitem__(self, name):
-        return zonys.core.zfs.snapshot.Identifier(self.__descriptor.name, name).open()
+        if name not in self.catalog:
+            raise zonys.core.zfs.snapshot.NotExistError(
+                zonys.core.zfs.snapshot.Identifier(self.__descriptor.name, name)
+            )
+
+        return self.catalog[name].open()
 
     def __contains__(self, name):
-        return zonys.core.zfs.snapshot.Identifier(self.__descriptor.name, name).exists()
+        return name in self.catalog
 
-    def create(self, name):
-        return zonys.core.zfs.snapshot.Identifier(self.__descriptor.name, name).create()
+    def create(self, name, recursive=False):
+        try:
+            return zonys.core.zfs.snapshot.Identifier(
+                self.__descriptor.name, name
+            ).create(recursive)
+        finally:
+            self.refresh()
 
     def destroy(self, name):
-        return (
-            zonys.core.zfs.snapshot.Identifier(self.__descriptor.name, name)
-            .open()
-            .destroy()
-        )
+        try:
+            return self[name].destroy()
+        finally:
+            self.refresh()
+
+    def destroy_recursive(self, name):
+        try:
+            self.__descriptor.destroy_snapshot(name)
+        finally:
+            self.refresh()
 
     def destroy_all(self):
-        for snapshot in self:
-            snapshot.destroy()
+        self.refresh()
+
+        try:
+            for snapshot in self:
+                snapshot.destroy()
+        finally:
+            self.refresh()
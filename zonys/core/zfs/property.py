@@ -1,3 +1,6 @@
+import re
+import typing
+
 import zonys
 import zonys.core
 import zonys.core.zfs
@@ -20,6 +23,26 @@ class InvalidValueError(Error):
         )
 
 
+def _expand(choice: str) -> typing.List[str]:
+    match = re.search(r"\[([^\]]*)\]", choice)
+
+    if match is None:
+        return [choice]
+
+    bounds = re.fullmatch(r"(\d+)-(\d+)", match.group(1))
+
+    if bounds is None:
+        options = ["", match.group(1)]
+    else:
+        options = list(map(str, range(int(bounds[1]), int(bounds[2]) + 1)))
+
+    return [
+        choice[: match.start()] + option + tail
+        for option in options
+        for tail in _expand(choice[match.end() :])
+    ]
+
+
 class Handle(zonys.core.zfs.Handle):
     def __init__(self, descriptor):
         super().__init__(descriptor)
@@ -36,9 +59,25 @@ class Handle(zonys.core.zfs.Handle):
     def allowed_values(self):
         return self._descriptor.allowed_values
 
+    @property
+    def choices(self):
+        tokens = list(map(str.strip, str(self.allowed_values).split("|")))
+
+        if len(tokens) < 2:
+            return None
+
+        choices = [x for token in tokens for x in _expand(token)]
+
+        if not all(re.fullmatch(r"[a-z0-9][a-z0-9,-]*", x) for x in choices):
+            return None
+
+        return choices
+
     @value.setter
     def value(self, value):
-        if value not in self.allowed_values:
+        choices = self.choices
+
+        if choices is not None and value not in choices:
             raise InvalidValueError(value, self)
 
         self._descriptor.value = value
@@ -92,11 +92,17 @@ class Identifier:
         except:
             return False
 
-    def create(self):
+    def create(self, recursive=False):
         if self.exists():
             raise AlreadyExistsError(self)
 
-        libzfs.ZFS().get_dataset(str(self.file_system_identifier)).snapshot(str(self))
+        try:
+            libzfs.ZFS().get_dataset(str(self.file_system_identifier)).snapshot(
+                str(self),
+                recursive=recursive,
+            )
+        finally:
+            zonys.core.zfs.file_system.invalidate()
 
         return Handle(
             libzfs.ZFS().get_snapshot(str(self)),
@@ -138,14 +144,25 @@ class Handle(zonys.core.zfs.dataset.Handle):
         )
 
     def destroy(self):
-        self._descriptor.delete()
+        try:
+            self._descriptor.delete()
+        finally:
+            zonys.core.zfs.file_system.invalidate()
+
+    def rollback(self, force: bool = False):
+        try:
+            self._descriptor.rollback(force)
+        finally:
+            zonys.core.zfs.file_system.invalidate()
 
-    def clone(self, identifier):
-        self._descriptor.clone(str(identifier))
+    def clone(self, identifier, properties=None):
+        self._descriptor.clone(str(identifier), dict(properties or {}))
         return identifier.open()
 
     def rename(self, name: str):
         self._descriptor.rename(name)
+        zonys.core.zfs.file_system.invalidate()
+
         self.__identifier = Identifier(
             self.__identifier.file_system_identifier,
             name,
@@ -155,6 +172,8 @@ class Handle(zonys.core.zfs.dataset.Handle):
         self,
         target: typing.Any,
         compress: bool = False,
+        replicate: bool = False,
+        fromname: typing.Optional[str] = None,
     ):
         flags = set()
 
@@ -163,7 +182,12 @@ class Handle(zonys.core.zfs.dataset.Handle):
                 libzfs.SendFlag.COMPRESS,
             )
 
-        send = lambda x: self.__descriptor.send(x, flags=flags)
+        if replicate:
+            flags.add(
+                libzfs.SendFlag.REPLICATE,
+            )
+
+        send = lambda x: self.__descriptor.send(x, fromname=fromname, flags=flags)
 
         if isinstance(target, int):
             send(target)
@@ -0,0 +1,234 @@
+import pathlib
+import tempfile
+import time
+import unittest
+
+import zonys
+import zonys.core
+import zonys.core.zfs
+import zonys.core.zfs.fake
+
+fake = zonys.core.zfs.fake
+
+
+class TestFake(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self._root = pathlib.Path(self._directory.name)
+
+        fake.reset()
+        fake.create_pool("tank", self._root)
+
+        self._zfs = fake.ZFS()
+        self._zfs.get("tank").create("tank/data", {}, fake.DatasetType.FILESYSTEM)
+        self._dataset = self._zfs.get_dataset("tank/data")
+        self._path = self._root.joinpath("tank", "data")
+
+    def tearDown(self):
+        fake.reset()
+        self._directory.cleanup()
+
+    def test_create_ancestors(self):
+        self._zfs.get("tank").create(
+            "tank/a/b/c",
+            {},
+            fake.DatasetType.FILESYSTEM,
+            create_ancestors=True,
+        )
+        self.assertEqual(
+            ["tank/a/b"],
+            [x.name for x in self._zfs.get_dataset("tank/a").children],
+        )
+
+    def test_create_without_ancestors(self):
+        with self.assertRaises(fake.ZFSException):
+            self._zfs.get("tank").create("tank/a/b", {}, fake.DatasetType.FILESYSTEM)
+
+    def test_altroot(self):
+        self.assertEqual(
+            str(self._root),
+            self._zfs.get("tank").properties["altroot"].value,
+        )
+
+    def test_properties(self):
+        self._dataset.properties["compression"].value = "lz4"
+        self._zfs.get("tank").create("tank/data/child", {}, fake.DatasetType.FILESYSTEM)
+        child = self._zfs.get_dataset("tank/data/child")
+
+        self.assertEqual("lz4", child.properties["compression"].value)
+        self.assertEqual(
+            fake.PropertySource.INHERITED, child.properties["compression"].source
+        )
+
+        self._dataset.properties["compression"].inherit()
+        self.assertEqual("on", child.properties["compression"].value)
+
+    def test_snapshot_is_immutable(self):
+        self._path.joinpath("file").write_text("before")
+        self._dataset.snapshot("tank/data@first")
+        self._path.joinpath("file").write_text("after")
+
+        snapshot = self._zfs.get_snapshot("tank/data@first")
+        self.assertEqual(
+            "before",
+            pathlib.Path(snapshot.mountpoint).joinpath("file").read_text(),
+        )
+
+    def test_recursive_snapshot_shares_txg(self):
+        self._zfs.get("tank").create("tank/data/child", {}, fake.DatasetType.FILESYSTEM)
+        self._dataset.snapshot("tank/data@all", recursive=True)
+
+        snapshots = self._dataset.snapshots_recursive
+        self.assertEqual(
+            ["tank/data@all", "tank/data/child@all"], [x.name for x in snapshots]
+        )
+        self.assertEqual(
+            1,
+            len({x.properties["createtxg"].value for x in snapshots}),
+        )
+
+    def test_clone_and_promote(self):
+        self._path.joinpath("file").write_text("content")
+        self._dataset.snapshot("tank/data@origin")
+        self._zfs.get_snapshot("tank/data@origin").clone("tank/clone")
+
+        clone = self._zfs.get_dataset("tank/clone")
+        self.assertEqual(
+            "content", self._root.joinpath("tank", "clone", "file").read_text()
+        )
+        self.assertEqual("tank/data@origin", clone.properties["origin"].value)
+
+        with self.assertRaises(fake.ZFSException):
+            self._zfs.get_snapshot("tank/data@origin").delete()
+
+        clone.promote()
+        self.assertEqual("-", clone.properties["origin"].value)
+        self.assertEqual("tank/clone@origin", self._dataset.properties["origin"].value)
+
+    def test_deferred_destroy(self):
+        self._dataset.snapshot("tank/data@origin")
+        self._zfs.get_snapshot("tank/data@origin").clone("tank/clone")
+        self._dataset.destroy_snapshot("origin")
+
+        self.assertEqual(1, len(self._dataset.snapshots))
+
+        self._zfs.get_dataset("tank/clone").delete()
+        self.assertEqual(0, len(self._dataset.snapshots))
+
+    def test_rename_moves_children(self):
+        self._zfs.get("tank").create("tank/data/child", {}, fake.DatasetType.FILESYSTEM)
+        self._dataset.rename("tank/renamed")
+
+        self.assertEqual(
+            ["tank/renamed/child"],
+            [x.name for x in self._zfs.get_dataset("tank/renamed").children],
+        )
+        self.assertTrue(self._root.joinpath("tank", "renamed", "child").is_dir())
+
+    def test_rollback(self):
+        self._path.joinpath("file").write_text("before")
+        self._dataset.snapshot("tank/data@first")
+        self._path.joinpath("file").write_text("after")
+        self._path.joinpath("other").write_text("other")
+        self._dataset.snapshot("tank/data@second")
+
+        snapshot = self._zfs.get_snapshot("tank/data@first")
+
+        with self.assertRaises(fake.ZFSException):
+            snapshot.rollback()
+
+        snapshot.rollback(force=True)
+
+        self.assertEqual("before", self._path.joinpath("file").read_text())
+        self.assertFalse(self._path.joinpath("other").exists())
+        self.assertEqual(["tank/data@first"], [x.name for x in self._dataset.snapshots])
+
+    def test_send_receive(self):
+        self._path.joinpath("file").write_text("content")
+        self._path.joinpath("link").symlink_to("file")
+        self._dataset.snapshot("tank/data@first")
+
+        with tempfile.TemporaryFile() as handle:
+            self._zfs.get_snapshot("tank/data@first").send(handle.fileno())
+            handle.seek(0)
+            self._zfs.receive("tank/copy", handle.fileno())
+
+        path = self._root.joinpath("tank", "copy")
+        self.assertEqual("content", path.joinpath("file").read_text())
+        self.assertTrue(path.joinpath("link").is_symlink())
+        self.assertEqual(
+            self._zfs.get_snapshot("tank/data@first").properties["guid"].value,
+            self._zfs.get_snapshot("tank/copy@first").properties["guid"].value,
+        )
+
+    def test_incremental_send_receive(self):
+        self._dataset.snapshot("tank/data@first")
+
+        with tempfile.TemporaryFile() as handle:
+            self._zfs.get_snapshot("tank/data@first").send(handle.fileno())
+            handle.seek(0)
+            self._zfs.receive("tank/copy", handle.fileno())
+
+        self._path.joinpath("file").write_text("content")
+        self._dataset.snapshot("tank/data@second")
+
+        with tempfile.TemporaryFile() as handle:
+            self._zfs.get_snapshot("tank/data@second").send(
+                handle.fileno(),
+                fromname="tank/data@first",
+            )
+            handle.seek(0)
+            self._zfs.receive("tank/copy", handle.fileno())
+
+        self.assertEqual(
+            "content",
+            self._root.joinpath("tank", "copy", "file").read_text(),
+        )
+        self.assertEqual(
+            ["tank/copy@first", "tank/copy@second"],
+            [x.name for x in self._zfs.get_dataset("tank/copy").snapshots],
+        )
+
+    def test_replicate_send_receive(self):
+        self._zfs.get("tank").create("tank/data/child", {}, fake.DatasetType.FILESYSTEM)
+        self._dataset.snapshot("tank/data@all", recursive=True)
+
+        with tempfile.TemporaryFile() as handle:
+            self._zfs.get_snapshot("tank/data@all").send(
+                handle.fileno(),
+                flags={fake.SendFlag.REPLICATE},
+            )
+            handle.seek(0)
+            self._zfs.receive("tank/copy", handle.fileno())
+
+        self.assertEqual(
+            ["tank/copy/child"],
+            [x.name for x in self._zfs.get_dataset("tank/copy").children],
+        )
+
+    def test_snapshots_serialized(self):
+        self._dataset.snapshot("tank/data@first")
+        self._dataset.snapshot("tank/data@second")
+
+        result = list(
+            self._zfs.snapshots_serialized(
+                props=["createtxg", "used"],
+                datasets=["tank/data"],
+            )
+        )
+
+        self.assertEqual(["first", "second"], [x["snapshot_name"] for x in result])
+        self.assertEqual({"createtxg", "used"}, set(result[0]["properties"]))
+
+    def test_latency(self):
+        fake.configure(latency={"snapshot": 0.05})
+
+        start = time.monotonic()
+        self._dataset.snapshot("tank/data@slow")
+
+        self.assertGreaterEqual(time.monotonic() - start, 0.05)
+        self.assertEqual(1, fake.calls()["snapshot"])
+
+
+if __name__ == "main":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,138 @@
+import contextlib
+import subprocess
+import unittest
+import unittest.mock
+
+import zonys
+import zonys.core
+import zonys.core.testing
+import zonys.core.zfs
+import zonys.core.zfs.fake
+import zonys.core.zfs.file_system
+
+
+class TestIdentifier(unittest.TestCase):
+    def setUp(self):
+        self._exit_stack = contextlib.ExitStack()
+        self._environment = self._exit_stack.enter_context(
+            zonys.core.testing.environment(fake=True),
+        )
+
+        self._identifier = zonys.core.zfs.file_system.Identifier(
+            [self._environment.pool, "zonys", "path"],
+        )
+        self._file_system = self._identifier.create()
+
+        for name in ["first", "second"]:
+            self._file_system.children.create(name)
+
+    def tearDown(self):
+        self._exit_stack.close()
+
+    def test_path(self):
+        file_system = self._identifier.open()
+        before = zonys.core.zfs.fake.calls()
+
+        paths = [x.path for x in file_system.children]
+        paths.append(file_system.identifier.child("third").path)
+        paths.append(file_system.identifier.parent.path)
+
+        after = zonys.core.zfs.fake.calls()
+
+        self.assertEqual(
+            [
+                file_system.path.joinpath("first"),
+                file_system.path.joinpath("second"),
+                file_system.path.joinpath("third"),
+                file_system.path.parent,
+            ],
+            paths,
+        )
+        self.assertEqual(
+            0,
+            after.get("open", 0) - before.get("open", 0),
+        )
+
+
+class TestDestroy(unittest.TestCase):
+    def setUp(self):
+        self._exit_stack = contextlib.ExitStack()
+        self._environment = self._exit_stack.enter_context(
+            zonys.core.testing.environment(fake=True),
+        )
+
+        self._identifier = zonys.core.zfs.file_system.Identifier(
+            [self._environment.pool, "zonys", "destroy"],
+        )
+        self._file_system = self._identifier.create()
+
+        for name in ["first", "second"]:
+            child = self._file_system.children.create(name)
+            child.path.joinpath("data").write_text(name * 1024)
+            child.children.create("nested")
+
+        for index in range(50):
+            self._file_system.snapshots.create("auto-{}".format(index), True)
+
+        clone = self._file_system.children.open("first").snapshots["auto-0"]
+        clone.clone(self._identifier.child("clone"))
+
+    def tearDown(self):
+        self._exit_stack.close()
+
+    def test_destroy(self):
+        used = self._file_system.used
+        before = zonys.core.zfs.fake.calls()
+
+        self.assertEqual(used, self._file_system.destroy())
+
+        after = zonys.core.zfs.fake.calls()
+        self.assertFalse(self._identifier.exists())
+        self.assertEqual(
+            50,
+            after.get("destroy_snapshot", 0) - before.get("destroy_snapshot", 0),
+        )
+        self.assertEqual(
+            6,
+            after.get("delete", 0) - before.get("delete", 0),
+        )
+        self.assertEqual(
+            0,
+            after.get("open", 0) - before.get("open", 0),
+        )
+
+    def test_program(self):
+        with unittest.mock.patch.object(
+            zonys.core.zfs.file_system,
+            "is_programmable",
+            return_value=True,
+        ), unittest.mock.patch.object(
+            subprocess,
+            "run",
+            return_value=subprocess.CompletedProcess([], 1),
+        ) as run:
+            self._file_system.destroy()
+
+        command = run.call_args.args[0]
+
+        self.assertEqual(["zfs", "program", self._environment.pool], command[0:3])
+        self.assertEqual(str(self._identifier), command[-1])
+        self.assertFalse(self._identifier.exists())
+
+    def test_program_incomplete(self):
+        with unittest.mock.patch.object(
+            zonys.core.zfs.file_system,
+            "is_programmable",
+            return_value=True,
+        ), unittest.mock.patch.object(
+            subprocess,
+            "run",
+            return_value=subprocess.CompletedProcess([], 0),
+        ):
+            self._file_system.destroy()
+
+        self.assertFalse(self._identifier.exists())
+
+
+if __name__ == "main":  # pragma: no cover
+    unittest.main()
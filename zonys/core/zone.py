@@ -1,20 +1,24 @@
-import copy
+import hashlib
+import json
 import pathlib
 import shutil
+import threading
 import typing
 import uuid
 
 import mergedeep
-import ruamel
-import ruamel.yaml
 
 import zonys
 import zonys.core
+import zonys.core.cache
+import zonys.core.codec
 import zonys.core.collection
 import zonys.core.configuration
 import zonys.core.freebsd.jail
+import zonys.core.lock
 import zonys.core.handler
 import zonys.core.handler.base
+import zonys.core.handler.dataset
 import zonys.core.handler.execute
 import zonys.core.handler.include
 import zonys.core.handler.jail
@@ -22,16 +26,23 @@ import zonys.core.handler.mount
 import zonys.core.handler.name
 import zonys.core.handler.network
 import zonys.core.handler.provision
+import zonys.core.handler.provision.step
 import zonys.core.handler.temporary
+import zonys.core.handler.thin
 import zonys.core.handler.variable
 import zonys.core.namespace
-import zonys.core.persistence
+import zonys.core.store
 import zonys.core.util
+import zonys.core.zfs
+import zonys.core.zfs.file_system
+import zonys.core.zfs.snapshot
 
 SCHEMAS = [
     zonys.core.handler.variable.SCHEMA,
     zonys.core.handler.include.SCHEMA,
+    zonys.core.handler.dataset.SCHEMA,
     zonys.core.handler.base.SCHEMA,
+    zonys.core.handler.thin.SCHEMA,
     zonys.core.handler.name.SCHEMA,
     zonys.core.handler.provision.SCHEMA,
     zonys.core.handler.mount.SCHEMA,
@@ -74,6 +85,24 @@ class IllegalFileSystemIdentifierError(Error):
     pass
 
 
+class NotSpareError(Error):
+    pass
+
+
+class TemporaryError(Error):
+    pass
+
+
+class NewerSnapshotsError(Error):
+    def __init__(self, name: str, newer: typing.List[str]):
+        super().__init__(
+            "Rolling back to {} would destroy the newer snapshots {}".format(
+                name,
+                ", ".join(newer),
+            )
+        )
+
+
 class Manager:
     def __init__(self, _namespace: "zonys.core.namespace.Handle"):
         self.__namespace = _namespace
@@ -88,21 +117,73 @@ class Manager:
             file_system.mount()
 
         self.__file_system = file_system
+        self.__store = zonys.core.store.Store(
+            self.__file_system.path.joinpath("zonys.db")
+        )
 
         self.__zones = _Zones(self, self.__file_system)
+        self.__configurations = _Configurations(self)
 
     @property
     def namespace(self) -> "zonys.core.namespace.Handle":
         return self.__namespace
 
+    @property
+    def file_system(self) -> "zonys.core.zfs.file_system.Handle":
+        return self.__file_system
+
     @property
     def path(self) -> pathlib.Path:
         return self.__file_system.path
 
+    @property
+    def store(self) -> "zonys.core.store.Store":
+        return self.__store
+
     @property
     def zones(self) -> "_Zones":
         return self.__zones
 
+    @property
+    def configurations(self) -> "_Configurations":
+        return self.__configurations
+
+
+class _Configurations:
+    def __init__(self, manager: "Manager"):
+        self.__manager = manager
+        self.__entries: typing.Dict[
+            str, typing.Tuple[str, "zonys.core.configuration.Manager"]
+        ] = {}
+        self.__lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def get(self, handle: "_Handle") -> "zonys.core.configuration.Manager":
+        key = str(handle.uuid)
+        fingerprint = handle.configuration.fingerprint
+
+        with self.__lock:
+            entry = self.__entries.get(key, None)
+
+            if entry is not None and entry[0] == fingerprint:
+                return entry[1]
+
+        compiled = zonys.core.configuration.Manager(
+            namespace=self.__manager.namespace
+        )
+        compiled.read(SCHEMAS, handle.configuration.merged)
+
+        with self.__lock:
+            self.__entries[key] = (fingerprint, compiled)
+
+        return compiled
+
+    def discard(self, handle: "_Handle"):
+        with self.__lock:
+            self.__entries.pop(str(handle.uuid), None)
+
 
 class _Zones:
     def __init__(
@@ -132,11 +213,9 @@ class _Zones:
 
         self.__cached_handles.clear()
 
-        for child in self.__file_system.children:
-            attach(
-                self.__cached_handles,
-                _ExistingHandle(self.__manager, mount(child)),
-            )
+        for handle in self.scan():
+            mount(handle.file_system)
+            attach(self.__cached_handles, handle)
 
         return self.__cached_handles
 
@@ -147,46 +226,70 @@ class _Zones:
         return iter(self.__handles.values())
 
     def __contains__(self, value: typing.Union[str, uuid.UUID]) -> bool:
-        return str(value) in self.__handles
+        return self.__manager.store.find(str(value)) is not None
 
     def __getitem__(self, value: typing.Union[str, uuid.UUID]) -> "_Handle":
-        if value not in self:
+        key = self.__manager.store.find(str(value))
+        if key is None:
             raise NotFoundError(value)
 
-        return self.__handles[str(value)]
-
-    @staticmethod
-    def __match_identifier(handle: "_Handle", value: str):
-        return str(handle.uuid).startswith(value) or (
-            handle.name is not None and handle.name.startswith(value)
-        )
+        return self.open(key)
 
     def match(self, value: typing.Union[str, uuid.UUID]) -> typing.List["_Handle"]:
-        match_value = str(value)
-        result = []
+        return list(map(self.open, self.__manager.store.match(str(value))))
 
-        for handle in self:
-            if _Zones.__match_identifier(handle, match_value):
-                result.append(handle)
+    def match_one(self, value: typing.Union[str, uuid.UUID]) -> "_Handle":
+        keys = self.__manager.store.match(str(value))
+        if len(keys) == 0:
+            raise NotFoundError(value)
 
-        return result
+        return self.open(keys[0])
 
-    def match_one(self, value: typing.Union[str, uuid.UUID]) -> "_Handle":
-        match_value = str(value)
+    def create(self, **kwargs) -> "_Handle":
+        with self.__manager.namespace.lock_manager.shared():
+            return self.__create(kwargs)
 
-        for handle in self:
-            if _Zones.__match_identifier(handle, match_value):
-                return handle
+    def prepare(self, template: str, **kwargs) -> "_Handle":
+        with self.__manager.namespace.lock_manager.shared():
+            return self.__create(kwargs, template)
 
-        raise NotFoundError(value)
+    def scan(self) -> typing.Iterator["_Handle"]:
+        store = self.__manager.store
+        records = store.records()
 
-    def create(self, **kwargs) -> "_Handle":
-        configuration = kwargs
+        for child in self.__file_system.children:
+            key = child.identifier.last
+            persistence = store.record(key, records.get(key, {}))
+
+            if persistence.get("spare", None) is None:
+                yield _ExistingHandle(self.__manager, child, persistence)
+
+    def open(self, value: typing.Union[str, uuid.UUID]) -> "_Handle":
+        identifier = self.__file_system.identifier.child(str(value))
+
+        if not identifier.exists():
+            raise NotFoundError(value)
+
+        file_system = identifier.open()
+        if not file_system.is_mounted():
+            file_system.mount()
+
+        return _ExistingHandle(self.__manager, file_system)
+
+    def spares(self, template: str) -> typing.List["_Handle"]:
+        return list(map(self.open, self.__manager.store.spares(template)))
+
+    def __create(
+        self,
+        configuration: typing.Dict[str, typing.Any],
+        spare: typing.Optional[str] = None,
+    ) -> "_Handle":
 
         manager = None
         persistence = None
         file_system = None
         file_system_identifier = None
+        build = None
 
         try:
             manager = zonys.core.configuration.Manager(
@@ -194,46 +297,93 @@ class _Zones:
             )
             manager.read(SCHEMAS, configuration)
 
+            name = configuration.get("name", None)
+            if name is not None and name in self:
+                raise NameAlreadyUsedError()
+
             _uuid = uuid.uuid4()
             file_system_identifier = self.__file_system.identifier.child(str(_uuid))
 
-            persistence = zonys.core.persistence.Base(
-                file_system_identifier.path.parent.joinpath(
-                    "{}.yaml".format(str(_uuid))
+            persistence = self.__manager.store.record(str(_uuid), {})
+
+            if spare is not None:
+                persistence.update(
+                    {
+                        "spare": spare,
+                    }
                 )
-            )
 
             context = manager.commit(
                 "before_create_zone",
                 manager=self.__manager,
                 file_system=file_system,
                 file_system_identifier=file_system_identifier,
+                file_system_properties={},
                 persistence=persistence,
             )
 
             file_system = context["file_system"]
+            properties = context["file_system_properties"]
+            base = None
 
             if file_system is None:
-                file_system = file_system_identifier.create()
+                file_system = file_system_identifier.create(properties=properties)
+                base = zonys.core.cache.EMPTY
             elif file_system.identifier != file_system_identifier:
                 raise IllegalFileSystemIdentifierError()
+            elif persistence.get("base", None) is not None:
+                base = str(
+                    zonys.core.zfs.snapshot.Identifier(
+                        file_system.properties["origin"].value
+                    )
+                    .open()
+                    .properties["guid"]
+                    .value
+                )
 
             if not file_system.is_mounted():
                 file_system.mount()
 
-            if configuration.get("name") is not None and configuration["name"] in self:
-                raise NameAlreadyUsedError()
-
-            handle = _CreatedHandle(
-                self.__manager,
-                file_system,
-                persistence,
-                configuration,
+            steps = list(
+                filter(
+                    lambda x: issubclass(
+                        x[0], zonys.core.handler.provision.step.Handler
+                    ),
+                    manager.handlers("after_create_zone"),
+                )
             )
 
+            if base is not None and len(steps) > 0:
+                cache_manager = self.__manager.namespace.cache_manager
+                build = cache_manager.build(base, steps, file_system.path)
+
+                if build.depth > 0:
+                    file_system.destroy()
+                    file_system = None
+                    file_system = cache_manager.restore(
+                        build,
+                        file_system_identifier,
+                        properties,
+                    )
+
+            if not file_system.is_mounted():
+                file_system.mount()
+
+            with self.__manager.namespace.lock_manager.names():
+                if name is not None and name in self:
+                    raise NameAlreadyUsedError()
+
+                handle = _CreatedHandle(
+                    self.__manager,
+                    file_system,
+                    persistence,
+                    configuration,
+                )
+
             manager.commit(
                 "after_create_zone",
                 zone=handle,
+                build=build,
             )
 
             handle.snapshots.create("initial")
@@ -265,10 +415,21 @@ class _Zones:
         return handle
 
     def run(self, **kwargs) -> "_Handle":
-        handle = self.create(
-            temporary=True,
-            **kwargs,
-        )
+        template = kwargs.pop("template", None)
+
+        if template is not None:
+            handle = self.__manager.namespace.template_manager.templates[
+                template
+            ].claim(
+                temporary=True,
+                **kwargs,
+            )
+        else:
+            handle = self.create(
+                temporary=True,
+                **kwargs,
+            )
+
         handle.up()
 
         return handle
@@ -282,13 +443,24 @@ class _Zones:
         self.match_one(identifier).destroy()
         return self.create(**kwargs)
 
+    def reset(
+        self,
+        identifier: str,
+        name: str = "initial",
+        force: bool = False,
+    ) -> "_Handle":
+        handle = self.match_one(identifier)
+        handle.reset(name, force)
+
+        return handle
+
 
 class _Handle:
     def __init__(
         self,
         manager: "Manager",
         file_system: "zonys.core.zfs.file_system.Handle",
-        persistence: "zonys.core.persistence.Base",
+        persistence: "zonys.core.store.Record",
         configuration: typing.Mapping[typing.Any, typing.Any],
     ):
         self.__manager = manager
@@ -315,6 +487,10 @@ class _Handle:
     def configuration(self) -> "_Configuration":
         return self.__configuration
 
+    @property
+    def file_system(self) -> "zonys.core.zfs.file_system.Handle":
+        return self.__file_system
+
     @property
     def path(self) -> pathlib.Path:
         return self.__file_system.path
@@ -323,6 +499,29 @@ class _Handle:
     def name(self) -> typing.Optional[str]:
         return self.__persistence.get("name", None)
 
+    @property
+    def base_uuid(self) -> typing.Optional["uuid.UUID"]:
+        base = self.__persistence.get("base", None)
+        if base is not None:
+            return uuid.UUID(base)
+
+        return None
+
+    @property
+    def spare(self) -> typing.Optional[str]:
+        return self.__persistence.get("spare", None)
+
+    @property
+    def thin_name(self) -> typing.Optional[str]:
+        return self.__persistence.get("thin", None)
+
+    @property
+    def thin(self) -> typing.Optional["zonys.core.thin.Base"]:
+        if self.thin_name is not None:
+            return self.manager.namespace.thin_manager[self.thin_name]
+
+        return None
+
     @property
     def auto_start(self) -> bool:
         return self.__configuration.merged.get("autostart", False)
@@ -338,120 +537,160 @@ class _Handle:
     def base(self) -> typing.Optional["zonys.core.zone._Snapshot"]:
         base = self.__persistence.get("base", None)
         if base is not None:
-            return self.manager.zones[base].snapshots["initial"]
+            return self.manager.zones.open(base).snapshots["initial"]
 
         return None
 
     def is_running(self) -> bool:
         return self.__jail_identifier.exists()
 
-    def start(self):
-        manager = None
-        jail_handle = None
-
-        try:
-            if self.is_running():
-                raise AlreadyRunningError(self)
+    def lock(
+        self,
+        mode: str = zonys.core.lock.EXCLUSIVE,
+    ) -> typing.ContextManager["zonys.core.lock.Lock"]:
+        return self.__manager.namespace.lock_manager.zone(self.uuid, mode)
 
-            manager = zonys.core.configuration.Manager(
-                namespace=self.__manager.namespace
-            )
-            manager.read(SCHEMAS, self.configuration.merged)
-
-            jail_configuration = manager.commit(
-                "before_start_zone",
-                zone=self,
-                jail_configuration={},
-            )["jail_configuration"]
-
-            jail_handle = self.__jail_identifier.create(
-                **{
-                    **jail_configuration,
-                    "path": self.__file_system.path,
-                }
-            )
+    def start(self):
+        with self.lock():
+            manager = None
+            jail_handle = None
+
+            try:
+                if self.is_running():
+                    raise AlreadyRunningError(self)
+
+                manager = self.configuration.compiled.transaction()
+
+                jail_configuration = manager.commit(
+                    "before_start_zone",
+                    zone=self,
+                    jail_configuration={},
+                )["jail_configuration"]
+
+                jail_handle = self.__jail_identifier.create(
+                    **{
+                        **jail_configuration,
+                        "path": self.__file_system.path,
+                    }
+                )
 
-            manager.commit(
-                "after_start_zone",
-                zone=self,
-                jail=jail_handle,
-            )
+                manager.commit(
+                    "after_start_zone",
+                    zone=self,
+                    jail=jail_handle,
+                )
 
-        except:
-            if jail_handle is not None:
-                jail_handle.destroy()
+            except:
+                if jail_handle is not None:
+                    jail_handle.destroy()
 
-            if manager is not None:
-                manager.rollback()
+                if manager is not None:
+                    manager.rollback()
 
-            raise
+                raise
 
     def stop(self):
-        manager = None
+        with self.lock():
+            manager = None
 
-        try:
-            if not self.is_running():
-                raise NotRunningError(self)
+            try:
+                if not self.is_running():
+                    raise NotRunningError(self)
 
-            manager = zonys.core.configuration.Manager(
-                namespace=self.__manager.namespace
-            )
-            manager.read(SCHEMAS, self.configuration.merged)
+                manager = self.configuration.compiled.transaction()
 
-            jail_handle = self.__jail_identifier.open()
+                jail_handle = self.__jail_identifier.open()
 
-            manager.commit(
-                "before_stop_zone",
-                zone=self,
-                jail=jail_handle,
-            )
+                manager.commit(
+                    "before_stop_zone",
+                    zone=self,
+                    jail=jail_handle,
+                )
 
-            jail_handle.destroy()
+                jail_handle.destroy()
 
-            manager.commit(
-                "after_stop_zone",
-                zone=self,
-            )
-        except:
-            if manager is not None:
-                manager.rollback()
+                manager.commit(
+                    "after_stop_zone",
+                    zone=self,
+                )
+            except:
+                if manager is not None:
+                    manager.rollback()
 
-            raise
+                raise
 
     def destroy(self):
-        manager = None
+        with self.lock():
+            manager = None
 
-        try:
-            if self.is_running():
-                raise RunningError(self)
+            try:
+                if self.is_running():
+                    raise RunningError(self)
 
-            manager = zonys.core.configuration.Manager(
-                namespace=self.__manager.namespace
-            )
-            manager.read(SCHEMAS, self.configuration.merged)
+                manager = self.configuration.compiled.transaction()
 
-            manager.commit(
-                "before_destroy_zone",
-                zone=self,
-            )
+                manager.commit(
+                    "before_destroy_zone",
+                    zone=self,
+                )
 
-            self.__file_system.destroy()
-            self.__persistence.destroy()
+                self.__manager.namespace.cache_manager.release(self.__file_system)
 
-            manager.commit(
-                "after_destroy_zone",
-                manager=self.__manager,
-            )
-        except:
-            if manager is not None:
-                manager.rollback()
+                if self.has_dependents():
+                    self.__file_system.destroy()
+                else:
+                    self.__manager.namespace.reaper_manager.discard(
+                        self.__file_system
+                    )
 
-            raise
+                self.__persistence.destroy()
+                self.__manager.configurations.discard(self)
+
+                manager.commit(
+                    "after_destroy_zone",
+                    manager=self.__manager,
+                )
+            except:
+                if manager is not None:
+                    manager.rollback()
+
+                raise
+
+        self.__manager.namespace.lock_manager.discard(self.uuid)
+
+    def has_dependents(self) -> bool:
+        return any(
+            x.get("base", None) == str(self.uuid)
+            for x in self.__manager.store.records().values()
+        )
 
     def restart(self):
         self.stop()
         self.start()
 
+    def reset(self, name: str = "initial", force: bool = False):
+        with self.lock():
+            snapshot = self.snapshots[name]
+            running = self.is_running()
+
+            if running and self.configuration.merged.get("temporary", False):
+                raise TemporaryError(self)
+
+            newer = snapshot.newer
+            if len(newer) > 0 and not force:
+                raise NewerSnapshotsError(name, newer)
+
+            if running:
+                self.stop()
+
+            snapshot.rollback(force)
+
+            if not self.__file_system.is_mounted():
+                self.__file_system.mount()
+
+            if running:
+                self.start()
+
     # pylint: disable=invalid-name
     def up(self):
         if not self.is_running():
@@ -473,6 +712,37 @@ class _Handle:
         self.undeploy()
         return self.manager.zones.deploy(**kwargs)
 
+    def claim(self, configuration: typing.Mapping[typing.Any, typing.Any]):
+        with self.lock():
+            current = self.manager.store.get(str(self.uuid)) or {}
+            if self.spare is None or current.get("spare", None) is None:
+                raise NotSpareError(self)
+
+            name = configuration.get("name", None)
+
+            with self.manager.namespace.lock_manager.names():
+                if name is not None and name in self.manager.zones:
+                    raise NameAlreadyUsedError()
+
+                del self.__persistence["spare"]
+
+                self.__persistence.update(
+                    {
+                        "local": configuration,
+                    }
+                )
+
+                if name is not None:
+                    self.__persistence.update(
+                        {
+                            "name": name,
+                        }
+                    )
+
+                self.__persistence.flush()
+
+            self.__configuration = _Configuration(self, configuration)
+
     def send(self, target: typing.Any):
         temp = None
 
@@ -510,7 +780,7 @@ class _CreatedHandle(_Handle):
         self,
         manager: "Manager",
         file_system: "zonys.core.zfs.file_system.Handle",
-        persistence: "zonys.core.persistence.Base",
+        persistence: "zonys.core.store.Record",
         configuration: typing.Mapping[typing.Any, typing.Any],
     ):
         persistence.update(
@@ -529,9 +799,7 @@ class _ReceivedHandle(_Handle):
         manager: "Manager",
         file_system: "zonys.core.zfs.file_system.Handle",
     ):
-        persistence = zonys.core.persistence.Base(
-            file_system.path.parent.joinpath("{}.yaml".format(file_system.path.name))
-        )
+        persistence = manager.store.record(file_system.identifier.last)
 
         super().__init__(
             manager,
@@ -546,10 +814,10 @@ class _ExistingHandle(_Handle):
         self,
         manager: "Manager",
         file_system: "zonys.core.zfs.file_system.Handle",
+        persistence: typing.Optional["zonys.core.store.Record"] = None,
     ):
-        persistence = zonys.core.persistence.Base(
-            file_system.path.parent.joinpath("{}.yaml".format(file_system.path.name))
-        )
+        if persistence is None:
+            persistence = manager.store.record(file_system.identifier.last)
 
         super().__init__(
             manager,
@@ -572,6 +840,25 @@ class _Configuration:
     def local(self) -> typing.Mapping[typing.Any, typing.Any]:
         return self.__local
 
+    @property
+    def fingerprint(self) -> str:
+        layers = [self.local]
+        base = self.__handle.base_uuid
+        store = self.__handle.manager.store
+
+        while base is not None:
+            record = store.get(str(base)) or {}
+            layers.append(record.get("local", {}))
+            base = record.get("base", None)
+
+        return hashlib.sha256(
+            json.dumps(layers, sort_keys=True, default=str).encode()
+        ).hexdigest()
+
+    @property
+    def compiled(self) -> "zonys.core.configuration.Manager":
+        return self.__handle.manager.configurations.get(self.__handle)
+
     @property
     def entities(self) -> typing.List[typing.Mapping[typing.Any, typing.Any]]:
         result = [self.local]
@@ -615,68 +902,75 @@ class _Snapshots:
         )
 
     def __getitem__(self, name: str) -> "_Snapshot":
-        if name not in self:
-            raise NotFoundError()
-
-        return _Snapshot(
-            self.__handle,
-            self.__file_system.snapshots[name],
-        )
+        try:
+            return _Snapshot(
+                self.__handle,
+                self.__file_system.snapshots[name],
+            )
+        except zonys.core.zfs.snapshot.NotExistError as error:
+            raise NotFoundError() from error
 
-    def create(self, name) -> "_Snapshot":
-        temp_path = None
-        manager = None
+    def __len__(self) -> int:
+        return len(self.__file_system.snapshots)
 
-        try:
-            if name in self:
-                raise AlreadyExistsError()
+    @property
+    def catalog(self) -> "zonys.core.zfs.file_system.Catalog":
+        return self.__file_system.snapshots.catalog
 
-            configuration = copy.deepcopy(self.__handle.configuration.merged)
+    def refresh(self):
+        self.__file_system.snapshots.refresh()
 
-            manager = zonys.core.configuration.Manager(
-                namespace=self.__handle.manager.namespace
-            )
-            manager.read(SCHEMAS, configuration)
+    def create(self, name) -> "_Snapshot":
+        with self.__handle.lock():
+            temp_path = None
+            manager = None
 
-            manager.commit(
-                "before_create_snapshot",
-                zone=self.__handle,
-                name=name,
-            )
+            try:
+                if name in self:
+                    raise AlreadyExistsError()
 
-            temp_path = self.__file_system.path.joinpath(
-                ".zonys.yaml",
-            )
+                manager = self.__handle.configuration.compiled.transaction()
+                configuration = manager.configuration
 
-            if temp_path.exists():
-                temp_path.unlink()
+                manager.commit(
+                    "before_create_snapshot",
+                    zone=self.__handle,
+                    name=name,
+                )
 
-            with temp_path.open("w") as handle:
-                ruamel.yaml.YAML().dump(
-                    configuration,
-                    handle,
+                temp_path = self.__file_system.path.joinpath(
+                    ".zonys.yaml",
                 )
 
-            snapshot = self.__file_system.snapshots.create(name)
+                if temp_path.exists():
+                    temp_path.unlink()
 
-            manager.commit(
-                "after_create_snapshot",
-                zone=self,
-                snapshot=snapshot,
-            )
+                with temp_path.open("w") as handle:
+                    zonys.core.codec.dump(
+                        configuration,
+                        handle,
+                    )
 
-            return _Snapshot(
-                self.__handle,
-                snapshot,
-            )
-        except:
-            if manager is not None:
-                manager.rollback()
+                snapshot = self.__file_system.snapshots.create(name)
 
-            raise
-        finally:
-            if temp_path is not None and temp_path.exists():
-                temp_path.unlink()
+                manager.commit(
+                    "after_create_snapshot",
+                    zone=self,
+                    snapshot=snapshot,
+                )
+
+                return _Snapshot(
+                    self.__handle,
+                    snapshot,
+                )
+            except:
+                if manager is not None:
+                    manager.rollback()
+
+                raise
+            finally:
+                if temp_path is not None and temp_path.exists():
+                    temp_path.unlink()
 
 
 class _Snapshot:
@@ -705,36 +999,73 @@ class _Snapshot:
         return self.zfs_snapshot_handle.identifier.name
 
     def destroy(self):
-        manager = None
+        with self.zone_handle.lock():
+            manager = None
 
-        try:
-            configuration = ruamel.yaml.YAML().load(
-                self.__zfs_snapshot_handle.path.joinpath(
-                    ".zonys.yaml",
+            path = self.__zfs_snapshot_handle.path.joinpath(".zonys.yaml")
+            if not path.exists():
+                self.__zfs_snapshot_handle.destroy()
+                self.zone_handle.snapshots.refresh()
+                self.__discard()
+                return
+
+            try:
+                configuration = zonys.core.codec.load(path)
+
+                manager = zonys.core.configuration.Manager(
+                    namespace=self.zone_handle.manager.namespace
                 )
-            )
+                manager.read(SCHEMAS, configuration)
 
-            manager = zonys.core.configuration.Manager(
-                namespace=self.zone_handle.manager.namespace
-            )
-            manager.read(SCHEMAS, configuration)
+                manager.commit(
+                    "before_destroy_snapshot",
+                    snapshot=self,
+                )
 
-            manager.commit(
-                "before_destroy_snapshot",
-                snapshot=self,
-            )
+                self.__zfs_snapshot_handle.destroy()
+                self.zone_handle.snapshots.refresh()
+                self.__discard()
 
-            self.__zfs_snapshot_handle.destroy()
+                manager.commit(
+                    "after_destroy_snapshot",
+                    zone=self.zone_handle,
+                )
+            except:
+                if manager is not None:
+                    manager.rollback()
 
-            manager.commit(
-                "after_destroy_snapshot",
-                zone=self.zone_handle,
-            )
-        except:
-            if manager is not None:
-                manager.rollback()
+                raise
 
-            raise
+    @property
+    def newer(self) -> typing.List[str]:
+        catalog = self.zone_handle.snapshots.catalog
+        createtxg = catalog[self.name].createtxg
+
+        return [x.name for x in catalog if x.createtxg > createtxg]
+
+    def __discard(self):
+        namespace = self.zone_handle.manager.namespace
+        namespace.snapshot_manager.discard(str(self.zone_handle.uuid), self.name)
+        namespace.replication_manager.discard(
+            self.zone_handle.file_system.identifier,
+            self.name,
+        )
+
+    def rollback(self, force: bool = False):
+        with self.zone_handle.lock():
+            newer = self.newer
+            if len(newer) > 0 and not force:
+                raise NewerSnapshotsError(self.name, newer)
+
+            for name in reversed(newer):
+                self.zone_handle.snapshots[name].destroy()
+
+            self.__zfs_snapshot_handle.rollback()
+            self.zone_handle.snapshots.refresh()
+
+            path = self.zone_handle.path.joinpath(".zonys.yaml")
+            if path.exists():
+                path.unlink()
 
     def send(self, destination: typing.Any):
         if isinstance(destination, int):